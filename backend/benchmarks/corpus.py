@@ -0,0 +1,274 @@
+"""
+Seeded synthetic resumes for the parser benchmarks.
+
+resume_texts() gives plain text for the text-level benchmarks. For file
+level benchmarks, write_corpus() renders resumes as PDF and DOCX with varied
+lengths, section orders, header styles, bullet styles and skills tables:
+
+    python -m benchmarks.corpus --out /tmp/resume-corpus --count 100 --seed 0
+"""
+import argparse
+import html
+import io
+import os
+import random
+
+FIRST_NAMES = ['Aarav', 'Priya', 'Rohan', 'Ananya', 'Vikram', 'Sneha', 'Arjun', 'Meera', 'John', 'Emily', 'Carlos', 'Yuki']
+LAST_NAMES = ['Sharma', 'Patel', 'Iyer', 'Gupta', 'Reddy', 'Singh', 'Smith', 'Garcia', 'Tanaka', 'Nair']
+INSTITUTIONS = [
+    'Indian Institute of Technology, Delhi', 'National Institute of Technology, Trichy',
+    'Delhi Technological University, Delhi', 'Stanford University, California',
+    'Delhi Public School, Delhi', 'Kendriya Vidyalaya, Bangalore',
+]
+DEGREES = ['B.Tech in Computer Science', 'M.Tech in Data Science', 'Class XII CBSE', 'Class X CBSE', 'Bachelor of Science']
+TECHNOLOGIES = [
+    'Python', 'Java', 'C++', 'JavaScript', 'TypeScript', 'React', 'Node.js', 'Django', 'Flask', 'Docker',
+    'Kubernetes', 'AWS', 'PostgreSQL', 'MongoDB', 'Redis', 'TensorFlow', 'PyTorch', 'Git', 'Linux', 'GraphQL',
+]
+VERBS = ['Developed', 'Implemented', 'Built', 'Designed', 'Created']
+NOUNS = ['dashboard', 'scheduler', 'recommendation engine', 'chat service', 'compiler', 'search index', 'crawler']
+
+
+def _skills(rnd):
+    return [
+        f"Languages: {', '.join(rnd.sample(TECHNOLOGIES[:5], 3))}",
+        f"Frameworks: {', '.join(rnd.sample(TECHNOLOGIES[5:10], 3))}",
+        f"Tools: {', '.join(rnd.sample(TECHNOLOGIES[10:], 4))}",
+    ]
+
+
+def _education(rnd):
+    lines = []
+    for _ in range(rnd.randint(1, 3)):
+        start = rnd.randint(2012, 2021)
+        score = f"CGPA: {rnd.uniform(6, 10):.2f}" if rnd.random() < 0.5 else f"Percentage: {rnd.uniform(60, 99):.1f}"
+        lines.append(f"• {rnd.choice(INSTITUTIONS)}")
+        lines.append(f"{rnd.choice(DEGREES)} {score} {start} - {start + 4}")
+    return lines
+
+
+def _projects(rnd, handle):
+    lines = []
+    for _ in range(rnd.randint(1, 4)):
+        noun = rnd.choice(NOUNS)
+        lines.append(f"• {noun.lower()}")
+        for _ in range(rnd.randint(1, 3)):
+            techs = ', '.join(rnd.sample(TECHNOLOGIES, 3))
+            lines.append(f"◦ {rnd.choice(VERBS)} a {noun} using {techs} serving {rnd.randint(100, 9000)} users")
+        if rnd.random() < 0.5:
+            lines.append(f"https://github.com/{handle}/{noun.replace(' ', '-')}")
+    return lines
+
+
+def _achievements(rnd):
+    return [
+        f"• Solved over {rnd.randint(100, 900)} problems on LeetCode",
+        f"• Codeforces Specialist: rating {rnd.randint(1200, 2100)}",
+        f"• Hackathon Winner: ranked {rnd.randint(1, 50)} among {rnd.randint(100, 900)} teams",
+    ][:rnd.randint(1, 3)]
+
+
+def resume_text(rnd):
+    """One synthetic resume as plain text, with a random section order"""
+    first, last = rnd.choice(FIRST_NAMES), rnd.choice(LAST_NAMES)
+    handle = f"{first}{last}".lower()
+    header = [
+        f"{first} {last}",
+        f"Email: {handle}@gmail.com | Mobile: +91-{rnd.randint(6000000000, 9999999999)}",
+        f"github.com/{handle} | linkedin.com/in/{handle}",
+    ]
+    if rnd.random() < 0.5:
+        header.append(f"leetcode.com/u/{handle}/ | codechef.com/users/{handle}")
+    sections = [
+        ['Education'] + _education(rnd),
+        ['Skills Summary'] + _skills(rnd),
+        ['Projects'] + _projects(rnd, handle),
+        ['Achievements'] + _achievements(rnd),
+    ]
+    rnd.shuffle(sections)
+    return '\n'.join(header + [line for section in sections for line in section])
+
+
+def resume_texts(count, seed=0):
+    rnd = random.Random(seed)
+    return [resume_text(rnd) for _ in range(count)]
+
+
+COMPANIES = ['Flipkart', 'Infosys', 'Google', 'Zomato', 'Razorpay', 'Microsoft', 'Swiggy', 'Atlassian']
+ROLES = ['Software Engineering Intern', 'Backend Developer', 'Data Science Intern', 'Frontend Engineer']
+BULLETS = ['•', '-', '◦', '*', '▪']
+SECTION_TITLES = {
+    'education': ['Education', 'EDUCATION', 'Academic Background - Education'],
+    'skills': ['Skills Summary', 'Technical Skills', 'SKILLS'],
+    'experience': ['Experience', 'Work Experience', 'PROFESSIONAL EXPERIENCE'],
+    'projects': ['Projects', 'Personal Projects', 'PROJECTS'],
+    'achievements': ['Achievements', 'Achievements & Awards', 'ACHIEVEMENTS'],
+}
+LENGTHS = {'short': (1, 1, 1), 'medium': (2, 3, 2), 'long': (3, 8, 6)}
+
+
+def _experience(rnd, jobs):
+    lines = []
+    for _ in range(jobs):
+        start = rnd.randint(2016, 2023)
+        lines.append(f"{rnd.choice(ROLES)}, {rnd.choice(COMPANIES)} {start} - {start + rnd.randint(0, 2)}")
+        for _ in range(rnd.randint(2, 5)):
+            techs = ', '.join(rnd.sample(TECHNOLOGIES, 2))
+            lines.append(f"{rnd.choice(VERBS)} a {rnd.choice(NOUNS)} with {techs}, cutting latency by {rnd.randint(5, 60)}%")
+    return lines
+
+
+def resume_document(rnd):
+    """One synthetic resume as a structure the PDF and DOCX renderers share.
+
+    Returns a dict with the expected name, header lines, a bullet character,
+    a header style ('large', 'bold' or 'plain') and a list of sections, each
+    {'title', 'lines', 'table'}; the skills section carries its categories
+    as table rows, rendered as a table or as "Category: a, b" lines.
+    """
+    first, last = rnd.choice(FIRST_NAMES), rnd.choice(LAST_NAMES)
+    handle = f"{first}{last}".lower()
+    length = rnd.choice(list(LENGTHS))
+    education_count, project_count, job_count = LENGTHS[length]
+
+    # Some name lines defeat the header heuristic so NER gets exercised
+    name_line = rnd.choice([f"{first} {last}", f"{first} {last}", f"{first.upper()} {last.upper()}", f"{first} {last}, B.Tech"])
+    header = [
+        name_line,
+        f"Email: {handle}@gmail.com | Mobile: +91-{rnd.randint(6000000000, 9999999999)}",
+        f"github.com/{handle} | linkedin.com/in/{handle}",
+    ]
+    if rnd.random() < 0.5:
+        header.append(f"leetcode.com/u/{handle}/ | codechef.com/users/{handle}")
+
+    education = []
+    for _ in range(rnd.randint(1, education_count + 1)):
+        education += _education(rnd)[:2]
+    projects = []
+    for _ in range(project_count):
+        projects += _projects(rnd, handle)
+    skill_rows = [line.split(': ', 1) for line in _skills(rnd)]
+    sections = [
+        {'title': rnd.choice(SECTION_TITLES['education']), 'lines': education, 'table': None},
+        {'title': rnd.choice(SECTION_TITLES['skills']), 'lines': [], 'table': skill_rows},
+        {'title': rnd.choice(SECTION_TITLES['projects']), 'lines': projects, 'table': None},
+        {'title': rnd.choice(SECTION_TITLES['achievements']), 'lines': _achievements(rnd), 'table': None},
+    ]
+    if job_count:
+        sections.append({'title': rnd.choice(SECTION_TITLES['experience']), 'lines': _experience(rnd, job_count), 'table': None})
+    rnd.shuffle(sections)
+    return {
+        'name': f"{first} {last}",
+        'header': header,
+        'sections': sections,
+        'bullet': rnd.choice(BULLETS),
+        'header_style': rnd.choice(['large', 'bold', 'plain']),
+        'use_tables': rnd.random() < 0.5,
+        'length': length,
+    }
+
+
+def _bulleted(document, line):
+    # The generators mark list items with • and ◦; swap in this resume's style
+    if line[:1] in '•◦':
+        return f"{document['bullet']} {line[2:]}"
+    return line
+
+
+def render_pdf(document):
+    """PDF bytes laid out by PyMuPDF's HTML Story engine, paginated"""
+    import fitz  # PyMuPDF
+    header_tag = {'large': 'h2', 'bold': 'p><b', 'plain': 'p'}[document['header_style']]
+    header_end = {'large': 'h2', 'bold': 'b></p', 'plain': 'p'}[document['header_style']]
+    parts = [f"<h1>{html.escape(document['header'][0])}</h1>"]
+    parts += [f"<p>{html.escape(line)}</p>" for line in document['header'][1:]]
+    for section in document['sections']:
+        parts.append(f"<{header_tag}>{html.escape(section['title'])}</{header_end}>")
+        parts += [f"<p>{html.escape(_bulleted(document, line))}</p>" for line in section['lines']]
+        if section['table']:
+            if document['use_tables']:
+                rows = ''.join(f"<tr><td>{html.escape(a)}</td><td>{html.escape(b)}</td></tr>" for a, b in section['table'])
+                parts.append(f"<table>{rows}</table>")
+            else:
+                parts += [f"<p>{html.escape(a)}: {html.escape(b)}</p>" for a, b in section['table']]
+
+    story = fitz.Story(''.join(parts), user_css="p { margin: 0 0 2px 0; font-size: 10px }")
+    buffer = io.BytesIO()
+    writer = fitz.DocumentWriter(buffer)
+    mediabox = fitz.paper_rect('a4')
+    more = True
+    while more:
+        device = writer.begin_page(mediabox)
+        more, _ = story.place(mediabox + (36, 36, -36, -36))
+        story.draw(device)
+        writer.end_page()
+    writer.close()
+    return buffer.getvalue()
+
+
+def render_docx(document):
+    """DOCX bytes; headers use Heading styles, bold runs or nothing at all"""
+    import docx
+    doc = docx.Document()
+    doc.add_paragraph(document['header'][0], style='Title')
+    for line in document['header'][1:]:
+        doc.add_paragraph(line)
+    for section in document['sections']:
+        if document['header_style'] == 'large':
+            doc.add_heading(section['title'], level=1)
+        elif document['header_style'] == 'bold':
+            doc.add_paragraph().add_run(section['title']).bold = True
+        else:
+            doc.add_paragraph(section['title'])
+        for line in section['lines']:
+            if line[:1] in '•◦' and document['bullet'] == '•':
+                doc.add_paragraph(line[2:], style='List Bullet')
+            else:
+                doc.add_paragraph(_bulleted(document, line))
+        if section['table']:
+            if document['use_tables']:
+                table = doc.add_table(rows=0, cols=2)
+                for category, values in section['table']:
+                    cells = table.add_row().cells
+                    cells[0].text, cells[1].text = category, values
+            else:
+                for category, values in section['table']:
+                    doc.add_paragraph(f"{category}: {values}")
+    buffer = io.BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue()
+
+
+def write_corpus(out_dir, count, seed=0):
+    """Write count resumes to out_dir, alternating PDF and DOCX, plus a
+    manifest.json of expected names; returns the file paths"""
+    import json
+    rnd = random.Random(seed)
+    os.makedirs(out_dir, exist_ok=True)
+    paths, manifest = [], {}
+    for i in range(count):
+        document = resume_document(rnd)
+        extension = 'pdf' if i % 2 == 0 else 'docx'
+        file_name = f"resume-{i:05d}-{document['length']}.{extension}"
+        data = render_pdf(document) if extension == 'pdf' else render_docx(document)
+        with open(os.path.join(out_dir, file_name), 'wb') as f:
+            f.write(data)
+        paths.append(os.path.join(out_dir, file_name))
+        manifest[file_name] = {'name': document['name']}
+    with open(os.path.join(out_dir, 'manifest.json'), 'w') as f:
+        json.dump({'seed': seed, 'count': count, 'files': manifest}, f, indent=1)
+    return paths
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--out', required=True)
+    arg_parser.add_argument('--count', type=int, default=100)
+    arg_parser.add_argument('--seed', type=int, default=0)
+    args = arg_parser.parse_args()
+    paths = write_corpus(args.out, args.count, args.seed)
+    print(f"Wrote {len(paths)} resumes to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Technology matching cost as the vocabulary grows.
+
+Pads the shipped gazetteer with synthetic terms and times matching project
+lines with the token-trie Gazetteer against a single case-insensitive regex
+alternation over the same vocabulary (what extract_projects used to build):
+
+    python -m benchmarks.gazetteer --sizes 100 1000 5000
+"""
+import argparse
+import json
+import random
+import re
+import string
+import time
+
+from benchmarks.corpus import resume_texts
+from config.gazetteer import DEFAULT_GAZETTEER_PATH, Gazetteer
+
+
+def synthetic_entries(count, rnd):
+    for i in range(count):
+        yield {'name': ''.join(rnd.choices(string.ascii_lowercase, k=rnd.randint(4, 10))) + str(i)}
+
+
+def regex_matcher(entries):
+    terms = sorted((entry['name'] for entry in entries), key=len, reverse=True)
+    pattern = re.compile(r'\b(?:' + '|'.join(re.escape(term) for term in terms) + r')\b', re.IGNORECASE)
+    return pattern.findall
+
+
+def per_line_us(func, lines, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for line in lines:
+            func(line)
+        best = min(best, time.perf_counter() - start)
+    return best / len(lines) * 1e6
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 5000])
+    arg_parser.add_argument('--docs', type=int, default=200)
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    args = arg_parser.parse_args()
+
+    with open(DEFAULT_GAZETTEER_PATH, encoding='utf-8') as f:
+        shipped = json.load(f)
+    lines = [line for text in resume_texts(args.docs) for line in text.split('\n')]
+    rnd = random.Random(0)
+
+    print(f"{'terms':>6} {'regex us/line':>14} {'trie us/line':>13}")
+    for size in args.sizes:
+        entries = shipped + list(synthetic_entries(max(size - len(shipped), 0), rnd))
+        regex = per_line_us(regex_matcher(entries), lines, args.repeat)
+        trie = per_line_us(Gazetteer(entries).find, lines, args.repeat)
+        print(f"{len(entries):>6} {regex:>14.1f} {trie:>13.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Name NER cost per spaCy model and pipeline configuration.
+
+For every installed model (en_core_web_sm/md/lg by default) three
+configurations are measured, each in a fresh process so RSS is comparable:
+
+    full    the whole pipeline on the whole resume (what extract_name did)
+    trimmed NER-only pipeline on the whole resume
+    window  NER-only pipeline on ner_window(), expanding to the whole resume
+            only when the window has no name (what extract_name does now)
+
+Accuracy is the share of documents whose PERSON entity matches the name the
+corpus generator put in the header. The header-line heuristic is bypassed so
+every document exercises NER:
+
+    python -m benchmarks.ner --models en_core_web_sm en_core_web_lg --docs 200
+"""
+import argparse
+import json
+import os
+import resource
+import statistics
+import subprocess
+import sys
+import time
+
+from benchmarks.corpus import resume_texts
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CONFIGURATIONS = ('full', 'trimmed', 'window')
+
+
+def run_configuration(model, configuration, docs):
+    """Measure one configuration in this process and return its numbers"""
+    import spacy
+    from config.parser import extract_name_from_doc, load_ner_pipeline, ner_window
+
+    nlp = spacy.load(model) if configuration == 'full' else load_ner_pipeline(model)
+    loaded_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+    texts = resume_texts(docs)
+    nlp(texts[0])  # warm up
+    timings, correct = [], 0
+    for text in texts:
+        start = time.perf_counter()
+        if configuration == 'window':
+            window = ner_window(text)
+            name = extract_name_from_doc(nlp(window))
+            if not name and len(window) < len(text):
+                name = extract_name_from_doc(nlp(text))
+        else:
+            name = extract_name_from_doc(nlp(text))
+        timings.append(time.perf_counter() - start)
+        correct += name == text.split('\n', 1)[0]
+
+    return {
+        'pipes': nlp.pipe_names,
+        'ms_per_doc': statistics.mean(timings) * 1000,
+        'p95_ms': statistics.quantiles(timings, n=20)[-1] * 1000,
+        'loaded_rss_mb': loaded_rss,
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        'accuracy': correct / len(texts),
+    }
+
+
+def measure(model, configuration, docs):
+    proc = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.ner', '--run', model, configuration, '--docs', str(docs)],
+        cwd=BACKEND_DIR, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        return None
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--models', nargs='+', default=['en_core_web_sm', 'en_core_web_md', 'en_core_web_lg'])
+    arg_parser.add_argument('--docs', type=int, default=200)
+    arg_parser.add_argument('--run', nargs=2, metavar=('MODEL', 'CONFIGURATION'), help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    if args.run:
+        print(json.dumps(run_configuration(*args.run, args.docs)))
+        return
+
+    print(f"{'model':<16} {'config':<8} {'ms/doc':>7} {'p95 ms':>7} {'RSS MB':>7} {'peak MB':>8} {'accuracy':>17}  pipes")
+    for model in args.models:
+        baseline = None
+        for configuration in CONFIGURATIONS:
+            result = measure(model, configuration, args.docs)
+            if result is None:
+                print(f"{model:<16} not installed")
+                break
+            baseline = baseline or result
+            delta = result['accuracy'] - baseline['accuracy']
+            print(
+                f"{model:<16} {configuration:<8} {result['ms_per_doc']:>7.2f} {result['p95_ms']:>7.2f} "
+                f"{result['loaded_rss_mb']:>7.0f} {result['peak_rss_mb']:>8.0f} "
+                f"{result['accuracy']:>7.1%} ({delta:+.1%} vs full)  {','.join(result['pipes'])}"
+            )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,95 @@
+"""
+Memory and serialization cost of a parse result in each stored form.
+
+Parses synthetic resumes once, then compares, per result:
+
+    dict      the parse_resume dict (what the caches held before)
+    object    ParsedResume with its entry dataclasses
+    msgpack   ParsedResume.pack() bytes (what the caches and jobs hold now)
+    json      json.dumps of the dict (what the jobs table held before)
+
+Memory is measured with tracemalloc while building all results of a form.
+Timings are the best of --repeat runs of encoding and decoding every result;
+for dict the "round trip" is the copy.deepcopy the in-process cache used to
+make on every hit:
+
+    python -m benchmarks.parse_result --docs 500 --repeat 5
+"""
+import argparse
+import copy
+import json
+import time
+import tracemalloc
+
+import spacy
+
+from benchmarks.corpus import resume_texts
+from config import parser
+from config.parse_result import ParsedResume, unpack_result
+
+
+def retained_bytes(build):
+    """Bytes still allocated after build() returns, with its result alive"""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return after - before
+
+
+def best_us(func, items, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for item in items:
+            func(item)
+        best = min(best, time.perf_counter() - start)
+    return best / len(items) * 1e6
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--docs', type=int, default=500)
+    arg_parser.add_argument('--repeat', type=int, default=5)
+    arg_parser.add_argument('--seed', type=int, default=0)
+    args = arg_parser.parse_args()
+
+    # Name NER doesn't change the result's size; a blank pipeline keeps the
+    # benchmark independent of the installed models
+    parser._nlp = spacy.blank('en')
+    results = [parser.parse_text(text) for text in resume_texts(args.docs, args.seed)]
+    encoded_json = [json.dumps(result) for result in results]
+    packed = [ParsedResume.from_api_dict(result).pack() for result in results]
+    assert all(unpack_result(data) == result for data, result in zip(packed, results))
+
+    memory = {
+        'dict': retained_bytes(lambda: [json.loads(data) for data in encoded_json]),
+        'object': retained_bytes(lambda: [ParsedResume.unpack(data) for data in packed]),
+        'msgpack': retained_bytes(lambda: [ParsedResume.from_api_dict(result).pack() for result in results]),
+        'json': retained_bytes(lambda: [json.dumps(result).encode() for result in results]),
+    }
+    timings = {
+        'dict': (None, best_us(copy.deepcopy, results, args.repeat)),
+        'msgpack': (
+            best_us(lambda result: ParsedResume.from_api_dict(result).pack(), results, args.repeat),
+            best_us(unpack_result, packed, args.repeat),
+        ),
+        'json': (
+            best_us(json.dumps, results, args.repeat),
+            best_us(json.loads, encoded_json, args.repeat),
+        ),
+    }
+
+    print(f"{len(results)} results")
+    print(f"{'form':8s} {'bytes/result':>13s} {'encode us':>10s} {'decode us':>10s}")
+    for form, total in memory.items():
+        encode, decode = timings.get(form, (None, None))
+        encode = f"{encode:10.1f}" if encode is not None else f"{'-':>10s}"
+        decode = f"{decode:10.1f}" if decode is not None else f"{'-':>10s}"
+        print(f"{form:8s} {total / len(results):13.0f} {encode} {decode}")
+
+
+if __name__ == '__main__':
+    main()
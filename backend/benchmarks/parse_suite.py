@@ -0,0 +1,165 @@
+"""
+Per-stage resume parser benchmark over a synthetic PDF/DOCX corpus.
+
+Each stage runs over every document in its own process, so peak RSS is that
+stage's (on top of the corpus and imports every stage shares). Text-level
+stages get the cleaned text of each document as input, prepared before
+timing starts. Results go to a JSON file that can be diffed across commits:
+
+    python -m benchmarks.parse_suite --count 200 --seed 0 --output before.json
+    git checkout my-branch
+    python -m benchmarks.parse_suite --count 200 --seed 0 --output after.json --compare before.json
+
+Pass --corpus DIR to reuse a corpus written by `python -m benchmarks.corpus`.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.corpus import write_corpus
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STAGES = (
+    'extract_text_from_pdf', 'extract_text_from_docx', 'extract_name', 'extract_contact_info',
+    'extract_skills', 'extract_education', 'extract_projects', 'parse_resume',
+)
+
+
+class Upload:
+    """Just enough of an UploadedFile for the parser: a name and a fresh buffer"""
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self.data = f.read()
+        self.name = os.path.basename(path)
+
+    def open(self):
+        from config.parse_executor import NamedBytesIO
+        return NamedBytesIO(self.data, self.name)
+
+
+def run_stage(stage, corpus_dir, model):
+    """Time one stage over the corpus in this process and return its numbers"""
+    from django.conf import settings
+    settings.configure(RESUME_PARSER_SPACY_MODEL=model)
+    from config import parser
+
+    uploads = [Upload(os.path.join(corpus_dir, name)) for name in sorted(os.listdir(corpus_dir)) if name != 'manifest.json']
+    if stage.startswith('extract_text_from_'):
+        extension = stage.rsplit('_', 1)[1]
+        uploads = [upload for upload in uploads if upload.name.endswith('.' + extension)]
+    if stage.startswith('extract_text_from_') or stage == 'parse_resume':
+        make_input = Upload.open
+    else:
+        def make_input(upload):
+            return parser.clean_text(parser.extract_text(upload.open()))
+    inputs = [make_input(upload) for upload in uploads]
+
+    # One untimed call loads the libraries, model and gazetteer the stage uses
+    func = getattr(parser, stage)
+    func(make_input(uploads[0]))
+    if stage in ('extract_name', 'parse_resume'):
+        parser.get_nlp()
+    timings = []
+    started = time.perf_counter()
+    for value in inputs:
+        start = time.perf_counter()
+        func(value)
+        timings.append(time.perf_counter() - start)
+    elapsed = time.perf_counter() - started
+
+    percentiles = statistics.quantiles(timings, n=100, method='inclusive') if len(timings) > 1 else timings * 99
+    return {
+        'documents': len(timings),
+        'p50_ms': percentiles[49] * 1000,
+        'p95_ms': percentiles[94] * 1000,
+        'p99_ms': percentiles[98] * 1000,
+        'mean_ms': statistics.mean(timings) * 1000,
+        'docs_per_s': len(timings) / elapsed if elapsed else 0.0,
+        # ru_maxrss is in kilobytes on Linux
+        'peak_rss_mb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    }
+
+
+def measure(stage, corpus_dir, model):
+    proc = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.parse_suite', '--run-stage', stage, '--corpus', corpus_dir, '--model', model],
+        cwd=BACKEND_DIR, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        return {'error': proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else f"exit code {proc.returncode}"}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--corpus', help='directory written by benchmarks.corpus (generated into a temp dir if omitted)')
+    arg_parser.add_argument('--count', type=int, default=100)
+    arg_parser.add_argument('--seed', type=int, default=0)
+    arg_parser.add_argument('--model', default='en_core_web_sm', help='spaCy model for extract_name and parse_resume')
+    arg_parser.add_argument('--stages', nargs='+', choices=STAGES, default=list(STAGES))
+    arg_parser.add_argument('--output', default='parse-benchmark.json')
+    arg_parser.add_argument('--compare', help='earlier --output file to print p50 and throughput ratios against')
+    arg_parser.add_argument('--run-stage', choices=STAGES, help=argparse.SUPPRESS)
+    args = arg_parser.parse_args()
+
+    if args.run_stage:
+        print(json.dumps(run_stage(args.run_stage, args.corpus, args.model)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus_dir = args.corpus or os.path.join(tmp, 'corpus')
+        if not args.corpus:
+            write_corpus(corpus_dir, args.count, args.seed)
+        results = {stage: measure(stage, corpus_dir, args.model) for stage in args.stages}
+
+    report = {
+        'revision': git_revision(),
+        'python': platform.python_version(),
+        'cpus': os.cpu_count(),
+        'corpus': args.corpus or {'count': args.count, 'seed': args.seed},
+        'model': args.model,
+        'stages': results,
+    }
+    with open(args.output, 'w') as f:
+        json.dump(report, f, indent=2)
+
+    baseline = {}
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['stages']
+
+    print(f"{'stage':<24} {'docs':>5} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'docs/s':>8} {'RSS MB':>7}")
+    for stage, result in results.items():
+        if 'error' in result:
+            print(f"{stage:<24} failed: {result['error']}")
+            continue
+        line = (
+            f"{stage:<24} {result['documents']:>5} {result['p50_ms']:>8.2f} {result['p95_ms']:>8.2f} "
+            f"{result['p99_ms']:>8.2f} {result['docs_per_s']:>8.1f} {result['peak_rss_mb']:>7.0f}"
+        )
+        before = baseline.get(stage)
+        if before and 'error' not in before:
+            line += f"  p50 x{result['p50_ms'] / before['p50_ms']:.2f}, docs/s x{result['docs_per_s'] / before['docs_per_s']:.2f}"
+        print(line)
+    print(f"Wrote {args.output}")
+
+
+if __name__ == '__main__':
+    main()
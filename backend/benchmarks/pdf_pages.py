@@ -0,0 +1,84 @@
+"""
+Serial vs page-parallel PDF text extraction by page count.
+
+Builds text-dense PDFs of increasing length from the synthetic corpus and
+times extract_text_from_pdf with the page pool off and on (the pool is
+warmed first, as it is in a long-running worker). The smallest page count
+where the parallel path wins is the crossover to use for
+RESUME_PARSER_PARALLEL_PAGE_THRESHOLD:
+
+    python -m benchmarks.pdf_pages --processes 4 --pages 1 2 4 8 16 32 50
+"""
+import argparse
+import io
+import os
+import statistics
+import time
+
+from django.conf import settings
+
+from benchmarks.corpus import resume_texts
+
+
+class NamedBytesIO(io.BytesIO):
+    name = 'bench.pdf'
+
+
+def build_pdf(pages, seed=0):
+    import fitz  # PyMuPDF
+    doc = fitz.open()
+    for text in resume_texts(pages, seed):
+        page = doc.new_page()
+        page.insert_textbox(page.rect + (36, 36, -36, -36), text * 2, fontsize=8)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+def median_ms(extract, data, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        extract(NamedBytesIO(data))
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--processes', type=int, default=min(4, os.cpu_count() or 1))
+    arg_parser.add_argument('--pages', type=int, nargs='+', default=[1, 2, 4, 8, 16, 32, 50])
+    arg_parser.add_argument('--repeat', type=int, default=5)
+    args = arg_parser.parse_args()
+
+    settings.configure(
+        RESUME_PARSER_MAX_PAGES=max(args.pages),
+        RESUME_PARSER_MAX_CHARS=10 ** 9,
+        RESUME_PARSER_PAGE_PROCESSES=max(args.processes, 2),
+    )
+    from config.parser import extract_text_from_pdf
+
+    # Start the pool's processes before timing anything
+    settings.RESUME_PARSER_PARALLEL_PAGE_THRESHOLD = 1
+    extract_text_from_pdf(NamedBytesIO(build_pdf(max(args.processes, 2))))
+
+    print(f"{os.cpu_count()} CPUs, {max(args.processes, 2)} page processes")
+    print(f"{'pages':>5} {'serial ms':>10} {'parallel ms':>12} {'speedup':>8}")
+    crossover = None
+    for pages in args.pages:
+        data = build_pdf(pages)
+        settings.RESUME_PARSER_PARALLEL_PAGE_THRESHOLD = 0
+        serial = median_ms(extract_text_from_pdf, data, args.repeat)
+        serial_text = extract_text_from_pdf(NamedBytesIO(data))
+        settings.RESUME_PARSER_PARALLEL_PAGE_THRESHOLD = 1
+        parallel = median_ms(extract_text_from_pdf, data, args.repeat)
+        if extract_text_from_pdf(NamedBytesIO(data)) != serial_text:
+            print(f"{pages:>5} parallel text differs from serial text")
+        if crossover is None and parallel < serial:
+            crossover = pages
+        print(f"{pages:>5} {serial:>10.1f} {parallel:>12.1f} {serial / parallel:>7.2f}x")
+    print(f"crossover: {crossover or 'none'} pages")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,96 @@
+"""
+Hostile-input latency check for the parser's pattern matching.
+
+Feeds parse_text documents built to make backtracking patterns fail slowly
+from every start position (megabytes of digits before "problems", repeated
+"leetcode.com/", a lone "@" after a long word, ...) plus random
+concatenations of the same tokens, each cut to RESUME_PARSER_MAX_CHARS as
+extraction would. The regex budget is off by default, so this measures the
+patterns themselves. Exits non-zero if any document takes longer than the
+ceiling:
+
+    python -m benchmarks.regex_fuzz --ceiling 0.5 --fuzz 50
+    python -m benchmarks.regex_fuzz --budget 0.25   # with the production budget
+"""
+import argparse
+import random
+import sys
+import time
+
+from django.conf import settings
+
+MAX_CHARS = 200_000
+
+# Pieces that open or close the parser's patterns
+FUZZ_TOKENS = [
+    '1' * 1000, '9876543210', '+91 ', '(', ')', '-', '.', ' ', '\n', '@', 'a' * 500, 'leetcode.com/',
+    'leetcode.com/u/', 'github.com/', 'problems', ' solved ', 'rating ', 'percentile ', 'languages: ',
+    'cgpa: ', 'percentage ', '2023', '•',
+]
+
+
+def hostile_documents():
+    n = MAX_CHARS
+    return {
+        'digits': '9' * n,
+        'digits then "problems"': '1' * (n - 9) + ' problems',
+        'digits then "leetcode"': '1' * (n - 12) + ' x leetcode',
+        'repeated leetcode.com/': 'leetcode.com/' * (n // 13),
+        'repeated leetcode.com/u/': 'leetcode.com/u/' * (n // 15),
+        'word then @': 'a' * (n - 1) + '@',
+        '@ then word': 'a@' + 'b' * (n - 2),
+        'dotted word then @': 'a.' * (n // 2 - 1) + '@',
+        'broken phone numbers': '(123) 456-789 ' * (n // 14),
+        'skill categories': ('languages ' + 'x' * 50 + '\n') * (n // 61),
+        'digit lines and stats words': ('1' * 90 + '\n') * (n // 91 - 1) + 'problems solved rating rank',
+    }
+
+
+def fuzz_documents(count, seed):
+    rnd = random.Random(seed)
+    documents = {}
+    for i in range(count):
+        parts, size = [], 0
+        while size < MAX_CHARS:
+            token = rnd.choice(FUZZ_TOKENS) * rnd.randint(1, 20)
+            parts.append(token)
+            size += len(token)
+        documents[f'fuzz {i}'] = ''.join(parts)[:MAX_CHARS]
+    return documents
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--ceiling', type=float, default=0.5, help='Seconds allowed per document')
+    arg_parser.add_argument('--budget', type=float, default=0, help='RESUME_PARSER_REGEX_BUDGET; 0 disables it')
+    arg_parser.add_argument('--fuzz', type=int, default=50, help='Random documents on top of the hand-written ones')
+    arg_parser.add_argument('--seed', type=int, default=0)
+    args = arg_parser.parse_args()
+
+    settings.configure(RESUME_PARSER_REGEX_BUDGET=args.budget)
+    from config.parser import DEFAULT_FIELDS, clean_text, parse_text
+
+    # Name extraction is spaCy, not regex
+    fields = DEFAULT_FIELDS - {'firstName', 'lastName'}
+    documents = {**hostile_documents(), **fuzz_documents(args.fuzz, args.seed)}
+    parse_text('warm up', fields=fields)
+
+    slowest, failures = 0.0, []
+    for name, text in documents.items():
+        text = clean_text(text)
+        start = time.perf_counter()
+        parse_text(text, fields=fields)
+        elapsed = time.perf_counter() - start
+        slowest = max(slowest, elapsed)
+        if elapsed > args.ceiling:
+            failures.append(name)
+        if not name.startswith('fuzz') or elapsed > args.ceiling:
+            print(f"{name:30s} {elapsed * 1000:8.1f} ms")
+    print(f"{len(documents)} documents, slowest {slowest * 1000:.1f} ms, ceiling {args.ceiling * 1000:.0f} ms")
+    if failures:
+        print(f"over the ceiling: {', '.join(failures)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,91 @@
+"""
+Microbenchmark for the contact/profile regex stage.
+
+Compares the per-document time of the previous implementation (one re.search
+per field on raw pattern strings) with the compiled registry plus anchor scan
+in config.parser, and checks both give the same results on every document:
+
+    python -m benchmarks.regex_scan --docs 500 --repeat 5
+"""
+import argparse
+import re
+import time
+
+from config import parser
+from benchmarks.corpus import resume_texts
+
+
+def legacy_extract_contact_info(text):
+    contact_info = {}
+    for field, pattern, flags in [
+        ('email', parser.EMAIL_REGEX, re.IGNORECASE),
+        ('phone', parser.PHONE_REGEX, 0),
+        ('github', parser.GITHUB_REGEX, re.IGNORECASE),
+        ('linkedin', parser.LINKEDIN_REGEX, re.IGNORECASE),
+        ('codechef', parser.CODECHEF_REGEX, re.IGNORECASE),
+        ('codeforces', parser.CODEFORCES_REGEX, re.IGNORECASE),
+        ('leetcode', parser.LEETCODE_REGEX, re.IGNORECASE),
+    ]:
+        match = re.search(pattern, text, flags)
+        contact_info[field] = match.group(0) if match else ""
+    return contact_info
+
+
+def legacy_extract_coding_profiles_stats(text):
+    stats = {}
+    for pattern in parser.PROBLEM_COUNT_REGEXES:
+        matches = re.findall(pattern, text, re.IGNORECASE)
+        if matches:
+            stats['problems_solved'] = max([int(match) for match in matches])
+            break
+    for pattern in parser.RATING_REGEXES:
+        match = re.search(pattern, text, re.IGNORECASE)
+        if match:
+            stats['rating_info'] = match.group(0)
+            break
+    return stats
+
+
+def legacy(text):
+    return legacy_extract_contact_info(text), legacy_extract_coding_profiles_stats(text)
+
+
+def current(text):
+    anchors = parser.find_anchors(text)
+    return parser.extract_contact_info(text, anchors), parser.extract_coding_profiles_stats(text, anchors)
+
+
+def per_document_us(func, texts, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for text in texts:
+            func(text)
+        best = min(best, time.perf_counter() - start)
+    return best / len(texts) * 1e6
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--docs', type=int, default=500)
+    arg_parser.add_argument('--repeat', type=int, default=5)
+    arg_parser.add_argument('--seed', type=int, default=0)
+    args = arg_parser.parse_args()
+
+    texts = resume_texts(args.docs, args.seed)
+    # Garbage-free documents flatter the anchor scan, so mix in a few without
+    # any profile links at all
+    texts += [text.split('\n', 1)[1].replace('github.com', 'gh').replace('@', ' at ') for text in texts[:50]]
+
+    mismatches = sum(legacy(text) != current(text) for text in texts)
+    print(f"documents  {len(texts)}  mismatches {mismatches}")
+
+    before = per_document_us(legacy, texts, args.repeat)
+    after = per_document_us(current, texts, args.repeat)
+    print(f"legacy     {before:8.1f} us/doc")
+    print(f"registry   {after:8.1f} us/doc")
+    print(f"speedup    {before / after:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+Signup burst: threads and memory held by unverified-account expiry.
+
+Registers --users accounts back to back through send_verification_email (the
+code path of RegisterView after the user row is saved), against a temporary
+SQLite database with the outbox left unsent, and reports the live thread
+count and the process's resident memory after the burst. It does the same
+for the removed per-registration scheme, where every signup parked a thread
+in time.sleep until its deletion check, and then times one sweep deleting
+the whole burst:
+
+    python -m benchmarks.signup_burst --users 2000
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+import django
+from django.conf import settings
+
+
+def rss_mb():
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def legacy_delete_after_delay(user_model, user_id, delay_seconds):
+    """The removed user_auth.utils.delete_user_after_delay, minus its prints"""
+    def delete_user():
+        time.sleep(delay_seconds)
+        user = user_model.objects.filter(id=user_id, is_active=False).first()
+        if user is not None:
+            user.delete()
+
+    thread = threading.Thread(target=delete_user)
+    thread.daemon = True
+    thread.start()
+
+
+def burst(label, users, register):
+    from user_auth.models import User
+
+    threads, memory = threading.active_count(), rss_mb()
+    start = time.perf_counter()
+    samples = []
+    for i in range(users):
+        user = User.objects.create(username=f'{label}-{i}', email=f'{label}-{i}@example.com', is_active=False)
+        register(user)
+        if (i + 1) % max(users // 4, 1) == 0:
+            samples.append((i + 1, threading.active_count() - threads, rss_mb() - memory))
+    elapsed = time.perf_counter() - start
+    print(f"{label}: {users} signups in {elapsed:.1f}s")
+    for count, extra_threads, extra_memory in samples:
+        print(f"  after {count:6d}: {extra_threads:6d} extra thread(s), {extra_memory:+7.1f} MB RSS")
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument('--users', type=int, default=2000)
+    arg_parser.add_argument('--skip-legacy', action='store_true', help='Only measure the sweeper')
+    args = arg_parser.parse_args()
+
+    from config import settings as project_settings
+    database = os.path.join(tempfile.mkdtemp(), 'signup_burst.sqlite3')
+    settings.configure(**{
+        **{name: getattr(project_settings, name) for name in dir(project_settings) if name.isupper()},
+        'DATABASES': {'default': {'ENGINE': 'django.db.backends.sqlite3', 'NAME': database}},
+        'EMAIL_BACKEND': 'django.core.mail.backends.locmem.EmailBackend',
+        'EMAIL_OUTBOX_WORKER': False,
+        'PASSWORD_HASHERS': ['django.contrib.auth.hashers.MD5PasswordHasher'],
+    })
+    django.setup()
+    from django.core.management import call_command
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from user_auth.expiry import delete_unverified_users
+    from user_auth.models import User
+    from user_auth.utils import send_verification_email
+
+    call_command('migrate', verbosity=0)
+    send_verification_email(User.objects.create(username='warm-up', is_active=False))
+
+    burst('sweeper', args.users, send_verification_email)
+    with CaptureQueriesContext(connection) as queries:
+        start = time.perf_counter()
+        deleted = delete_unverified_users(ttl=0)
+        elapsed = time.perf_counter() - start
+    print(f"  one sweep deleted {deleted} user(s) in {elapsed * 1000:.0f} ms with {len(queries)} queries")
+
+    if not args.skip_legacy:
+        # The sleeping threads never wake up during the run
+        burst('legacy', args.users, lambda user: legacy_delete_after_delay(User, user.pk, 600))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Cold start benchmark for `manage.py check`.
+
+Every run is a fresh interpreter, so the numbers include importing the URLconf
+(and with it config.parser). Compare the working tree against an older
+revision with:
+
+    python -m benchmarks.startup --baseline <git-rev> --runs 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_DIR = os.path.dirname(BACKEND_DIR)
+
+
+def run_check(backend_dir):
+    """Run `manage.py check` once, returning (seconds, peak RSS in MB, exit code)"""
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, 'manage.py', 'check'],
+        cwd=backend_dir,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    _, status, rusage = os.wait4(proc.pid, 0)
+    elapsed = time.perf_counter() - start
+    # ru_maxrss is in kilobytes on Linux
+    return elapsed, rusage.ru_maxrss / 1024, os.waitstatus_to_exitcode(status)
+
+
+def measure(label, backend_dir, runs):
+    timings, rss, codes = [], [], set()
+    for _ in range(runs):
+        elapsed, peak, code = run_check(backend_dir)
+        timings.append(elapsed)
+        rss.append(peak)
+        codes.add(code)
+    print(
+        f"{label:<10} median {statistics.median(timings):6.2f}s  "
+        f"min {min(timings):6.2f}s  max {max(timings):6.2f}s  "
+        f"peak RSS {max(rss):7.1f} MB  exit codes {sorted(codes)}"
+    )
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--baseline', help='git revision to compare against (checked out into a temporary worktree)')
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args()
+
+    current = measure('current', BACKEND_DIR, args.runs)
+
+    if args.baseline:
+        with tempfile.TemporaryDirectory() as tmp:
+            worktree = os.path.join(tmp, 'baseline')
+            subprocess.run(
+                ['git', 'worktree', 'add', '--detach', worktree, args.baseline],
+                cwd=REPO_DIR, check=True, stdout=subprocess.DEVNULL,
+            )
+            try:
+                baseline = measure('baseline', os.path.join(worktree, 'backend'), args.runs)
+            finally:
+                subprocess.run(['git', 'worktree', 'remove', '--force', worktree], cwd=REPO_DIR, check=True)
+        print(f"speedup    {baseline / current:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+import json
+import os
+import re
+
+DEFAULT_GAZETTEER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'technologies.json')
+
+# Words and single punctuation characters; punctuation is kept as its own token
+# so terms like "C++", "C#" and "Node.js" can be matched token by token
+TOKEN_REGEX = re.compile(r"\w+|[^\w\s]")
+
+
+def tokenize(text):
+    """Split text into (lower-cased token, original token) pairs"""
+    return [(token.lower(), token) for token in TOKEN_REGEX.findall(text)]
+
+
+class Gazetteer:
+    """Multi-keyword matcher over a token trie.
+
+    Every term is stored as a path of lower-cased tokens, so a match always
+    starts and ends on a token boundary. Matching walks the trie from each
+    token and keeps the longest term found; the walk is bounded by the longest
+    term (a handful of tokens), so the cost grows with the length of the text
+    and not with the number of terms.
+    """
+
+    def __init__(self, entries):
+        self.root = {}
+        self.max_depth = 0
+        self.names = []
+        for entry in entries:
+            name = entry['name']
+            self.names.append(name)
+            # True for all of the entry's terms, or a list of the terms
+            # that only match as spelled ("Go" but not "go")
+            case_sensitive = entry.get('case_sensitive', False)
+            for term in [name] + entry.get('aliases', []):
+                self._add(term, name, case_sensitive is True or term in (case_sensitive or ()))
+
+    def _add(self, term, name, case_sensitive):
+        tokens = TOKEN_REGEX.findall(term)
+        node = self.root
+        for token in tokens:
+            node = node.setdefault(token.lower(), {})
+        # '' never appears as a token, so it can hold the terminal data
+        node.setdefault('', []).append((name, tuple(tokens) if case_sensitive else None))
+        self.max_depth = max(self.max_depth, len(tokens))
+
+    @staticmethod
+    def _terminal(node, original_tokens):
+        for name, exact_tokens in node.get('', ()):
+            if exact_tokens is None or exact_tokens == original_tokens:
+                return name
+        return None
+
+    def find(self, text):
+        """Canonical names of all terms in text, in order of appearance, without duplicates"""
+        tokens = tokenize(text)
+        found = {}
+        i = 0
+        while i < len(tokens):
+            node = self.root
+            match_name, match_end = None, i
+            for j in range(i, min(i + self.max_depth, len(tokens))):
+                node = node.get(tokens[j][0])
+                if node is None:
+                    break
+                if '' in node:
+                    name = self._terminal(node, tuple(original for _, original in tokens[i:j + 1]))
+                    if name:
+                        match_name, match_end = name, j + 1
+            if match_name:
+                found[match_name] = None
+                i = match_end
+            else:
+                i += 1
+        return list(found)
+
+    @classmethod
+    def from_file(cls, path):
+        """Load a gazetteer from a JSON list of {"name", "aliases", "case_sensitive"} entries;
+        case_sensitive is true or a list of the entry's terms"""
+        with open(path, encoding='utf-8') as f:
+            return cls(json.load(f))
@@ -0,0 +1,135 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+from django.core.cache import caches
+
+from .parse_result import SCHEMA_VERSION, pack_result, unpack_result
+from .parser import DEFAULT_FIELDS, PARSER_VERSION, parse_resume, parser_setting
+
+HASH_CHUNK_SIZE = 64 * 1024
+
+
+def hash_upload(file):
+    """SHA-256 of an upload, computed chunk by chunk; rewinds the file afterwards.
+
+    Uses the digest ResumeUploadHandler computed while the upload streamed
+    in, when there is one.
+    """
+    precomputed = getattr(file, 'content_sha256', None)
+    if precomputed:
+        return precomputed
+    digest = hashlib.sha256()
+    if hasattr(file, 'chunks'):
+        chunks = file.chunks(HASH_CHUNK_SIZE)
+    else:
+        chunks = iter(lambda: file.read(HASH_CHUNK_SIZE), b'')
+    for chunk in chunks:
+        digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+class ParseResultCache:
+    """Two-tier cache of parse_resume output keyed by upload content.
+
+    The first tier is a bounded in-process LRU; the second is a Django cache
+    backend shared between workers (Redis in production, locmem in
+    development). Keys include PARSER_VERSION, so bumping it invalidates every
+    entry parsed by an older parser.
+
+    Both tiers hold msgpack-packed ParsedResume bytes (see parse_result),
+    which are much smaller than the dicts, and every get decodes a fresh
+    dict the caller is free to mutate.
+    """
+
+    def __init__(self):
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(digest, file_type, fields=DEFAULT_FIELDS):
+        # Layout sectioning can segment a document differently
+        mode = 'layout' if parser_setting('RESUME_PARSER_LAYOUT_SECTIONS', False) else 'text'
+        key = f"resume-parse:v{PARSER_VERSION}:s{SCHEMA_VERSION}:{mode}:{file_type}:{digest}"
+        if fields != DEFAULT_FIELDS:
+            key += ':' + ','.join(sorted(fields))
+        return key
+
+    def key_for_bytes(self, content, file_name, fields=DEFAULT_FIELDS):
+        file_type = file_name.split('.')[-1].lower()
+        return self.make_key(hashlib.sha256(content).hexdigest(), file_type, fields)
+
+    def _shared(self):
+        alias = parser_setting('RESUME_PARSER_CACHE_ALIAS', 'default')
+        return caches[alias] if alias else None
+
+    def _remember(self, key, value):
+        max_size = parser_setting('RESUME_PARSER_CACHE_SIZE', 256)
+        with self._lock:
+            self._lru[key] = value
+            self._lru.move_to_end(key)
+            while len(self._lru) > max_size:
+                self._lru.popitem(last=False)
+
+    def get(self, key):
+        with self._lock:
+            packed = self._lru.get(key)
+            if packed is not None:
+                self._lru.move_to_end(key)
+                self.hits += 1
+                return unpack_result(packed)
+
+        shared = self._shared()
+        packed = shared.get(key) if shared is not None else None
+        if packed is not None:
+            try:
+                value = unpack_result(packed)
+            except ValueError:
+                return None
+            self._remember(key, packed)
+            with self._lock:
+                self.shared_hits += 1
+            return value
+        return None
+
+    def set(self, key, value):
+        packed = pack_result(value)
+        self._remember(key, packed)
+        shared = self._shared()
+        if shared is not None:
+            shared.set(key, packed, parser_setting('RESUME_PARSER_CACHE_TIMEOUT', 60 * 60 * 24 * 7))
+
+    def get_or_parse(self, file, parse=parse_resume, fields=DEFAULT_FIELDS):
+        """Return (parsed data, 'hit' | 'miss') for an uploaded resume"""
+        file_type = file.name.split('.')[-1].lower()
+        key = self.make_key(hash_upload(file), file_type, fields)
+
+        cached = self.get(key)
+        if cached is not None:
+            return cached, 'hit'
+
+        with self._lock:
+            self.misses += 1
+        parsed_data = parse(file, fields)
+        self.set(key, parsed_data)
+        return parsed_data, 'miss'
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'shared_hits': self.shared_hits,
+                'misses': self.misses,
+                'size': len(self._lru),
+            }
+
+    def clear(self):
+        with self._lock:
+            self._lru.clear()
+
+
+parse_cache = ParseResultCache()
@@ -0,0 +1,404 @@
+import hashlib
+import io
+import logging
+import multiprocessing
+import os
+import shutil
+import signal
+import tempfile
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+from .parse_metrics import StageTimings, active_timings
+from .parser import DEFAULT_FIELDS, extract_resume_text, parse_resume, parser_setting, preload
+
+logger = logging.getLogger(__name__)
+
+
+class ParseTimeout(TimeoutError):
+    """A parse ran past RESUME_PARSER_TASK_TIMEOUT"""
+
+
+class ParseCrashed(ValueError):
+    """The upload's own task killed its parser process (CPU limit, segfault, OOM kill)"""
+
+
+class NamedBytesIO(io.BytesIO):
+    """In-memory upload with the .name attribute parse_resume dispatches on"""
+
+    def __init__(self, content, name):
+        super().__init__(content)
+        self.name = name
+
+
+def _address_space_in_use():
+    """Current virtual memory size of this process in bytes (Linux only)"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[0]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError):
+        return 0
+
+
+def _on_alarm(signum, frame):
+    raise ParseTimeout("Resume parsing timed out")
+
+
+# Marker file of the task this pool process is running; see _tracked_task
+_running_marker = None
+
+# Set in parser pool processes, which parse one page at a time rather than
+# each starting a page pool of their own
+_in_parse_worker = False
+
+
+def _on_terminate(signum, frame):
+    # A broken pool terminates its other processes. Their tasks are
+    # bystanders, which ParseExecutor.crashed tells by the renamed marker
+    if _running_marker is not None:
+        try:
+            os.rename(_running_marker, _running_marker + '.terminated')
+        except OSError:
+            pass
+    os._exit(128 + signum)
+
+
+def _init_worker(memory_limit_mb):
+    """Runs once in each pool process: load the model, then cap memory growth"""
+    global _in_parse_worker
+    _in_parse_worker = True
+    signal.signal(signal.SIGALRM, _on_alarm)
+    signal.signal(signal.SIGTERM, _on_terminate)
+    preload()
+    if resource is not None and memory_limit_mb:
+        # The limit is on top of what the loaded model already uses, so a
+        # pathological document hits MemoryError instead of the OOM killer
+        limit = _address_space_in_use() + memory_limit_mb * 1024 * 1024
+        _, hard = resource.getrlimit(resource.RLIMIT_AS)
+        resource.setrlimit(resource.RLIMIT_AS, (limit, hard))
+
+
+def _run_limited(func, timeout):
+    """Call func() under a wall-clock and CPU time budget"""
+    cpu_limit = None
+    if timeout:
+        signal.setitimer(signal.ITIMER_REAL, timeout)
+        if resource is not None:
+            # SIGALRM can't interrupt a loop inside C code; exceeding the CPU
+            # budget delivers SIGXCPU and kills this process as a last resort
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            cpu_limit = resource.getrlimit(resource.RLIMIT_CPU)
+            soft = int(usage.ru_utime + usage.ru_stime + 2 * timeout) + 1
+            resource.setrlimit(resource.RLIMIT_CPU, (soft, cpu_limit[1]))
+    try:
+        return func()
+    finally:
+        if timeout:
+            signal.setitimer(signal.ITIMER_REAL, 0)
+            if cpu_limit is not None:
+                resource.setrlimit(resource.RLIMIT_CPU, cpu_limit)
+
+
+def _tracked_task(marker, task, *args):
+    """Run task(*args) with a marker file existing for as long as it runs.
+
+    A marker left behind after the pool broke belongs to the task whose
+    process died mid-run.
+    """
+    global _running_marker
+    # Set before the file exists, so a SIGTERM in between leaves no marker
+    _running_marker = marker
+    open(marker, 'w').close()
+    try:
+        return task(*args)
+    finally:
+        _running_marker = None
+        os.unlink(marker)
+
+
+def _parse_task(name, content, timeout, fields=DEFAULT_FIELDS):
+    """Pool task: parse one upload"""
+    return _run_limited(lambda: parse_resume(NamedBytesIO(content, name), fields), timeout)
+
+
+def _parse_timed_task(name, content, timeout, fields=DEFAULT_FIELDS):
+    """Pool task: parse one upload, also returning its stage timings as a dict"""
+    timings = StageTimings(name.split('.')[-1].lower())
+    with timings.activate():
+        result = _parse_task(name, content, timeout, fields)
+    return result, timings.as_dict()
+
+
+def _extract_task(name, content, timeout):
+    """Pool task: extract_resume_text of one upload, without parsing it"""
+    return _run_limited(lambda: extract_resume_text(NamedBytesIO(content, name)), timeout)
+
+
+class ParseExecutor:
+    """Pool of parser processes, each with its own preloaded spaCy model.
+
+    Processes are started with 'spawn'. After max_tasks_per_child tasks per
+    process the pool is retired: new tasks go to a fresh pool while the old
+    one finishes its queue and exits, returning fragmented memory to the OS.
+    (ProcessPoolExecutor's own max_tasks_per_child can deadlock on Python
+    3.11.) A process that dies (CPU limit, segfault in a C extension) breaks
+    its pool, failing every task in it with BrokenProcessPool; the pool is
+    replaced on the next submit. crashed() tells the task that killed the
+    process from the bystanders, and content that crashed a process is
+    refused from then on, so it can't break a pool twice.
+    """
+
+    # Most recent crashing uploads remembered, by content hash
+    MAX_CRASHERS = 1000
+
+    def __init__(self, processes, max_tasks_per_child=None, timeout=None, memory_limit_mb=None):
+        self.processes = processes
+        self.max_tasks_per_child = max_tasks_per_child
+        self.timeout = timeout
+        self.memory_limit_mb = memory_limit_mb
+        self._pool = None
+        self._pool_tasks = 0
+        self._lock = threading.Lock()
+        self._marker_dir = tempfile.mkdtemp(prefix='resume-parse-')
+        self._crashers = OrderedDict()
+
+    def _get_pool(self, broken=None, reserve=False):
+        with self._lock:
+            expired = self.max_tasks_per_child and self._pool_tasks >= self.max_tasks_per_child * self.processes
+            if self._pool is None or self._pool is broken or expired:
+                if self._pool is not None:
+                    self._pool.shutdown(wait=False, cancel_futures=self._pool is broken)
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.processes,
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker,
+                    initargs=(self.memory_limit_mb,),
+                )
+                self._pool_tasks = 0
+            if reserve:
+                self._pool_tasks += 1
+            return self._pool
+
+    def submit(self, file):
+        """Queue a parse of an uploaded file; returns a concurrent.futures.Future"""
+        file.seek(0)
+        name, content = file.name, file.read()
+        file.seek(0)
+        return self._submit(name, content)
+
+    def submit_extract(self, name, content):
+        """Queue text extraction of raw upload bytes; the future yields extract_resume_text output"""
+        return self._submit(name, content, task=_extract_task)
+
+    def submit_timed(self, name, content, fields=DEFAULT_FIELDS):
+        """Queue a parse of raw upload bytes; the future yields (result, stage timings dict)"""
+        return self._submit(name, content, _parse_timed_task, (fields,))
+
+    def _submit(self, name, content, task=_parse_task, args=()):
+        if self._crashers and self._digest(content) in self._crashers:
+            future = Future()
+            future.set_exception(ParseCrashed(f"{name} crashed the parser before and was not parsed again"))
+            return future
+        marker = os.path.join(self._marker_dir, uuid.uuid4().hex)
+        pool = self._get_pool(reserve=True)
+        try:
+            future = pool.submit(_tracked_task, marker, task, name, content, self.timeout, *args)
+        except BrokenProcessPool:
+            pool = self._get_pool(broken=pool, reserve=True)
+            future = pool.submit(_tracked_task, marker, task, name, content, self.timeout, *args)
+        # The manager thread exits after joining the processes a broken pool
+        # terminated, so crashed() waits on it rather than shutting the pool
+        # down again from every thread whose task was in it
+        future.parse_task = (pool._executor_manager_thread, marker, content)
+        return future
+
+    @staticmethod
+    def _digest(content):
+        return hashlib.sha256(content).digest()
+
+    def crashed(self, future):
+        """Whether a future that raised BrokenProcessPool lost its process to its own task.
+
+        False for bystanders: tasks still queued when another task killed
+        its process, and tasks running in the processes the broken pool
+        terminated. Those can be resubmitted. The content of a crashing task
+        is refused by later submits.
+        """
+        manager_thread, marker, content = future.parse_task
+        # Returns once the terminated processes have renamed their markers
+        manager_thread.join()
+        if not os.path.exists(marker):
+            try:
+                os.unlink(marker + '.terminated')
+            except OSError:
+                pass
+            return False
+        os.unlink(marker)
+        with self._lock:
+            self._crashers[self._digest(content)] = True
+            while len(self._crashers) > self.MAX_CRASHERS:
+                self._crashers.popitem(last=False)
+        return True
+
+    def call(self, task, name, content, *args, timeout=None):
+        """Run a pool task on one upload and wait for its result.
+
+        Raises ParseCrashed when the task killed its process. A bystander of
+        another task's crash is resubmitted; each crash flags its culprit,
+        so a few retries are always enough.
+        """
+        for attempt in range(3):
+            future = self._submit(name, content, task, args)
+            try:
+                return future.result(timeout=timeout)
+            except BrokenProcessPool:
+                if self.crashed(future):
+                    logger.warning("%s crashed its parser process", name)
+                    raise ParseCrashed(f"{name} crashed the parser")
+                logger.warning("Parser pool broke while %s was in it; resubmitting", name)
+        raise BrokenProcessPool(f"Parser pool kept breaking while {name} was in it")
+
+    def parse(self, file, timeout=None, fields=DEFAULT_FIELDS):
+        """Parse in the pool and wait for the result (see call)"""
+        timeout = timeout or (self.timeout and self.timeout + 5)
+        file.seek(0)
+        name, content = file.name, file.read()
+        # Stage timings are collected in the worker and merged into the
+        # caller's when it is collecting them
+        timings = active_timings()
+        task = _parse_task if timings is None else _parse_timed_task
+        result = self.call(task, name, content, fields, timeout=timeout)
+        if timings is None:
+            return result
+        result, worker_timings = result
+        timings.merge(worker_timings)
+        return result
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+        shutil.rmtree(self._marker_dir, ignore_errors=True)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def _new_executor(processes):
+    return ParseExecutor(
+        processes,
+        max_tasks_per_child=parser_setting('RESUME_PARSER_MAX_TASKS_PER_CHILD', 100),
+        timeout=parser_setting('RESUME_PARSER_TASK_TIMEOUT', 30),
+        memory_limit_mb=parser_setting('RESUME_PARSER_TASK_MEMORY_MB', 1024),
+    )
+
+
+def get_parse_executor():
+    """Return the process-wide ParseExecutor, or None when there is none.
+
+    One is made on first use with RESUME_PARSER_PROCESSES processes, or up
+    front by start_parse_executor. None only when RESUME_PARSER_PROCESSES
+    is 0, i.e. parses run unisolated in this process.
+    """
+    global _executor
+    if _executor is None:
+        processes = parser_setting('RESUME_PARSER_PROCESSES', 0)
+        if not processes:
+            return None
+        with _executor_lock:
+            if _executor is None:
+                _executor = _new_executor(processes)
+    return _executor
+
+
+def start_parse_executor(processes):
+    """Make a pool of `processes` the process-wide ParseExecutor and return it.
+
+    For run_parse_workers, which owns the host's parse pool whatever
+    RESUME_PARSER_PROCESSES says for web processes.
+    """
+    global _executor
+    with _executor_lock:
+        if _executor is not None:
+            _executor.shutdown()
+        _executor = _new_executor(processes)
+    return _executor
+
+
+def _extract_pdf_pages(source, start, stop):
+    """Page-pool task: text of pages [start, stop) of a PDF path or bytes"""
+    import fitz  # PyMuPDF
+    if isinstance(source, str):
+        doc = fitz.open(source, filetype="pdf")
+    else:
+        doc = fitz.open(stream=source, filetype="pdf")
+    try:
+        return [doc.load_page(page_number).get_text() for page_number in range(start, stop)]
+    finally:
+        doc.close()
+
+
+_page_executor = None
+_page_executor_lock = threading.Lock()
+
+
+def get_page_executor():
+    """Return the process pool for page-parallel PDF extraction, or None when
+    RESUME_PARSER_PAGE_PROCESSES is below 2 or this is a parser pool process"""
+    global _page_executor
+    processes = parser_setting('RESUME_PARSER_PAGE_PROCESSES', 0)
+    if processes < 2 or _in_parse_worker:
+        return None
+    if _page_executor is None:
+        with _page_executor_lock:
+            if _page_executor is None:
+                _page_executor = ProcessPoolExecutor(
+                    max_workers=processes,
+                    mp_context=multiprocessing.get_context('spawn'),
+                )
+    return _page_executor
+
+
+def extract_pdf_pages_parallel(source, page_count):
+    """Text of the first page_count pages, extracted as contiguous page ranges
+    in the page pool and returned in page order.
+
+    source is a file path or the PDF bytes; each worker opens its own
+    read-only copy of the document. Returns None when there is no page pool
+    or it broke, so the caller can extract serially.
+    """
+    global _page_executor
+    executor = get_page_executor()
+    if executor is None:
+        return None
+    chunk = -(-page_count // executor._max_workers)
+    try:
+        futures = [
+            executor.submit(_extract_pdf_pages, source, start, min(start + chunk, page_count))
+            for start in range(0, page_count, chunk)
+        ]
+        return [text for future in futures for text in future.result()]
+    except BrokenProcessPool:
+        logger.warning("PDF page process died; extracting serially")
+        with _page_executor_lock:
+            if _page_executor is executor:
+                _page_executor = None
+        return None
+
+
+def parse_resume_isolated(file, fields=DEFAULT_FIELDS):
+    """parse_resume in the process pool; in this process only when RESUME_PARSER_PROCESSES is 0"""
+    executor = get_parse_executor()
+    if executor is None:
+        return parse_resume(file, fields)
+    return executor.parse(file, fields=fields)
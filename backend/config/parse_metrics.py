@@ -0,0 +1,182 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+
+# Histogram bucket upper bounds in seconds
+STAGE_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Upper page bound -> label; larger documents are '>20'
+PAGE_BUCKETS = ((1, '1'), (2, '2'), (5, '3-5'), (20, '6-20'))
+
+_active = ContextVar('resume_parse_timings', default=None)
+_NULL_STAGE = nullcontext()
+
+
+def metrics_enabled():
+    from .parser import parser_setting  # config.parser imports this module
+    return parser_setting('RESUME_PARSER_METRICS', False)
+
+
+def page_bucket(pages):
+    if pages is None:
+        return 'unknown'
+    for upper, label in PAGE_BUCKETS:
+        if pages <= upper:
+            return label
+    return f'>{PAGE_BUCKETS[-1][0]}'
+
+
+class StageTimings:
+    """Wall and CPU seconds per parser stage, for one parse"""
+
+    def __init__(self, file_type, pages=None, stages=None):
+        self.file_type = file_type
+        self.pages = pages
+        self.stages = stages if stages is not None else []
+
+    def add(self, name, wall, cpu):
+        self.stages.append((name, wall, cpu))
+
+    def merge(self, data):
+        """Add timings collected in another process (see as_dict)"""
+        if self.pages is None:
+            self.pages = data['pages']
+        self.stages.extend(tuple(entry) for entry in data['stages'])
+
+    def as_dict(self):
+        return {'file_type': self.file_type, 'pages': self.pages, 'stages': self.stages}
+
+    @contextmanager
+    def activate(self):
+        """Make parser stages run inside the block record into these timings"""
+        token = _active.set(self)
+        try:
+            yield self
+        finally:
+            _active.reset(token)
+
+    def server_timing(self):
+        """Value for a Server-Timing response header"""
+        return ', '.join(
+            f'{name};dur={wall * 1000:.1f};desc="cpu {cpu * 1000:.1f}ms"' for name, wall, cpu in self.stages
+        )
+
+
+class _Stage:
+    __slots__ = ('timings', 'name', 'wall', 'cpu')
+
+    def __init__(self, timings, name):
+        self.timings = timings
+        self.name = name
+
+    def __enter__(self):
+        self.wall = time.perf_counter()
+        self.cpu = time.thread_time()
+
+    def __exit__(self, *exc_info):
+        self.timings.add(self.name, time.perf_counter() - self.wall, time.thread_time() - self.cpu)
+
+
+def stage(name):
+    """Context manager timing one parser stage; a shared no-op unless timings are being collected"""
+    timings = _active.get()
+    if timings is None:
+        return _NULL_STAGE
+    return _Stage(timings, name)
+
+
+def note_pages(pages):
+    """Record the page count of the document being parsed, for the page bucket label"""
+    timings = _active.get()
+    if timings is not None and timings.pages is None:
+        timings.pages = pages
+
+
+def active_timings():
+    return _active.get()
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """Process-wide stage histograms, labelled by stage, file type and page bucket.
+
+    Every gunicorn worker has its own registry, so a scrape sees the
+    worker that served it.
+    """
+
+    METRICS = {
+        'wall': ('resume_parse_stage_seconds', 'Wall-clock seconds spent in a resume parser stage'),
+        'cpu': ('resume_parse_stage_cpu_seconds', 'CPU seconds spent in a resume parser stage'),
+    }
+
+    def __init__(self, buckets=STAGE_BUCKETS):
+        self.buckets = buckets
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def record(self, timings):
+        labels = (timings.file_type, page_bucket(timings.pages))
+        with self._lock:
+            for name, wall, cpu in timings.stages:
+                for kind, value in (('wall', wall), ('cpu', cpu)):
+                    key = (kind, name) + labels
+                    histogram = self._histograms.get(key)
+                    if histogram is None:
+                        histogram = self._histograms[key] = Histogram(self.buckets)
+                    histogram.observe(value)
+
+    def render(self):
+        """Prometheus text exposition of every histogram"""
+        lines = []
+        with self._lock:
+            for kind, (metric, help_text) in self.METRICS.items():
+                lines += [f'# HELP {metric} {help_text}', f'# TYPE {metric} histogram']
+                for key in sorted(key for key in self._histograms if key[0] == kind):
+                    _, name, file_type, pages = key
+                    histogram = self._histograms[key]
+                    labels = f'stage="{name}",file_type="{file_type}",pages="{pages}"'
+                    cumulative = 0
+                    for bound, count in zip(self.buckets + (float('inf'),), histogram.counts):
+                        cumulative += count
+                        le = '+Inf' if bound == float('inf') else repr(bound)
+                        lines.append(f'{metric}_bucket{{{labels},le="{le}"}} {cumulative}')
+                    lines.append(f'{metric}_sum{{{labels}}} {histogram.sum}')
+                    lines.append(f'{metric}_count{{{labels}}} {histogram.count}')
+        return '\n'.join(lines) + '\n'
+
+    def clear(self):
+        with self._lock:
+            self._histograms.clear()
+
+
+registry = MetricsRegistry()
+
+
+@contextmanager
+def collect_stage_timings(file_type):
+    """Time the parser stages run inside the block and add them to the registry.
+
+    Yields the StageTimings, or None when RESUME_PARSER_METRICS is off.
+    """
+    if not metrics_enabled():
+        yield None
+        return
+    timings = StageTimings(file_type)
+    with timings.activate():
+        yield timings
+    if timings.stages:
+        registry.record(timings)
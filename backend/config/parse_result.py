@@ -0,0 +1,240 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import msgpack
+
+from .parser import FIELD_EXTRACTORS
+
+# Bump whenever the packed layout below changes; packed results of another
+# version are refused by ParsedResume.unpack (and parse cache keys include it)
+SCHEMA_VERSION = 1
+
+# Bit i of the packed field mask is set when API_FIELDS[i] is in the result.
+# Part of the packed layout: reordering FIELD_EXTRACTORS needs a schema bump.
+API_FIELDS = tuple(FIELD_EXTRACTORS)
+
+
+@dataclass(slots=True)
+class EducationEntry:
+    institution: str = ''
+    location: str = ''
+    degree: str = ''
+    gpa: str = ''
+    percentage: str = ''
+    start_year: str = ''
+    end_year: str = ''
+
+    @classmethod
+    def from_api_dict(cls, data):
+        return cls(
+            data['institution'], data['location'], data['degree'], data['gpa'], data['percentage'],
+            data['startYear'], data['endYear'],
+        )
+
+    def to_api_dict(self):
+        return {
+            'institution': self.institution,
+            'location': self.location,
+            'degree': self.degree,
+            'gpa': self.gpa,
+            'percentage': self.percentage,
+            'startYear': self.start_year,
+            'endYear': self.end_year,
+        }
+
+    def pack(self):
+        return [self.institution, self.location, self.degree, self.gpa, self.percentage, self.start_year, self.end_year]
+
+
+@dataclass(slots=True)
+class ProjectEntry:
+    name: str = ''
+    url: str = ''
+    technologies: List[str] = field(default_factory=list)
+    description: str = ''
+
+    @classmethod
+    def from_api_dict(cls, data):
+        return cls(data['name'], data['url'], list(data['technologies']), data['description'])
+
+    def to_api_dict(self):
+        return {
+            'name': self.name,
+            'url': self.url,
+            'technologies': list(self.technologies),
+            'description': self.description,
+        }
+
+    def pack(self):
+        return [self.name, self.url, self.technologies, self.description]
+
+
+@dataclass(slots=True)
+class Achievement:
+    title: str = ''
+    description: str = ''
+
+    @classmethod
+    def from_api_dict(cls, data):
+        return cls(data['title'], data['description'])
+
+    def to_api_dict(self):
+        return {'title': self.title, 'description': self.description}
+
+    def pack(self):
+        return [self.title, self.description]
+
+
+@dataclass(slots=True)
+class ParsedResume:
+    """Typed form of a parse_resume result, for storage.
+
+    fields holds the response fields the result was parsed with (see
+    config.parser.parse_fields); the attributes behind the other fields keep
+    their defaults and to_api_dict leaves them out, so it returns exactly
+    what parse_resume returned.
+    """
+    fields: frozenset = frozenset()
+    first_name: str = ''
+    last_name: str = ''
+    email: str = ''
+    phone: str = ''
+    github: str = ''
+    linkedin: str = ''
+    codechef: str = ''
+    codeforces: str = ''
+    leetcode: str = ''
+    skills: Dict[str, List[str]] = field(default_factory=dict)
+    all_skills: List[str] = field(default_factory=list)
+    education: List[EducationEntry] = field(default_factory=list)
+    projects: List[ProjectEntry] = field(default_factory=list)
+    achievements: List[Achievement] = field(default_factory=list)
+    problems_solved: Optional[int] = None
+    rating_info: Optional[str] = None
+    raw_text: str = ''
+
+    @classmethod
+    def from_api_dict(cls, data):
+        result = cls(frozenset(data))
+        if 'firstName' in data:
+            result.first_name = data['firstName']
+        if 'lastName' in data:
+            result.last_name = data['lastName']
+        if 'email' in data:
+            result.email = data['email']
+        if 'phone' in data:
+            result.phone = data['phone']
+        if 'github' in data:
+            result.github = data['github']
+        if 'linkedin' in data:
+            result.linkedin = data['linkedin']
+        if 'codingProfiles' in data:
+            profiles = data['codingProfiles']
+            result.codechef = profiles['codechef']
+            result.codeforces = profiles['codeforces']
+            result.leetcode = profiles['leetcode']
+        if 'skills' in data:
+            result.skills = {category: list(skills) for category, skills in data['skills'].items()}
+        if 'allSkills' in data:
+            result.all_skills = list(data['allSkills'])
+        if 'education' in data:
+            result.education = [EducationEntry.from_api_dict(entry) for entry in data['education']]
+        if 'projects' in data:
+            result.projects = [ProjectEntry.from_api_dict(entry) for entry in data['projects']]
+        if 'achievements' in data:
+            result.achievements = [Achievement.from_api_dict(entry) for entry in data['achievements']]
+        if 'codingStats' in data:
+            result.problems_solved = data['codingStats'].get('problems_solved')
+            result.rating_info = data['codingStats'].get('rating_info')
+        if 'rawText' in data:
+            result.raw_text = data['rawText']
+        return result
+
+    def to_api_dict(self):
+        """The parse_resume response dict, in the documented key order"""
+        data = {}
+        for name in API_FIELDS:
+            if name not in self.fields:
+                continue
+            if name == 'firstName':
+                data[name] = self.first_name
+            elif name == 'lastName':
+                data[name] = self.last_name
+            elif name == 'email':
+                data[name] = self.email
+            elif name == 'phone':
+                data[name] = self.phone
+            elif name == 'github':
+                data[name] = self.github
+            elif name == 'linkedin':
+                data[name] = self.linkedin
+            elif name == 'codingProfiles':
+                data[name] = {'codechef': self.codechef, 'codeforces': self.codeforces, 'leetcode': self.leetcode}
+            elif name == 'skills':
+                data[name] = {category: list(skills) for category, skills in self.skills.items()}
+            elif name == 'allSkills':
+                data[name] = list(self.all_skills)
+            elif name == 'education':
+                data[name] = [entry.to_api_dict() for entry in self.education]
+            elif name == 'projects':
+                data[name] = [entry.to_api_dict() for entry in self.projects]
+            elif name == 'achievements':
+                data[name] = [entry.to_api_dict() for entry in self.achievements]
+            elif name == 'codingStats':
+                stats = {}
+                if self.problems_solved is not None:
+                    stats['problems_solved'] = self.problems_solved
+                if self.rating_info is not None:
+                    stats['rating_info'] = self.rating_info
+                data[name] = stats
+            elif name == 'rawText':
+                data[name] = self.raw_text
+        return data
+
+    def pack(self):
+        """msgpack bytes: one positional array led by the schema version"""
+        mask = 0
+        for bit, name in enumerate(API_FIELDS):
+            if name in self.fields:
+                mask |= 1 << bit
+        return msgpack.packb([
+            SCHEMA_VERSION, mask,
+            self.first_name, self.last_name, self.email, self.phone, self.github, self.linkedin,
+            self.codechef, self.codeforces, self.leetcode,
+            self.skills, self.all_skills,
+            [entry.pack() for entry in self.education],
+            [entry.pack() for entry in self.projects],
+            [entry.pack() for entry in self.achievements],
+            self.problems_solved, self.rating_info, self.raw_text,
+        ], use_bin_type=True)
+
+    @classmethod
+    def unpack(cls, packed):
+        """Inverse of pack; raises ValueError for bytes of another schema version"""
+        try:
+            values = msgpack.unpackb(packed, raw=False)
+        except (ValueError, TypeError) as e:
+            raise ValueError(f"Not a packed parse result: {e}")
+        if not isinstance(values, list) or not values or values[0] != SCHEMA_VERSION:
+            raise ValueError("Packed parse result has an unsupported schema version")
+        (_, mask, first_name, last_name, email, phone, github, linkedin, codechef, codeforces, leetcode,
+         skills, all_skills, education, projects, achievements, problems_solved, rating_info, raw_text) = values
+        return cls(
+            frozenset(name for bit, name in enumerate(API_FIELDS) if mask & (1 << bit)),
+            first_name, last_name, email, phone, github, linkedin, codechef, codeforces, leetcode,
+            skills, all_skills,
+            [EducationEntry(*entry) for entry in education],
+            [ProjectEntry(*entry) for entry in projects],
+            [Achievement(*entry) for entry in achievements],
+            problems_solved, rating_info, raw_text,
+        )
+
+
+def pack_result(data):
+    """msgpack bytes of a parse_resume result dict"""
+    return ParsedResume.from_api_dict(data).pack()
+
+
+def unpack_result(packed):
+    """parse_resume result dict of pack_result bytes"""
+    return ParsedResume.unpack(packed).to_api_dict()
@@ -1,57 +1,439 @@
-import spacy
+import os
 import re
-import fitz  # PyMuPDF
-import docx
+import threading
+from collections import Counter
+from contextlib import contextmanager
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 
-# Load the spaCy model
-try:
-    nlp = spacy.load("en_core_web_lg")
-except OSError:
-    nlp = spacy.load("en_core_web_sm")
+from .gazetteer import DEFAULT_GAZETTEER_PATH, Gazetteer
+from .parse_metrics import note_pages, stage
+from . import regex_guard
 
-# Enhanced regex patterns
-EMAIL_REGEX = r"[\w\.-]+@[\w\.-]+\.\w+"
+# Bump whenever a change alters parse_resume output; cached results are keyed
+# by it and go stale automatically
+PARSER_VERSION = '8'
+
+SUPPORTED_FILE_TYPES = ('pdf', 'docx', 'doc')
+
+# spaCy and PyMuPDF are imported lazily: config.urls imports this
+# module, so loading them here would slow down every manage.py command.
+_nlp = None
+_nlp_lock = threading.Lock()
+_gazetteer = None
+_gazetteer_lock = threading.Lock()
+
+# Only NER is used; the rest of the en_core_web_* pipeline is never loaded
+NER_EXCLUDED_PIPES = ('tagger', 'parser', 'attribute_ruler', 'lemmatizer', 'senter', 'morphologizer')
+
+def load_ner_pipeline(model):
+    """Load a spaCy model with just the components its NER depends on"""
+    import spacy
+    nlp = spacy.load(model, exclude=list(NER_EXCLUDED_PIPES))
+    # In the sm/md/lg models NER embeds its own tok2vec; the shared one only
+    # fed the excluded tagger and parser
+    if 'tok2vec' in nlp.pipe_names and not nlp.get_pipe('tok2vec').listening_components:
+        nlp.remove_pipe('tok2vec')
+    return nlp
+
+def get_nlp():
+    """Return the shared spaCy pipeline, loading it on first use"""
+    global _nlp
+    if _nlp is None:
+        with _nlp_lock:
+            if _nlp is None:
+                model = parser_setting('RESUME_PARSER_SPACY_MODEL', 'en_core_web_lg')
+                try:
+                    _nlp = load_ner_pipeline(model)
+                except OSError:
+                    _nlp = load_ner_pipeline("en_core_web_sm")
+    return _nlp
+
+def parser_setting(name, default):
+    """Read a RESUME_PARSER_* setting, falling back when Django isn't configured"""
+    from django.conf import settings
+    if not settings.configured and not os.environ.get('DJANGO_SETTINGS_MODULE'):
+        return default
+    return getattr(settings, name, default)
+
+def get_gazetteer():
+    """Return the shared technology gazetteer, loading it on first use"""
+    global _gazetteer
+    if _gazetteer is None:
+        with _gazetteer_lock:
+            if _gazetteer is None:
+                path = parser_setting('RESUME_PARSER_GAZETTEER_PATH', DEFAULT_GAZETTEER_PATH)
+                _gazetteer = Gazetteer.from_file(path)
+    return _gazetteer
+
+def preload():
+    """Import the extraction libraries and load the spaCy model up front.
+
+    Called from the gunicorn hooks in gunicorn.conf.py so workers either share
+    the model copy-on-write or warm it before accepting requests.
+    """
+    import fitz  # noqa: F401
+    get_nlp()
+    get_gazetteer()
+
+# Enhanced regex patterns. Python's re backtracks, so none of these may fail
+# slowly from every start position of a long run: a pattern that opens with
+# an unbounded run is only tried where that run begins (the lookbehinds), and
+# counts are at most 9 digits (int() refuses very long digit strings).
+EMAIL_REGEX = r"(?<![\w\.-])[\w\.-]+@[\w\.-]+\.\w+"
 PHONE_REGEX = r"(?:\+91[-.\s]?)?[6-9]\d{9}|(?:\+\d{1,3}[-.\s]?)?\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}"
 GITHUB_REGEX = r"github\.com/[\w\-\.]+"
 LINKEDIN_REGEX = r"linkedin\.com/[\w\-/]+"
 CODECHEF_REGEX = r"codechef\.com/users/[\w\-]+"
 CODEFORCES_REGEX = r"codeforces\.com/profile/[\w\-]+"
-LEETCODE_REGEX = r"leetcode\.com/u?/[\w\-]+/?[^/]*"
+LEETCODE_REGEX = r"leetcode\.com/(?:u/)?[\w\-]+/?"
 GPA_REGEX = r"(?:gpa|cgpa)[\s:]*(\d\.\d{1,2})"
 PERCENTAGE_REGEX = r"percentage[\s:]*(\d+\.?\d*)"
 YEAR_REGEX = r"\b(19|20)\d{2}\b"
 MONTH_YEAR_REGEX = r"(january|february|march|april|may|june|july|august|september|october|november|december|jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)\s+(\d{4})"
+PROBLEM_COUNT_REGEXES = [
+    r'(?<!\d)(\d{1,9})\s+(?:data structure|problems?|challenges?)',
+    r'solved?\s+(?:over\s+)?(\d{1,9})(?!\d)',
+    r'(?<!\d)(\d{1,9})\s+(?:on\s+)?(?:leetcode|codechef|codeforces)'
+]
+RATING_REGEXES = [
+    r'rating\s+(?:by\s+)?(\d+)',
+    r'rank\s+(?:of\s+)?(\d+)',
+    r'percentile\s+(?:of\s+)?(\d+\.?\d*)'
+]
+
+# Compiled pattern registry: field -> (pattern, anchors, starts_with_anchor).
+# Every anchor is a lower-case literal the pattern cannot match without, so a
+# field whose anchors never occur in the text is skipped without running its
+# pattern. When the pattern starts with its anchor the search can begin at the
+# first hit.
+CONTACT_PATTERNS = {
+    'email': (re.compile(EMAIL_REGEX, re.IGNORECASE), ('@',), False),
+    'phone': (re.compile(PHONE_REGEX), None, False),
+    'github': (re.compile(GITHUB_REGEX, re.IGNORECASE), ('github.com',), True),
+    'linkedin': (re.compile(LINKEDIN_REGEX, re.IGNORECASE), ('linkedin.com',), True),
+    'codechef': (re.compile(CODECHEF_REGEX, re.IGNORECASE), ('codechef',), True),
+    'codeforces': (re.compile(CODEFORCES_REGEX, re.IGNORECASE), ('codeforces',), True),
+    'leetcode': (re.compile(LEETCODE_REGEX, re.IGNORECASE), ('leetcode',), True),
+}
+PROBLEM_COUNT_PATTERNS = {
+    'problems_0': (re.compile(PROBLEM_COUNT_REGEXES[0], re.IGNORECASE), ('data structure', 'problem', 'challenge'), False),
+    'problems_1': (re.compile(PROBLEM_COUNT_REGEXES[1], re.IGNORECASE), ('solve',), True),
+    'problems_2': (re.compile(PROBLEM_COUNT_REGEXES[2], re.IGNORECASE), ('leetcode', 'codechef', 'codeforces'), False),
+}
+RATING_PATTERNS = {
+    'rating_0': (re.compile(RATING_REGEXES[0], re.IGNORECASE), ('rating',), True),
+    'rating_1': (re.compile(RATING_REGEXES[1], re.IGNORECASE), ('rank',), True),
+    'rating_2': (re.compile(RATING_REGEXES[2], re.IGNORECASE), ('percentile',), True),
+}
+GPA_PATTERN = re.compile(GPA_REGEX, re.IGNORECASE)
+PERCENTAGE_PATTERN = re.compile(PERCENTAGE_REGEX, re.IGNORECASE)
+YEAR_PATTERN = re.compile(YEAR_REGEX)
+GITHUB_URL_PATTERN = re.compile(r'https://github\.com/[\w\-\./]+')
+SKILL_CATEGORIES = ('languages', 'frameworks', 'tools', 'platforms', 'databases', 'soft skills')
+SKILL_CATEGORY_PATTERNS = {
+    category: re.compile(rf"{category}[\s:]+([^\n•]+)", re.IGNORECASE) for category in SKILL_CATEGORIES
+}
+
+# Characters of text an extractor looks at: contact and coding stats patterns
+# search this far from where their search starts, skills takes this much of
+# its section (RESUME_PARSER_EXTRACTOR_WINDOWS overrides these)
+DEFAULT_EXTRACTOR_WINDOWS = {'contact': 50_000, 'skills': 20_000, 'coding_stats': 50_000}
+
+def extractor_window(extractor):
+    windows = parser_setting('RESUME_PARSER_EXTRACTOR_WINDOWS', DEFAULT_EXTRACTOR_WINDOWS)
+    return windows.get(extractor, DEFAULT_EXTRACTOR_WINDOWS.get(extractor))
+
+# Anchor literal -> registry fields that require it
+ANCHOR_FIELDS = {}
+for _registry in (CONTACT_PATTERNS, PROBLEM_COUNT_PATTERNS, RATING_PATTERNS):
+    for _field, (_, _anchors, _) in _registry.items():
+        for _literal in _anchors or ():
+            ANCHOR_FIELDS.setdefault(_literal, []).append(_field)
+
+# Characters re.IGNORECASE folds onto an ASCII letter that str.lower() doesn't
+# (dotless i, long s); 'İ' is caught by the length check below
+_UNSAFE_FOLDS = ('\u0131', '\u017f')
+
+def find_anchors(text):
+    """Map every anchored registry field to the first offset of one of its anchors.
+
+    All anchors are found with str.find on one lower-cased copy of the text,
+    which is much cheaper than a case-insensitive regex alternation.
+    """
+    folded = text.lower()
+    if len(folded) != len(text) or any(char in folded for char in _UNSAFE_FOLDS):
+        # Offsets may not line up with the original text; treat every anchor
+        # as present at the start so each pattern runs over the full text
+        return {field: 0 for fields in ANCHOR_FIELDS.values() for field in fields}
+
+    first_seen = {}
+    for literal, fields in ANCHOR_FIELDS.items():
+        pos = folded.find(literal)
+        if pos == -1:
+            continue
+        for field in fields:
+            if field not in first_seen or pos < first_seen[field]:
+                first_seen[field] = pos
+    return first_seen
+
+def _search_field(registry, field, text, anchors, window=None):
+    """Run a registry pattern over window characters unless the anchor scan rules it out"""
+    pattern, literals, starts_with_anchor = registry[field]
+    if literals is None:
+        return regex_guard.search(pattern, text, window=window)
+    pos = anchors.get(field)
+    if pos is None:
+        return None
+    return regex_guard.search(pattern, text, pos if starts_with_anchor else 0, window)
+
+class TextBudget:
+    """Collects extracted text pieces up to a character limit, joined once at the end"""
+
+    def __init__(self, max_chars):
+        self.max_chars = max_chars
+        self.parts = []
+        self.size = 0
+
+    @property
+    def exhausted(self):
+        return self.size >= self.max_chars
+
+    def add(self, piece):
+        if self.exhausted:
+            return
+        piece = piece[:self.max_chars - self.size]
+        self.parts.append(piece)
+        self.size += len(piece)
+
+    def text(self):
+        return ''.join(self.parts)
+
+def _text_budget():
+    return TextBudget(parser_setting('RESUME_PARSER_MAX_CHARS', 200_000))
+
+@contextmanager
+def open_pdf(pdf_file):
+    """Open an uploaded PDF with PyMuPDF without read()ing another full copy.
+
+    The spooled temp file is opened by path and an in-memory upload through
+    its buffer.
+    """
+    import fitz  # PyMuPDF
+    view = None
+    if hasattr(pdf_file, 'temporary_file_path'):
+        doc = fitz.open(pdf_file.temporary_file_path(), filetype="pdf")
+    else:
+        buffer = getattr(pdf_file, 'file', pdf_file)
+        if hasattr(buffer, 'getbuffer'):
+            view = buffer.getbuffer()
+        doc = fitz.open(stream=view if view is not None else pdf_file.read(), filetype="pdf")
+    try:
+        yield doc
+    finally:
+        doc.close()
+        if view is not None:
+            view.release()
 
 def extract_text_from_pdf(pdf_file):
-    """Extract text from PDF file"""
-    doc = fitz.open(stream=pdf_file.read(), filetype="pdf")
-    text = ""
-    for page in doc:
-        text += page.get_text() + "\n"
-    doc.close()
-    return text
+    """Extract text from PDF file, stopping at the page and character caps.
+
+    Documents of RESUME_PARSER_PARALLEL_PAGE_THRESHOLD pages or more are split
+    across the page process pool when there is one (never in a parser pool
+    process).
+    """
+    with open_pdf(pdf_file) as doc:
+        note_pages(doc.page_count)
+        budget = _text_budget()
+        page_count = min(doc.page_count, parser_setting('RESUME_PARSER_MAX_PAGES', 50))
+        threshold = parser_setting('RESUME_PARSER_PARALLEL_PAGE_THRESHOLD', 0)
+        pages = None
+        if threshold and page_count >= threshold:
+            from .parse_executor import extract_pdf_pages_parallel
+            if hasattr(pdf_file, 'temporary_file_path'):
+                source = pdf_file.temporary_file_path()
+            else:
+                pdf_file.seek(0)
+                source = pdf_file.read()
+            pages = extract_pdf_pages_parallel(source, page_count)
+        if pages is None:
+            pages = (doc.load_page(page_number).get_text() for page_number in range(page_count))
+        for page_text in pages:
+            budget.add(page_text + "\n")
+            if budget.exhausted:
+                break
+        return budget.text()
+
+# PyMuPDF span flag for bold text
+PDF_BOLD_FLAG = 16
+
+def extract_layout_from_pdf(pdf_file):
+    """(line, is_header) pairs of a PDF, judged by font size and weight.
+
+    A line is a header when its font is at least a point larger than the body
+    text, or when it is bold and the body text isn't.
+    """
+    budget = _text_budget()
+    lines = []
+    with open_pdf(pdf_file) as doc:
+        note_pages(doc.page_count)
+        max_pages = parser_setting('RESUME_PARSER_MAX_PAGES', 50)
+        for page_number in range(min(doc.page_count, max_pages)):
+            for block in doc.load_page(page_number).get_text("dict")["blocks"]:
+                for line in block.get("lines", ()):
+                    spans = [span for span in line["spans"] if span["text"].strip()]
+                    if not spans:
+                        continue
+                    text = ''.join(span["text"] for span in line["spans"])
+                    size = max(round(span["size"], 1) for span in spans)
+                    bold = all(span["flags"] & PDF_BOLD_FLAG for span in spans)
+                    lines.append((text, size, bold))
+                    budget.add(text)
+            if budget.exhausted:
+                break
+
+    # The body style is whatever most of the characters are set in
+    sizes, bold_chars = Counter(), 0
+    for text, size, bold in lines:
+        sizes[size] += len(text)
+        bold_chars += len(text) if bold else 0
+    if not sizes:
+        return []
+    body_size = sizes.most_common(1)[0][0]
+    body_bold = bold_chars * 2 > sum(sizes.values())
+    return [(text, size >= body_size + 1 or (bold and not body_bold)) for text, size, bold in lines]
+
+# WordprocessingML elements that contribute text, as python-docx renders them
+W_NAMESPACE = '{http://schemas.openxmlformats.org/wordprocessingml/2006/main}'
+W_TEXT = W_NAMESPACE + 't'
+W_PARAGRAPH = W_NAMESPACE + 'p'
+W_PARAGRAPH_STYLE = W_NAMESPACE + 'pStyle'
+W_OUTLINE_LEVEL = W_NAMESPACE + 'outlineLvl'
+W_TABLE = W_NAMESPACE + 'tbl'
+W_RUN = W_NAMESPACE + 'r'
+W_STYLE = W_NAMESPACE + 'style'
+W_NAME = W_NAMESPACE + 'name'
+W_VAL = W_NAMESPACE + 'val'
+W_STYLE_ID = W_NAMESPACE + 'styleId'
+W_BREAKS = {W_NAMESPACE + 'tab': '\t', W_NAMESPACE + 'br': '\n', W_NAMESPACE + 'cr': '\n'}
+
+class _BoundedReader:
+    """File wrapper that refuses to read past max_bytes (decompression bombs)"""
+
+    def __init__(self, raw, max_bytes):
+        self.raw = raw
+        self.remaining = max_bytes
+
+    def read(self, size=-1):
+        if size < 0 or size > self.remaining:
+            size = self.remaining + 1
+        data = self.raw.read(size)
+        self.remaining -= len(data)
+        if self.remaining < 0:
+            raise ValueError("DOCX document is too large to parse")
+        return data
+
+def iter_docx_paragraphs(docx_file, with_styles=False):
+    """(text, style name) of each paragraph, streamed from word/document.xml.
+
+    Paragraphs inside table cells are w:p elements too, so tables are covered.
+    Style names are only resolved (from word/styles.xml) when with_styles is
+    set; otherwise the style is always None.
+    """
+    import zipfile
+    from xml.etree.ElementTree import ParseError, iterparse
+
+    max_xml_bytes = parser_setting('RESUME_PARSER_MAX_XML_BYTES', 50 * 1024 * 1024)
+    source = docx_file.temporary_file_path() if hasattr(docx_file, 'temporary_file_path') else docx_file
+    try:
+        with zipfile.ZipFile(source) as archive:
+            style_names = {}
+            if with_styles and 'word/styles.xml' in archive.namelist():
+                with archive.open('word/styles.xml') as styles:
+                    for _, elem in iterparse(_BoundedReader(styles, max_xml_bytes)):
+                        if elem.tag == W_STYLE:
+                            name = elem.find(W_NAME)
+                            if name is not None:
+                                style_names[elem.get(W_STYLE_ID)] = name.get(W_VAL)
+                            elem.clear()
+
+            # One [text pieces, style] entry per open paragraph; text boxes
+            # can nest a paragraph inside another
+            paragraphs = []
+            run_depth = 0
+            with archive.open('word/document.xml') as document:
+                for event, elem in iterparse(_BoundedReader(document, max_xml_bytes), events=('start', 'end')):
+                    if event == 'start':
+                        if elem.tag == W_PARAGRAPH:
+                            paragraphs.append([[], None])
+                        elif elem.tag == W_RUN:
+                            run_depth += 1
+                        elif run_depth and elem.tag in W_BREAKS and paragraphs:
+                            # w:tab outside a run is a tab stop definition
+                            paragraphs[-1][0].append(W_BREAKS[elem.tag])
+                        continue
+                    if elem.tag == W_RUN:
+                        run_depth -= 1
+                    elif elem.tag == W_TEXT and paragraphs:
+                        paragraphs[-1][0].append(elem.text or '')
+                    elif elem.tag == W_PARAGRAPH_STYLE and with_styles and paragraphs:
+                        style_id = elem.get(W_VAL)
+                        paragraphs[-1][1] = style_names.get(style_id, style_id)
+                    elif elem.tag == W_OUTLINE_LEVEL and with_styles and paragraphs:
+                        paragraphs[-1][1] = paragraphs[-1][1] or 'heading'
+                    elif elem.tag == W_PARAGRAPH:
+                        pieces, style = paragraphs.pop()
+                        elem.clear()
+                        yield ''.join(pieces), style
+                    elif elem.tag == W_TABLE:
+                        elem.clear()
+    except (zipfile.BadZipFile, KeyError, ParseError):
+        raise ValueError("The file is not a valid DOCX document")
 
 def extract_text_from_docx(docx_file):
-    """Extract text from DOCX file"""
-    doc = docx.Document(docx_file)
-    text = ""
-    for para in doc.paragraphs:
-        text += para.text + "\n"
-    return text
+    """Extract text from DOCX file, tables included, stopping at the character cap"""
+    budget = _text_budget()
+    for text, _ in iter_docx_paragraphs(docx_file):
+        budget.add(text + '\n')
+        if budget.exhausted:
+            break
+    return budget.text()
+
+def extract_layout_from_docx(docx_file):
+    """(paragraph, is_header) pairs of a DOCX, judged by paragraph style"""
+    budget = _text_budget()
+    paragraphs = []
+    for text, style in iter_docx_paragraphs(docx_file, with_styles=True):
+        paragraphs.append((text, bool(style) and style.lower().startswith('heading')))
+        budget.add(text)
+        if budget.exhausted:
+            break
+    return paragraphs
 
 def clean_text(text):
-    """Clean and normalize text"""
-    # Remove extra whitespace and normalize
-    text = re.sub(r'\s+', ' ', text)
-    return text.strip()
+    """Clean and normalize text, keeping one line per non-empty source line"""
+    # Collapse whitespace inside lines only; section headers are detected
+    # line by line, so the line breaks have to survive cleaning
+    text = re.sub(r'[^\S\n]+', ' ', text)
+    lines = (line.strip() for line in text.split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+def clean_layout(pairs):
+    """clean_text for (text, is_header) pairs: returns the cleaned text and the
+    indices of its header lines, or None when the layout marked no header"""
+    lines, header_lines = [], set()
+    for text, is_header in pairs:
+        for line in clean_text(text).split('\n'):
+            if line:
+                if is_header:
+                    header_lines.add(len(lines))
+                lines.append(line)
+    return '\n'.join(lines), header_lines or None
 
-def extract_name(text):
-    """Extract name - usually the first line or prominent text"""
+def extract_name_from_header(text):
+    """Name from the first few lines, if one of them looks like a name"""
     lines = [line.strip() for line in text.split('\n') if line.strip()]
     
-    # First try: look for name in first few lines
     for i, line in enumerate(lines[:3]):
         # Skip lines with contact info, education keywords, etc.
         if any(keyword in line.lower() for keyword in 
@@ -63,88 +445,136 @@ def extract_name(text):
         if 2 <= len(words) <= 4 and all(word.replace('.', '').isalpha() for word in words):
             return line
     
-    # Fallback: use NER
-    doc = nlp(text)
+    return None
+
+def extract_name_from_doc(doc):
+    """First multi-word PERSON entity of a spaCy doc"""
     for ent in doc.ents:
         if ent.label_ == "PERSON" and len(ent.text.split()) >= 2:
             return ent.text.strip()
     
     return None
 
-def extract_contact_info(text):
+def ner_window(text):
+    """The leading lines of text that the name NER looks at first"""
+    limit = parser_setting('RESUME_PARSER_NER_WINDOW_CHARS', 1000)
+    if len(text) <= limit:
+        return text
+    end = text.rfind('\n', 0, limit)
+    return text[:end if end > 0 else limit]
+
+def extract_name(text, doc=None):
+    """Extract name - usually the first line or prominent text.
+
+    doc is an already processed spaCy doc of ner_window(text) (e.g. from
+    nlp.pipe in batch parsing); without one, the NER fallback runs the model
+    here. The rest of the document only goes through NER when the window has
+    no name in it.
+    """
+    # First try: look for name in first few lines
+    name = extract_name_from_header(text)
+    if name:
+        return name
+    
+    # Fallback: use NER on the header window, then on everything
+    window = ner_window(text)
+    if doc is None:
+        doc = get_nlp()(window)
+    name = extract_name_from_doc(doc)
+    if name or len(window) == len(text):
+        return name
+    return extract_name_from_doc(get_nlp()(text))
+
+def extract_contact_info(text, anchors=None):
     """Extract comprehensive contact information"""
-    contact_info = {}
-    
-    # Email
-    email_match = re.search(EMAIL_REGEX, text, re.IGNORECASE)
-    contact_info['email'] = email_match.group(0) if email_match else ""
-    
-    # Phone
-    phone_match = re.search(PHONE_REGEX, text)
-    contact_info['phone'] = phone_match.group(0) if phone_match else ""
-    
-    # GitHub
-    github_match = re.search(GITHUB_REGEX, text, re.IGNORECASE)
-    contact_info['github'] = github_match.group(0) if github_match else ""
-    
-    # LinkedIn
-    linkedin_match = re.search(LINKEDIN_REGEX, text, re.IGNORECASE)
-    contact_info['linkedin'] = linkedin_match.group(0) if linkedin_match else ""
-    
-    # Coding profiles
-    codechef_match = re.search(CODECHEF_REGEX, text, re.IGNORECASE)
-    contact_info['codechef'] = codechef_match.group(0) if codechef_match else ""
-    
-    codeforces_match = re.search(CODEFORCES_REGEX, text, re.IGNORECASE)
-    contact_info['codeforces'] = codeforces_match.group(0) if codeforces_match else ""
+    if anchors is None:
+        anchors = find_anchors(text)
     
-    leetcode_match = re.search(LEETCODE_REGEX, text, re.IGNORECASE)
-    contact_info['leetcode'] = leetcode_match.group(0) if leetcode_match else ""
+    # Email, phone, GitHub, LinkedIn and coding profiles
+    contact_info = {}
+    window = extractor_window('contact')
+    for field in CONTACT_PATTERNS:
+        match = _search_field(CONTACT_PATTERNS, field, text, anchors, window)
+        contact_info[field] = match.group(0) if match else ""
     
     return contact_info
 
+# Common section headers; each one also ends whichever section precedes it
+SECTION_HEADERS = ('education', 'experience', 'skills', 'projects', 'achievements', 'certifications', 'awards')
+MAX_HEADER_LENGTH = 50
+
+class ResumeSections:
+    """Index of section header -> (start, end) line span, built in one pass.
+
+    header_lines optionally holds the indices of the lines the document layout
+    marked as headers (see extract_resume_text); only those can then start a
+    section, whatever their length or wording elsewhere.
+    """
+
+    def __init__(self, text, headers=SECTION_HEADERS, header_lines=None):
+        self.lines = [line.strip() for line in text.split('\n')]
+        self.header_lines = header_lines
+        self.spans = {}
+        open_sections = {}
+
+        for i, line in enumerate(self.lines):
+            if not self.is_header_line(i, line):
+                continue
+            line_lower = line.lower()
+            hits = [header for header in headers if header in line_lower]
+            if not hits:
+                continue
+
+            # A header line closes every open section it doesn't name itself
+            for header in list(open_sections):
+                if header not in hits:
+                    self.spans[header] = (open_sections.pop(header), i)
+
+            # Only the first header for a section opens it
+            for header in hits:
+                if header not in self.spans and header not in open_sections:
+                    open_sections[header] = i + 1
+
+        for header, start in open_sections.items():
+            self.spans[header] = (start, len(self.lines))
+
+    def is_header_line(self, i, line):
+        if self.header_lines is not None:
+            return i in self.header_lines
+        return bool(line) and len(line) < MAX_HEADER_LENGTH
+
+    def get(self, section_name):
+        """Content lines of a section, without repeated header lines"""
+        span = self.spans.get(section_name)
+        if span is None:
+            return ''
+        start, end = span
+        return '\n'.join(
+            line for i, line in enumerate(self.lines[start:end], start)
+            if line and not (section_name in line.lower() and self.is_header_line(i, line))
+        )
+
 def extract_section_content(text, section_name):
     """Extract content between section headers"""
-    lines = text.split('\n')
-    section_content = []
-    capturing = False
-    
-    # Common section headers that would end the current section
-    section_endings = ['education', 'experience', 'skills', 'projects', 'achievements', 'certifications', 'awards']
-    
-    for line in lines:
-        line_lower = line.lower().strip()
-        
-        # Check if we've hit the target section
-        if section_name.lower() in line_lower and len(line.strip()) < 50:  # Likely a header
-            capturing = True
-            continue
-        
-        # Check if we've hit another section (stop capturing)
-        if capturing and any(ending in line_lower for ending in section_endings if ending != section_name.lower()) and len(line.strip()) < 50:
-            break
-        
-        # Capture content
-        if capturing and line.strip():
-            section_content.append(line.strip())
-    
-    return '\n'.join(section_content)
+    section_name = section_name.lower()
+    headers = SECTION_HEADERS if section_name in SECTION_HEADERS else SECTION_HEADERS + (section_name,)
+    return ResumeSections(text, headers).get(section_name)
 
-def extract_skills(text):
+def extract_skills(text, sections=None):
     """Extract skills from Skills Summary section"""
-    skills_section = extract_section_content(text, 'skills')
+    if sections is None:
+        sections = ResumeSections(text)
+    skills_section = sections.get('skills')
     if not skills_section:
         # Fallback: look for skills in full text
         skills_section = text
+    skills_section = skills_section[:extractor_window('skills')]
     
     skills_dict = {}
     
     # Look for categorized skills (Languages:, Frameworks:, etc.)
-    categories = ['languages', 'frameworks', 'tools', 'platforms', 'databases', 'soft skills']
-    
-    for category in categories:
-        pattern = rf"{category}[\s:]+([^\n•]+)"
-        match = re.search(pattern, skills_section, re.IGNORECASE)
+    for category, pattern in SKILL_CATEGORY_PATTERNS.items():
+        match = regex_guard.search(pattern, skills_section)
         
         if match:
             skills_text = match.group(1)
@@ -152,6 +582,12 @@ def extract_skills(text):
             skills_list = [skill.strip() for skill in skills_text.split(',') if skill.strip()]
             skills_dict[category.title()] = skills_list
     
+    # Free-form skills sections: fall back to the technology gazetteer
+    if not skills_dict:
+        technologies = get_gazetteer().find(skills_section)
+        if technologies:
+            skills_dict['Technologies'] = technologies
+    
     # Flatten all skills for compatibility
     all_skills = []
     for category_skills in skills_dict.values():
@@ -162,9 +598,11 @@ def extract_skills(text):
         'all_skills': all_skills
     }
 
-def extract_education(text):
+def extract_education(text, sections=None):
     """Extract education information with detailed parsing"""
-    education_section = extract_section_content(text, 'education')
+    if sections is None:
+        sections = ResumeSections(text)
+    education_section = sections.get('education')
     if not education_section:
         return []
     
@@ -202,17 +640,17 @@ def extract_education(text):
                 current_entry['degree'] = line
             
             # Extract percentage
-            percentage_match = re.search(PERCENTAGE_REGEX, line, re.IGNORECASE)
+            percentage_match = regex_guard.search(PERCENTAGE_PATTERN, line)
             if percentage_match:
                 current_entry['percentage'] = percentage_match.group(1)
             
             # Extract GPA
-            gpa_match = re.search(GPA_REGEX, line, re.IGNORECASE)
+            gpa_match = regex_guard.search(GPA_PATTERN, line)
             if gpa_match:
                 current_entry['gpa'] = gpa_match.group(1)
             
             # Extract years
-            years = re.findall(r'\b(19|20)\d{2}\b', line)
+            years = regex_guard.findall(YEAR_PATTERN, line)
             if years:
                 if len(years) >= 2:
                     current_entry['startYear'] = years[0]
@@ -226,9 +664,11 @@ def extract_education(text):
     
     return education_entries
 
-def extract_projects(text):
+def extract_projects(text, sections=None):
     """Extract project information with detailed parsing"""
-    projects_section = extract_section_content(text, 'projects')
+    if sections is None:
+        sections = ResumeSections(text)
+    projects_section = sections.get('projects')
     if not projects_section:
         return []
     
@@ -263,16 +703,12 @@ def extract_projects(text):
         
         elif current_project:
             # Look for GitHub URL
-            github_match = re.search(r'https://github\.com/[\w\-\./]+', line)
+            github_match = regex_guard.search(GITHUB_URL_PATTERN, line)
             if github_match:
                 current_project['url'] = github_match.group(0)
             
-            # Extract technologies (look for common tech terms)
-            tech_pattern = r'\b(?:React|Node\.js|Express|MongoDB|Python|JavaScript|TypeScript|TensorFlow|Keras|Docker|AWS|GCP|MySQL|PostgreSQL|Redis|Flask|Django|Vue|Angular|Next\.js|Tailwind|Bootstrap|Git|Docker|Kubernetes|MERN|MEAN|API|REST|GraphQL|JWT|OAuth|HTML|CSS|SASS|LESS|Webpack|Babel|npm|yarn|pip|conda|Linux|Windows|macOS|Android|iOS|Swift|Kotlin|Java|C\+\+|C#|PHP|Ruby|Go|Rust|Scala|R|MATLAB|Jupyter|Pandas|NumPy|Matplotlib|Plotly|Scikit-learn|OpenCV|PIL|BeautifulSoup|Selenium|Scrapy|FastAPI|Streamlit|Gradio|Heroku|Netlify|Vercel|Firebase|Supabase)\b'
-            
-            technologies = re.findall(tech_pattern, line, re.IGNORECASE)
-            if technologies:
-                current_project['technologies'].extend([tech.title() for tech in technologies])
+            # Extract technologies (look for known tech terms)
+            current_project['technologies'].extend(get_gazetteer().find(line))
             
             # Add to description
             description_lines.append(line)
@@ -284,13 +720,15 @@ def extract_projects(text):
     
     # Clean up projects
     for project in projects:
-        project['technologies'] = list(set(project['technologies']))  # Remove duplicates
+        project['technologies'] = list(dict.fromkeys(project['technologies']))  # Remove duplicates
     
     return projects
 
-def extract_achievements(text):
+def extract_achievements(text, sections=None):
     """Extract achievements and accomplishments"""
-    achievements_section = extract_section_content(text, 'achievements')
+    if sections is None:
+        sections = ResumeSections(text)
+    achievements_section = sections.get('achievements')
     if not achievements_section:
         return []
     
@@ -315,88 +753,160 @@ def extract_achievements(text):
     
     return achievements
 
-def extract_coding_profiles_stats(text):
+def extract_coding_profiles_stats(text, anchors=None):
     """Extract coding profile statistics"""
+    if anchors is None:
+        anchors = find_anchors(text)
     stats = {}
+    window = extractor_window('coding_stats')
     
     # Look for problem counts
-    problem_patterns = [
-        r'(\d+)\s+(?:data structure|problems?|challenges?)',
-        r'solved?\s+(?:over\s+)?(\d+)',
-        r'(\d+)\s+(?:on\s+)?(?:leetcode|codechef|codeforces)'
-    ]
-    
-    for pattern in problem_patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
+    for field, (pattern, _, _) in PROBLEM_COUNT_PATTERNS.items():
+        if field not in anchors:
+            continue
+        matches = regex_guard.findall(pattern, text, window=window)
         if matches:
             stats['problems_solved'] = max([int(match) for match in matches])
             break
     
     # Look for ratings or ranks
-    rating_patterns = [
-        r'rating\s+(?:by\s+)?(\d+)',
-        r'rank\s+(?:of\s+)?(\d+)',
-        r'percentile\s+(?:of\s+)?(\d+\.?\d*)'
-    ]
-    
-    for pattern in rating_patterns:
-        match = re.search(pattern, text, re.IGNORECASE)
+    for field in RATING_PATTERNS:
+        match = _search_field(RATING_PATTERNS, field, text, anchors, window)
         if match:
             stats['rating_info'] = match.group(0)
             break
     
     return stats
 
-def parse_resume(file):
-    """Main parsing function"""
-    # Extract text
+def extract_text(file):
+    """Raw text of an uploaded PDF or DOCX, dispatching on the file extension"""
     file_extension = file.name.split('.')[-1].lower()
     if file_extension == 'pdf':
-        text = extract_text_from_pdf(file)
+        return extract_text_from_pdf(file)
     elif file_extension in ['docx', 'doc']:
-        text = extract_text_from_docx(file)
+        return extract_text_from_docx(file)
     else:
         raise ValueError(f"Unsupported file type: {file_extension}")
-    
-    text = clean_text(text)
-    
-    # Extract all information
-    name = extract_name(text)
-    contact_info = extract_contact_info(text)
-    skills_info = extract_skills(text)
-    education = extract_education(text)
-    projects = extract_projects(text)
-    achievements = extract_achievements(text)
-    coding_stats = extract_coding_profiles_stats(text)
-    
-    # Parse name
-    first_name = ""
-    last_name = ""
-    if name:
-        name_parts = name.split()
-        first_name = name_parts[0] if name_parts else ""
-        last_name = " ".join(name_parts[1:]) if len(name_parts) > 1 else ""
-    
-    # Structure the parsed data
-    parsed_data = {
-        "firstName": first_name,
-        "lastName": last_name,
-        "email": contact_info.get('email', ''),
-        "phone": contact_info.get('phone', ''),
-        "github": contact_info.get('github', ''),
-        "linkedin": contact_info.get('linkedin', ''),
-        "codingProfiles": {
-            "codechef": contact_info.get('codechef', ''),
-            "codeforces": contact_info.get('codeforces', ''),
-            "leetcode": contact_info.get('leetcode', '')
-        },
-        "skills": skills_info.get('categorized', {}),
-        "allSkills": skills_info.get('all_skills', []),
-        "education": education,
-        "projects": projects,
-        "achievements": achievements,
-        "codingStats": coding_stats,
-        "rawText": text  # For debugging
-    }
-    
-    return parsed_data
+
+def extract_layout(file):
+    """(text, is_header) pairs of an uploaded PDF or DOCX"""
+    file_extension = file.name.split('.')[-1].lower()
+    if file_extension == 'pdf':
+        return extract_layout_from_pdf(file)
+    elif file_extension in ['docx', 'doc']:
+        return extract_layout_from_docx(file)
+    else:
+        raise ValueError(f"Unsupported file type: {file_extension}")
+
+def extract_resume_text(file):
+    """Cleaned text of an upload plus the indices of its header lines.
+
+    With RESUME_PARSER_LAYOUT_SECTIONS on, headers come from font metadata
+    (PDF) or paragraph styles (DOCX); the indices are None when that is off
+    or the document has no distinguishable headers, and sections are then
+    found from the text alone.
+    """
+    if parser_setting('RESUME_PARSER_LAYOUT_SECTIONS', False):
+        return clean_layout(extract_layout(file))
+    return clean_text(extract_text(file)), None
+
+# Response field -> the extractor that produces it. Only extractors behind
+# requested fields run.
+FIELD_EXTRACTORS = {
+    'firstName': 'name',
+    'lastName': 'name',
+    'email': 'contact',
+    'phone': 'contact',
+    'github': 'contact',
+    'linkedin': 'contact',
+    'codingProfiles': 'contact',
+    'skills': 'skills',
+    'allSkills': 'skills',
+    'education': 'education',
+    'projects': 'projects',
+    'achievements': 'achievements',
+    'codingStats': 'coding_stats',
+    'rawText': None,
+}
+# rawText doubles the response size and is only useful for debugging, so it
+# has to be asked for
+DEFAULT_FIELDS = frozenset(field for field in FIELD_EXTRACTORS if field != 'rawText')
+
+def parse_fields(value):
+    """Field set from a comma-separated `fields` parameter; None or empty means DEFAULT_FIELDS"""
+    if not value:
+        return DEFAULT_FIELDS
+    fields = frozenset(field.strip() for field in value.split(',') if field.strip())
+    unknown = fields - FIELD_EXTRACTORS.keys()
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+    return fields
+
+def parse_resume(file, fields=DEFAULT_FIELDS):
+    """Main parsing function"""
+    with stage('extract_text'):
+        text, header_lines = extract_resume_text(file)
+    return parse_text(text, header_lines=header_lines, fields=fields)
+
+def parse_text(text, doc=None, header_lines=None, fields=DEFAULT_FIELDS):
+    """Parse already extracted and cleaned resume text.
+
+    doc optionally carries a spaCy doc of ner_window(text) for the name NER
+    fallback, and header_lines the layout header indices from
+    extract_resume_text. Only the response fields in fields are returned, and
+    only their extractors run. Once RESUME_PARSER_REGEX_BUDGET seconds of
+    pattern matching are spent, the remaining searches find nothing.
+    """
+    wanted = {FIELD_EXTRACTORS[field] for field in fields}
+    # Every pattern search below is charged to one per-document budget
+    with regex_guard.regex_budget(parser_setting('RESUME_PARSER_REGEX_BUDGET', 0.25)):
+        extracted = {}
+        with stage('sections'):
+            if wanted & {'skills', 'education', 'projects', 'achievements'}:
+                sections = ResumeSections(text, header_lines=header_lines)
+            if wanted & {'contact', 'coding_stats'}:
+                anchors = find_anchors(text)
+    
+        # Extract all information
+        if 'name' in wanted:
+            with stage('name'):
+                name = extract_name(text, doc)
+            # Parse name
+            name_parts = name.split() if name else []
+            extracted['firstName'] = name_parts[0] if name_parts else ""
+            extracted['lastName'] = " ".join(name_parts[1:])
+        if 'contact' in wanted:
+            with stage('contact'):
+                contact_info = extract_contact_info(text, anchors)
+            extracted.update({
+                "email": contact_info.get('email', ''),
+                "phone": contact_info.get('phone', ''),
+                "github": contact_info.get('github', ''),
+                "linkedin": contact_info.get('linkedin', ''),
+                "codingProfiles": {
+                    "codechef": contact_info.get('codechef', ''),
+                    "codeforces": contact_info.get('codeforces', ''),
+                    "leetcode": contact_info.get('leetcode', '')
+                },
+            })
+        if 'skills' in wanted:
+            with stage('skills'):
+                skills_info = extract_skills(text, sections)
+            extracted['skills'] = skills_info.get('categorized', {})
+            extracted['allSkills'] = skills_info.get('all_skills', [])
+        if 'education' in wanted:
+            with stage('education'):
+                extracted['education'] = extract_education(text, sections)
+        if 'projects' in wanted:
+            with stage('projects'):
+                extracted['projects'] = extract_projects(text, sections)
+        if 'achievements' in wanted:
+            with stage('achievements'):
+                extracted['achievements'] = extract_achievements(text, sections)
+        if 'coding_stats' in wanted:
+            with stage('coding_stats'):
+                extracted['codingStats'] = extract_coding_profiles_stats(text, anchors)
+    extracted['rawText'] = text
+    
+    # Structure the parsed data, in the documented key order
+    return {field: extracted[field] for field in FIELD_EXTRACTORS if field in fields}
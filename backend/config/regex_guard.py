@@ -0,0 +1,72 @@
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+logger = logging.getLogger(__name__)
+
+_active = ContextVar('resume_regex_budget', default=None)
+
+
+class RegexBudget:
+    """Seconds of regex matching one document may spend.
+
+    A running match can't be interrupted, so the budget is checked between
+    calls: once it is spent, the remaining searches of the document return
+    no match. Every parser pattern is linear-time and searches a bounded
+    window, which keeps the overshoot of the last call small.
+    """
+
+    def __init__(self, seconds):
+        self.remaining = seconds
+        self.skipped = 0
+
+    @property
+    def exhausted(self):
+        return self.remaining <= 0
+
+    @contextmanager
+    def activate(self):
+        token = _active.set(self)
+        try:
+            yield self
+        finally:
+            _active.reset(token)
+
+
+@contextmanager
+def regex_budget(seconds):
+    """Run the block's guarded searches under a budget; no budget when seconds is falsy"""
+    if not seconds:
+        yield None
+        return
+    budget = RegexBudget(seconds)
+    with budget.activate():
+        yield budget
+    if budget.skipped:
+        logger.warning("Regex budget of %.2fs spent; skipped %d pattern search(es)", seconds, budget.skipped)
+
+
+def _run(method, text, pos, window):
+    endpos = len(text) if window is None else min(len(text), pos + window)
+    budget = _active.get()
+    if budget is None:
+        return method(text, pos, endpos)
+    if budget.exhausted:
+        budget.skipped += 1
+        return None
+    started = time.perf_counter()
+    try:
+        return method(text, pos, endpos)
+    finally:
+        budget.remaining -= time.perf_counter() - started
+
+
+def search(pattern, text, pos=0, window=None):
+    """pattern.search over at most window characters from pos, charged to the active budget"""
+    return _run(pattern.search, text, pos, window)
+
+
+def findall(pattern, text, pos=0, window=None):
+    """pattern.findall over at most window characters from pos, charged to the active budget"""
+    return _run(pattern.findall, text, pos, window) or []
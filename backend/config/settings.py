@@ -29,6 +29,7 @@ INSTALLED_APPS = [
     'profiles',
     # Your apps
     'user_auth',
+    'resumes',
 ]
 
 MEDIA_URL = '/media/'
@@ -112,7 +113,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # Django REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'user_auth.authentication.StatelessJWTAuthentication', # JWT claims; no User query per request
 
     ),
     'DEFAULT_PERMISSION_CLASSES': (
@@ -152,9 +153,79 @@ SIMPLE_JWT = {
     'SLIDING_TOKEN_REFRESH_EXP_CLAIM': 'refresh_exp',
     'SLIDING_TOKEN_LIFETIME': timedelta(minutes=5),
     'SLIDING_TOKEN_REFRESH_LIFETIME': timedelta(days=1),
-    'TOKEN_OBTAIN_SERIALIZER': 'user_auth.serializers.CustomTokenObtainPairSerializer',
+    'TOKEN_OBTAIN_SERIALIZER': 'profiles.serializers.CustomTokenObtainPairSerializer',
 }
 
+# Cache: Redis when REDIS_URL is set (production), per-process memory otherwise
+REDIS_URL = os.getenv('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
+# Role lookups in RoleCheckMiddleware
+USER_ROLE_CACHE_ALIAS = 'default' # Shared tier; None disables it
+USER_ROLE_CACHE_SIZE = 10_000 # In-process LRU entries
+USER_ROLE_CACHE_LOCAL_TTL = int(os.getenv('USER_ROLE_CACHE_LOCAL_TTL', 30)) # Seconds a worker may keep serving a role changed elsewhere
+USER_ROLE_CACHE_TIMEOUT = 300 # Seconds a role stays in the shared tier
+
+# Token version and is_active lookups in StatelessJWTAuthentication
+USER_AUTH_STATE_CACHE_ALIAS = 'default' # Shared tier; None disables it
+USER_AUTH_STATE_CACHE_SIZE = 10_000 # In-process LRU entries
+USER_AUTH_STATE_CACHE_LOCAL_TTL = int(os.getenv('USER_AUTH_STATE_CACHE_LOCAL_TTL', 5)) # Seconds a worker may keep accepting a token revoked elsewhere
+USER_AUTH_STATE_CACHE_TIMEOUT = 300 # Seconds an entry stays in the shared tier
+
+# Resume parser
+RESUME_PARSER_SPACY_MODEL = os.getenv('RESUME_PARSER_SPACY_MODEL', 'en_core_web_lg') # en_core_web_lg, _md or _sm; falls back to _sm if missing
+RESUME_PARSER_NER_WINDOW_CHARS = 1000 # Leading characters searched for a name before running NER on the whole resume
+RESUME_PARSER_MAX_PAGES = 50 # PDF pages read per resume; the rest is ignored
+# PDFs with at least this many pages are extracted by RESUME_PARSER_PAGE_PROCESSES processes in parallel;
+# 0 always extracts serially. Serial extraction takes about 1.5 ms a page (75 ms at the 50-page cap), and
+# on one core 4 page processes were slower at every length (0.84x at 50 pages), so the page pool is off
+# unless enabled on a host with idle cores; set both from `python -m benchmarks.pdf_pages` there.
+# Parser pool processes (RESUME_PARSER_PROCESSES, run_parse_workers) never use a page pool
+RESUME_PARSER_PARALLEL_PAGE_THRESHOLD = int(os.getenv('RESUME_PARSER_PARALLEL_PAGE_THRESHOLD', 16))
+RESUME_PARSER_PAGE_PROCESSES = int(os.getenv('RESUME_PARSER_PAGE_PROCESSES', 0)) # Below 2 disables the page pool
+RESUME_PARSER_MAX_CHARS = 200_000 # Characters of text extracted per resume
+RESUME_PARSER_MAX_XML_BYTES = 50 * 1024 * 1024 # Uncompressed word/document.xml read per DOCX before giving up
+RESUME_PARSER_EXTRACTOR_WINDOWS = {'contact': 50_000, 'skills': 20_000, 'coding_stats': 50_000} # Characters of a resume each of these extractors looks at
+RESUME_PARSER_REGEX_BUDGET = 0.25 # Seconds of pattern matching per resume; later searches find nothing once it is spent
+RESUME_PARSER_LAYOUT_SECTIONS = os.getenv('RESUME_PARSER_LAYOUT_SECTIONS', 'False') == 'True' # Find section headers from PDF fonts / DOCX heading styles
+RESUME_PARSER_CACHE_ALIAS = 'default' # Shared tier for parse results; None disables it
+RESUME_PARSER_CACHE_SIZE = int(os.getenv('RESUME_PARSER_CACHE_SIZE', 256)) # In-process LRU entries
+RESUME_PARSER_CACHE_TIMEOUT = 60 * 60 * 24 * 7 # Seconds a parse result stays in the shared tier
+# Parser processes of each web process; parses run there under the timeout and memory limit below. The default
+# splits the cores between the gunicorn workers (GUNICORN_WORKERS, defaulting as in gunicorn.conf.py), at least one
+# each. 0 parses inside the web process with no time or memory limit, for development only.
+# `manage.py run_parse_workers --processes N` sizes its own pool
+RESUME_PARSER_PROCESSES = int(os.getenv(
+    'RESUME_PARSER_PROCESSES',
+    max(1, (os.cpu_count() or 1) // int(os.getenv('GUNICORN_WORKERS', (os.cpu_count() or 1) * 2 + 1))),
+))
+RESUME_PARSER_MAX_TASKS_PER_CHILD = 100 # Recycle a parser process after this many parses
+RESUME_PARSER_TASK_TIMEOUT = 30 # Wall-clock seconds per parse
+RESUME_PARSER_TASK_MEMORY_MB = 1024 # Address space a parse may add on top of the loaded model
+RESUME_PARSER_MAX_UPLOAD_BYTES = int(os.getenv('RESUME_PARSER_MAX_UPLOAD_BYTES', 10 * 1024 * 1024)) # Parse uploads over this are cut off while streaming (413)
+RESUME_PARSER_SYNC_MAX_BYTES = int(os.getenv('RESUME_PARSER_SYNC_MAX_BYTES', 2 * 1024 * 1024)) # Larger uploads are parsed as jobs
+RESUME_PARSER_JOB_WORKERS = int(os.getenv('RESUME_PARSER_JOB_WORKERS', 2)) # In-process job threads; 0 leaves jobs to run_parse_workers
+RESUME_PARSER_JOB_POLL_INTERVAL = 5.0 # Seconds between job table polls
+RESUME_PARSER_JOB_STALE_AFTER = 300 # Seconds before a running job is assumed dead and retried
+RESUME_PARSER_BATCH_MAX_FILES = 500 # Resumes per batch request, counting ZIP members
+RESUME_PARSER_BATCH_MAX_BYTES = 200 * 1024 * 1024 # Total uncompressed bytes per batch request
+RESUME_PARSER_NER_BATCH_SIZE = 32 # Documents per nlp.pipe call in batch parsing
+RESUME_PARSER_METRICS = os.getenv('RESUME_PARSER_METRICS', 'True') == 'True' # Per-stage timing histograms, served at /api/parse-resume/metrics/
+RESUME_PARSER_SERVER_TIMING = DEBUG # Send stage timings in a Server-Timing header on parse responses
+DATA_UPLOAD_MAX_NUMBER_FILES = RESUME_PARSER_BATCH_MAX_FILES # Django's default of 100 would cap multipart batches
+
 # CORS settings (Adjust for your Next.js frontend URL)
 CORS_ALLOWED_ORIGINS = [
     os.getenv('FRONTEND_URL', 'http://localhost:3000'),
@@ -179,6 +250,20 @@ EMAIL_HOST_USER = os.getenv("EMAIL_HOST_USER")
 EMAIL_HOST_PASSWORD =  os.getenv("EMAIL_HOST_PASSWORD") # Use app password for Gmail
 DEFAULT_FROM_EMAIL = 'noreply@internflow.com'
 
+# Outbox: views queue emails, a worker sends them in batches
+EMAIL_OUTBOX_WORKER = os.getenv('EMAIL_OUTBOX_WORKER', 'True') == 'True' # In-process sender thread; False leaves the outbox to run_email_outbox
+EMAIL_OUTBOX_POLL_INTERVAL = 5.0 # Seconds between outbox polls
+EMAIL_OUTBOX_BATCH_SIZE = 50 # Emails sent per connection
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5 # Failed sends before an email is marked dead
+EMAIL_OUTBOX_RETRY_DELAY = 30 # Seconds before the first retry; doubles per attempt
+EMAIL_OUTBOX_MAX_RETRY_DELAY = 3600 # Cap on the retry delay
+EMAIL_OUTBOX_STALE_AFTER = 300 # Seconds before an email stuck in sending is assumed lost and retried
+
+# Signups not verified within UNVERIFIED_USER_TTL are deleted by the expiry sweeper: a thread of each process that has
+# sent a verification email, or in production the unverified-user-sweeper service (`expire_unverified_users --interval`)
+UNVERIFIED_USER_TTL = 600 # Seconds; the activation email says 10 minutes
+UNVERIFIED_USER_SWEEP_INTERVAL = int(os.getenv('UNVERIFIED_USER_SWEEP_INTERVAL', 60)) # In-process sweep period; 0 leaves sweeping to expire_unverified_users
+
 # Frontend URL for email links
 FRONTEND_VERIFY_EMAIL_URL = f"{os.getenv('FRONTEND_URL', 'http://localhost:3000')}/verify-email"
 FRONTEND_RESET_PASSWORD_URL = f"{os.getenv('FRONTEND_URL', 'http://localhost:3000')}/reset-password"
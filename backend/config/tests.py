@@ -0,0 +1,274 @@
+import os
+import signal
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import msgpack
+from django.conf import settings
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+
+from benchmarks.regex_fuzz import fuzz_documents, hostile_documents
+from config import parse_cache as parse_cache_module, parse_executor, parse_result
+from config.parse_executor import ParseCrashed, ParseExecutor
+from config.gazetteer import DEFAULT_GAZETTEER_PATH, Gazetteer
+from config.parse_cache import parse_cache
+from config.parse_result import pack_result, unpack_result
+from config.parser import DEFAULT_FIELDS, PARSER_VERSION, clean_text, parse_text
+from resumes.batch import parse_batch
+
+
+def crash_or_sleep(name, content, timeout):
+    """Pool task: kills its own process for b'crash', otherwise outlives the crash"""
+    if content == b'crash':
+        time.sleep(0.3)
+        os.kill(os.getpid(), signal.SIGKILL)
+    time.sleep(1.5)
+    return name
+
+
+def crash_or_extract(name, content, timeout):
+    """Extraction task: crash_or_sleep, then the content as the resume text"""
+    crash_or_sleep(name, content, timeout)
+    return content.decode(), None
+
+
+class ParseExecutorCrashTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        import spacy
+        # Pool processes load the model named by the settings they import
+        cls.model_dir = tempfile.TemporaryDirectory()
+        spacy.blank('en').to_disk(cls.model_dir.name)
+        cls.model_setting = os.environ.get('RESUME_PARSER_SPACY_MODEL')
+        os.environ['RESUME_PARSER_SPACY_MODEL'] = cls.model_dir.name
+
+    @classmethod
+    def tearDownClass(cls):
+        if cls.model_setting is None:
+            os.environ.pop('RESUME_PARSER_SPACY_MODEL')
+        else:
+            os.environ['RESUME_PARSER_SPACY_MODEL'] = cls.model_setting
+        cls.model_dir.cleanup()
+        super().tearDownClass()
+
+    def test_crash_fails_only_its_own_task(self):
+        executor = ParseExecutor(2)
+        self.addCleanup(executor.shutdown)
+        uploads = [('good0.pdf', b'good0'), ('bad.pdf', b'crash'), ('good1.pdf', b'good1'), ('good2.pdf', b'good2')]
+        with ThreadPoolExecutor(len(uploads)) as threads:
+            futures = {
+                name: threads.submit(executor.call, crash_or_sleep, name, content, timeout=60)
+                for name, content in uploads
+            }
+            for name in ('good0.pdf', 'good1.pdf', 'good2.pdf'):
+                self.assertEqual(futures[name].result(), name)
+            with self.assertRaises(ParseCrashed):
+                futures['bad.pdf'].result()
+
+        # The crasher is refused without breaking the pool again
+        start = time.monotonic()
+        with self.assertRaises(ParseCrashed):
+            executor.call(crash_or_sleep, 'bad-again.pdf', b'crash', timeout=60)
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(executor.call(crash_or_sleep, 'good3.pdf', b'good3', timeout=60), 'good3.pdf')
+
+    def test_batch_extracts_bystanders_again(self):
+        executor = ParseExecutor(2)
+        self.addCleanup(executor.shutdown)
+        executor.submit_extract = lambda name, content: executor._submit(name, content, crash_or_extract)
+        self.addCleanup(setattr, parse_executor, '_executor', parse_executor._executor)
+        parse_executor._executor = executor
+        parse_cache.clear()
+
+        items = [('good0.pdf', b'a@example.com'), ('bad.pdf', b'crash'), ('good1.pdf', b'b@example.com')]
+        records = sorted(parse_batch(items, fields={'email'}), key=lambda record: record['index'])
+        self.assertEqual(records[0]['result'], {'email': 'a@example.com'})
+        self.assertEqual(records[1]['error'], 'Parser process died while parsing this file')
+        self.assertEqual(records[2]['result'], {'email': 'b@example.com'})
+
+
+class ParsePoolDefaultTests(SimpleTestCase):
+    def test_web_processes_parse_in_a_limited_pool_by_default(self):
+        self.assertGreaterEqual(settings.RESUME_PARSER_PROCESSES, 1)
+        self.addCleanup(setattr, parse_executor, '_executor', parse_executor._executor)
+        parse_executor._executor = None
+        executor = parse_executor.get_parse_executor()
+        self.addCleanup(executor.shutdown)
+        self.assertEqual(executor.processes, settings.RESUME_PARSER_PROCESSES)
+        self.assertTrue(executor.timeout)
+        self.assertTrue(executor.memory_limit_mb)
+
+
+class PagePoolTests(SimpleTestCase):
+    @override_settings(RESUME_PARSER_PAGE_PROCESSES=4)
+    def test_no_page_pool_inside_parser_processes(self):
+        self.addCleanup(setattr, parse_executor, '_in_parse_worker', False)
+        parse_executor._in_parse_worker = True
+        self.assertIsNone(parse_executor.get_page_executor())
+        self.assertIsNone(parse_executor.extract_pdf_pages_parallel(b'%PDF', 20))
+
+
+class UploadRejectionTests(SimpleTestCase):
+    def setUp(self):
+        # Uploads go straight to temporary files in a directory of their own
+        temp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(temp_dir.cleanup)
+        self.temp_dir = temp_dir.name
+        self.enterContext(self.settings(FILE_UPLOAD_TEMP_DIR=self.temp_dir, FILE_UPLOAD_MAX_MEMORY_SIZE=0))
+
+    def post(self, *uploads):
+        response = self.client.post(reverse('parse-resume'), {'resume': list(uploads)})
+        self.assertEqual(os.listdir(self.temp_dir), [])
+        return response
+
+    @override_settings(RESUME_PARSER_MAX_UPLOAD_BYTES=100 * 1024)
+    def test_oversized_upload_is_cut_off(self):
+        # Past the first 64 KB chunk, which has already gone to a temporary file
+        response = self.post(SimpleUploadedFile('resume.pdf', b'%PDF-1.7\n' + b'0' * 200 * 1024))
+        self.assertEqual(response.status_code, 413)
+        self.assertIn('at most', response.json()['error'])
+
+    def test_mislabeled_uploads_are_rejected(self):
+        for name, content, error in (
+            ('resume.pdf', b'PK\x03\x04' + b'0' * 2048, 'The file is not a valid PDF document'),
+            ('resume.docx', b'%PDF-1.7\n' + b'0' * 2048, 'The file is not a valid DOCX document'),
+            ('resume.docx', b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1' + b'0' * 2048,
+             'Legacy Word .doc files are not supported; save the resume as .docx'),
+            ('resume.docx', b'PK', 'The file is not a valid DOCX document'),
+            ('resume.txt', b'Jane Doe', 'Unsupported file type: txt'),
+        ):
+            with self.subTest(name=name, content=content[:8]):
+                response = self.post(SimpleUploadedFile(name, content))
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.json(), {'error': error})
+
+    @override_settings(DATA_UPLOAD_MAX_NUMBER_FILES=2)
+    def test_too_many_files_are_rejected(self):
+        response = self.post(*(SimpleUploadedFile(f'resume{i}.pdf', b'%PDF-1.7\n' + b'0' * 2048) for i in range(3)))
+        self.assertEqual(response.status_code, 400)
+
+
+RESUME = """Priya Sharma
+priya.sharma@example.com | +91 9876543210
+github.com/priyasharma | linkedin.com/in/priya-sharma
+leetcode.com/u/priya_s
+
+EDUCATION
+Indian Institute of Technology, Delhi
+B.Tech in Computer Science 2019 - 2023
+CGPA: 8.7
+
+SKILLS
+Languages: Python, Java, C++
+Frameworks: Django, React, Flask
+Tools: Docker, Git, PostgreSQL
+
+ACHIEVEMENTS
+Solved 450+ problems on LeetCode with a contest rating of 1850
+"""
+
+# Name extraction is spaCy, not regex
+REGEX_FIELDS = DEFAULT_FIELDS - {'firstName', 'lastName'}
+
+
+class PatternMatchingTests(SimpleTestCase):
+    @override_settings(RESUME_PARSER_REGEX_BUDGET=0)
+    def test_hostile_documents_parse_quickly(self):
+        # The budget is off, so this bounds the patterns themselves
+        documents = {**hostile_documents(), **fuzz_documents(10, seed=0)}
+        parse_text('warm up', fields=REGEX_FIELDS)
+        for name, text in documents.items():
+            text = clean_text(text)
+            with self.subTest(document=name):
+                start = time.perf_counter()
+                parse_text(text, fields=REGEX_FIELDS)
+                self.assertLess(time.perf_counter() - start, 0.5)
+
+    def test_resume_extraction(self):
+        with self.settings(RESUME_PARSER_REGEX_BUDGET=0):
+            unbounded = parse_text(clean_text(RESUME), fields=REGEX_FIELDS)
+        with self.settings(RESUME_PARSER_REGEX_BUDGET=0.25):
+            result = parse_text(clean_text(RESUME), fields=REGEX_FIELDS)
+        self.assertEqual(result, unbounded)
+
+        self.assertEqual(result['email'], 'priya.sharma@example.com')
+        self.assertEqual(result['phone'], '+91 9876543210')
+        self.assertEqual(result['github'], 'github.com/priyasharma')
+        self.assertEqual(result['linkedin'], 'linkedin.com/in/priya-sharma')
+        self.assertEqual(result['codingProfiles']['leetcode'], 'leetcode.com/u/priya_s')
+        self.assertEqual(result['skills'], {
+            'Languages': ['Python', 'Java', 'C++'],
+            'Frameworks': ['Django', 'React', 'Flask'],
+            'Tools': ['Docker', 'Git', 'PostgreSQL'],
+        })
+        self.assertEqual(result['allSkills'], ['Python', 'Java', 'C++', 'Django', 'React', 'Flask', 'Docker', 'Git', 'PostgreSQL'])
+        [education] = result['education']
+        self.assertEqual(education['institution'], 'Indian Institute of Technology')
+        self.assertEqual(education['location'], 'Delhi')
+        self.assertEqual(education['gpa'], '8.7')
+        self.assertEqual(result['codingStats'], {'problems_solved': 450})
+        self.assertEqual(
+            result['achievements'],
+            [{'title': 'Solved 450+ problems on LeetCode with a contest rating of 1850', 'description': ''}],
+        )
+
+
+class ParseResultTests(SimpleTestCase):
+    def setUp(self):
+        parse_cache.clear()
+        self.addCleanup(parse_cache.clear)
+        self.addCleanup(caches[settings.RESUME_PARSER_CACHE_ALIAS].clear)
+
+    def test_packed_result_round_trips(self):
+        text = RESUME + "\nPROJECTS\nresume-parser\nBuilt a resume parser with Python and Django, https://github.com/priyasharma/parser\n"
+        result = parse_text(clean_text(text), fields=REGEX_FIELDS | {'rawText'})
+        # Every part of the layout is filled in
+        result = {'firstName': 'Priya', 'lastName': 'Sharma', **result}
+        result['codingStats']['rating_info'] = 'contest rating 1850'
+        self.assertEqual(set(result), DEFAULT_FIELDS | {'rawText'})
+        self.assertTrue(result['projects'][0]['technologies'])
+
+        unpacked = unpack_result(pack_result(result))
+        self.assertEqual(unpacked, result)
+        self.assertEqual(list(unpacked), list(result))
+        self.assertEqual(unpack_result(pack_result({'email': 'a@example.com'})), {'email': 'a@example.com'})
+
+    def test_results_of_other_versions_are_misses(self):
+        upload = SimpleUploadedFile('resume.pdf', b'%PDF-1.7 resume')
+        parse = mock.Mock(return_value={'email': 'old@example.com'})
+        with mock.patch.object(parse_cache_module, 'PARSER_VERSION', str(int(PARSER_VERSION) - 1)):
+            self.assertEqual(parse_cache.get_or_parse(upload, parse=parse), ({'email': 'old@example.com'}, 'miss'))
+            self.assertEqual(parse_cache.get_or_parse(upload, parse=parse)[1], 'hit')
+
+        parse.return_value = {'email': 'new@example.com'}
+        self.assertEqual(parse_cache.get_or_parse(upload, parse=parse), ({'email': 'new@example.com'}, 'miss'))
+
+        # Bytes of an older packed layout under a current key
+        packed = msgpack.packb([parse_result.SCHEMA_VERSION - 1, 0])
+        with self.assertRaises(ValueError):
+            parse_result.ParsedResume.unpack(packed)
+        key = parse_cache.key_for_bytes(b'%PDF-1.7 other', 'other.pdf')
+        caches[settings.RESUME_PARSER_CACHE_ALIAS].set(key, packed)
+        self.assertIsNone(parse_cache.get(key))
+
+
+class GazetteerTests(SimpleTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.gazetteer = Gazetteer.from_file(DEFAULT_GAZETTEER_PATH)
+
+    def test_long_forms_match_in_any_case(self):
+        self.assertEqual(
+            self.gazetteer.find('typescript, golang and swift; TYPESCRIPT'), ['TypeScript', 'Go', 'Swift'],
+        )
+
+    def test_ambiguous_short_forms_match_only_as_spelled(self):
+        self.assertEqual(self.gazetteer.find('Go, R and TS'), ['Go', 'R', 'TypeScript'])
+        self.assertEqual(self.gazetteer.find("ready to go; r and d; ts; a mean of 3, rest and less"), [])
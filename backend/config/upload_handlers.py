@@ -0,0 +1,102 @@
+import hashlib
+
+from django.core.files.uploadhandler import FileUploadHandler, StopUpload
+
+from .parser import SUPPORTED_FILE_TYPES, parser_setting
+
+# A PDF header may follow up to 1 KB of junk; DOCX is a ZIP whose first
+# entry starts with a local file header
+PDF_MAGIC = b'%PDF-'
+PDF_MAGIC_WINDOW = 1024
+ZIP_MAGIC = b'PK\x03\x04'
+OLE_MAGIC = b'\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1'
+
+
+class UploadRejected(ValueError):
+    def __init__(self, message, status_code=400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def check_magic(file_type, head):
+    """Raise UploadRejected unless the leading bytes of a file match its extension"""
+    if file_type == 'pdf':
+        if PDF_MAGIC not in head[:PDF_MAGIC_WINDOW]:
+            raise UploadRejected("The file is not a valid PDF document")
+    elif head.startswith(OLE_MAGIC):
+        raise UploadRejected("Legacy Word .doc files are not supported; save the resume as .docx")
+    elif not head.startswith(ZIP_MAGIC):
+        raise UploadRejected("The file is not a valid DOCX document")
+
+
+class ResumeUploadHandler(FileUploadHandler):
+    """Validate resume uploads while they stream in, ahead of Django's default handlers.
+
+    Rejects an upload on its first chunk when the extension isn't supported
+    or the leading bytes don't match it, and as soon as it passes
+    RESUME_PARSER_MAX_UPLOAD_BYTES, so a bad upload is never written to
+    memory or a temporary file in full. Accepted chunks are passed on to the
+    next handler unchanged and hashed on the way through; the SHA-256 of
+    each file is kept in `digests` by field name.
+
+    A rejection stops the upload and is kept in `error`; the view reports it
+    once it finds the file missing from request.FILES.
+    """
+
+    def __init__(self, request=None):
+        super().__init__(request)
+        self.max_bytes = parser_setting('RESUME_PARSER_MAX_UPLOAD_BYTES', 10 * 1024 * 1024)
+        self.digests = {}
+        self.error = None
+
+    def _reject(self, error):
+        self.error = error
+        raise StopUpload(connection_reset=False)
+
+    def new_file(self, field_name, file_name, content_type, content_length, charset=None, content_type_extra=None):
+        super().new_file(field_name, file_name, content_type, content_length, charset, content_type_extra)
+        self.file_type = file_name.split('.')[-1].lower()
+        self.head = b''
+        self.sniffed = False
+        self.digest = hashlib.sha256()
+        if self.file_type not in SUPPORTED_FILE_TYPES:
+            self._reject(UploadRejected(f"Unsupported file type: {self.file_type}"))
+        if content_length is not None and content_length > self.max_bytes:
+            self._reject(self._too_large())
+
+    def _too_large(self):
+        return UploadRejected(
+            f"Resume files may be at most {self.max_bytes // (1024 * 1024)} MB.", status_code=413
+        )
+
+    def receive_data_chunk(self, raw_data, start):
+        if start + len(raw_data) > self.max_bytes:
+            self._reject(self._too_large())
+        if not self.sniffed:
+            self.head += raw_data[:PDF_MAGIC_WINDOW - len(self.head)]
+            if len(self.head) >= PDF_MAGIC_WINDOW or self.head.startswith((ZIP_MAGIC, OLE_MAGIC, PDF_MAGIC)):
+                self._sniff()
+        self.digest.update(raw_data)
+        return raw_data
+
+    def _sniff(self):
+        self.sniffed = True
+        try:
+            check_magic(self.file_type, self.head)
+        except UploadRejected as e:
+            self._reject(e)
+
+    def file_complete(self, file_size):
+        # Files shorter than the sniffing window
+        if not self.sniffed:
+            self._sniff()
+        self.digests[self.field_name] = self.digest.hexdigest()
+        return None
+
+
+def resume_upload_handler(request):
+    """The ResumeUploadHandler installed on a request, or None"""
+    for handler in request.upload_handlers:
+        if isinstance(handler, ResumeUploadHandler):
+            return handler
+    return None
@@ -6,13 +6,16 @@ from rest_framework_simplejwt.views import (
 )
 from django.conf import settings
 from django.conf.urls.static import static
-from .views import ResumeParseView
+from .views import ResumeParseView, ResumeParseJobView, ResumeBatchParseView, ResumeParseMetricsView
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/auth/', include('user_auth.urls')),
     path('api/profile/', include('profiles.urls')),
     path('api/parse-resume/', ResumeParseView.as_view(), name='parse-resume'),
+    path('api/parse-resume/batch/', ResumeBatchParseView.as_view(), name='parse-resume-batch'),
+    path('api/parse-resume/metrics/', ResumeParseMetricsView.as_view(), name='parse-resume-metrics'),
+    path('api/parse-resume/<uuid:job_id>/', ResumeParseJobView.as_view(), name='parse-resume-job'),
 ]
 
 if settings.DEBUG:
@@ -3,8 +3,19 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.parsers import MultiPartParser, FormParser
 from rest_framework import status
-from rest_framework.permissions import AllowAny
-from .parser import parse_resume # Import your parser function
+from rest_framework.permissions import AllowAny, IsAdminUser
+from rest_framework.reverse import reverse
+from django.http import HttpResponse, StreamingHttpResponse
+import json
+from urllib.parse import urlencode
+from .parse_cache import parse_cache
+from .parse_executor import get_parse_executor, parse_resume_isolated
+from .parse_metrics import collect_stage_timings, registry
+from .parser import SUPPORTED_FILE_TYPES, parse_fields, parser_setting
+from .upload_handlers import ResumeUploadHandler, resume_upload_handler
+from resumes.batch import parse_batch, read_batch_uploads
+from resumes.jobs import submit_job
+from resumes.models import ParseJob
 
 class ResumeParseView(APIView):
     parser_classes = (MultiPartParser, FormParser)
@@ -12,23 +23,136 @@ class ResumeParseView(APIView):
     permission_classes = [AllowAny]
     authentication_classes = []
 
+    def initialize_request(self, request, *args, **kwargs):
+        # Size, type and hash checks run while the body streams in; this has
+        # to happen before anything reads request.FILES
+        request.upload_handlers.insert(0, ResumeUploadHandler(request))
+        return super().initialize_request(request, *args, **kwargs)
+
     def post(self, request, *args, **kwargs):
-        if 'resume' not in request.FILES:
+        files = request.FILES
+        upload = resume_upload_handler(request)
+        if upload is not None and upload.error is not None:
+            return Response({"error": str(upload.error)}, status=upload.error.status_code)
+        if 'resume' not in files:
             return Response(
                 {"error": "No resume file provided"}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        resume_file = request.FILES['resume']
+        resume_file = files['resume']
+        if upload is not None:
+            resume_file.content_sha256 = upload.digests.get('resume')
+        # ?fields=email,phone returns (and computes) only those fields;
+        # rawText has to be requested explicitly
+        try:
+            fields = parse_fields(request.query_params.get('fields'))
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        # Large files (or ?mode=async) are parsed in the background so they
+        # don't hold this worker; the client polls the returned status URL
+        sync_max_bytes = parser_setting('RESUME_PARSER_SYNC_MAX_BYTES', None)
+        if request.query_params.get('mode') == 'async' or (sync_max_bytes and resume_file.size > sync_max_bytes):
+            file_extension = resume_file.name.split('.')[-1].lower()
+            if file_extension not in SUPPORTED_FILE_TYPES:
+                return Response({"error": f"Unsupported file type: {file_extension}"}, status=status.HTTP_400_BAD_REQUEST)
+            job = submit_job(resume_file, fields)
+            status_url = reverse('parse-resume-job', args=[job.pk], request=request)
+            if request.query_params.get('fields'):
+                status_url += '?' + urlencode({'fields': request.query_params['fields']})
+            return Response(
+                {
+                    "jobId": str(job.pk),
+                    "status": job.status,
+                    "statusUrl": status_url,
+                },
+                status=status.HTTP_202_ACCEPTED
+            )
 
         try:
-            parsed_data = parse_resume(resume_file)
-            return Response(parsed_data, status=status.HTTP_200_OK)
+            with collect_stage_timings(resume_file.name.split('.')[-1].lower()) as timings:
+                parsed_data, cache_status = parse_cache.get_or_parse(resume_file, parse=parse_resume_isolated, fields=fields)
+            response = Response(parsed_data, status=status.HTTP_200_OK)
+            response['X-Parse-Cache'] = cache_status
+            if timings is not None and timings.stages and parser_setting('RESUME_PARSER_SERVER_TIMING', False):
+                response['Server-Timing'] = timings.server_timing()
+            return response
         except ValueError as e:
             return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        except TimeoutError:
+            return Response(
+                {"error": "Parsing took too long. Try again with ?mode=async."},
+                status=status.HTTP_504_GATEWAY_TIMEOUT
+            )
         except Exception as e:
             # Generic error for unexpected issues during parsing
             return Response(
                 {"error": "An error occurred during parsing.", "details": str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
-            )
\ No newline at end of file
+            )
+
+
+class ResumeParseJobView(APIView):
+    permission_classes = [AllowAny]
+    authentication_classes = []
+
+    def get(self, request, job_id, *args, **kwargs):
+        job = ParseJob.objects.filter(pk=job_id).defer('content').first()
+        if job is None:
+            return Response({"error": "Parse job not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        data = {"jobId": str(job.pk), "status": job.status}
+        if job.status == ParseJob.STATUS_DONE:
+            # Jobs parse the fields given when they were submitted; ?fields= narrows the result
+            data["result"] = job.result
+            fields = request.query_params.get('fields')
+            if fields:
+                try:
+                    fields = parse_fields(fields)
+                except ValueError as e:
+                    return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+                data["result"] = {field: value for field, value in job.result.items() if field in fields}
+        elif job.status == ParseJob.STATUS_FAILED:
+            data["error"] = job.error
+        return Response(data, status=status.HTTP_200_OK)
+
+
+class ResumeBatchParseView(APIView):
+    """Parse many resumes in one request, streaming one NDJSON line per file.
+
+    Accepts several `resumes` files and/or ZIP archives of them. Lines arrive
+    in completion order; each carries the file's `index` in the upload and
+    either a `result` or an `error`.
+    """
+    parser_classes = (MultiPartParser, FormParser)
+
+    permission_classes = [IsAdminUser]
+
+    def post(self, request, *args, **kwargs):
+        # Extraction of many untrusted files only runs in parser processes
+        if get_parse_executor() is None:
+            return Response(
+                {"error": "Batch parsing is disabled when RESUME_PARSER_PROCESSES is 0"},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+        files = request.FILES.getlist('resumes') or request.FILES.getlist('resume')
+        if not files:
+            return Response({"error": "No resume files provided"}, status=status.HTTP_400_BAD_REQUEST)
+
+        try:
+            fields = parse_fields(request.query_params.get('fields'))
+            items = read_batch_uploads(files)
+        except ValueError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+        lines = (json.dumps(record) + '\n' for record in parse_batch(items, fields))
+        return StreamingHttpResponse(lines, content_type='application/x-ndjson')
+
+
+class ResumeParseMetricsView(APIView):
+    """Per-stage parse timing histograms of this process, in Prometheus text format"""
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,34 @@
+# gunicorn.conf.py
+import gc
+import multiprocessing
+import os
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', 60))
+
+# With preload_app the master imports the app and loads the resume parser
+# model once; forked workers then share those pages copy-on-write.
+preload_app = os.getenv('GUNICORN_PRELOAD_APP', 'True') == 'True'
+
+# Set to False to keep the model lazy (loaded by the first parse request).
+PRELOAD_PARSER = os.getenv('RESUME_PARSER_PRELOAD', 'True') == 'True'
+
+
+def when_ready(server):
+    """Load the parser model in the master before any worker is forked"""
+    if preload_app and PRELOAD_PARSER:
+        from config.parser import preload
+        preload()
+        # Move everything allocated so far out of the GC's reach so collections
+        # in the workers don't touch (and un-share) the model's pages.
+        gc.freeze()
+        server.log.info("Resume parser model preloaded in master")
+
+
+def post_fork(server, worker):
+    """Without preload_app, warm the model in each worker before it serves"""
+    if not preload_app and PRELOAD_PARSER:
+        from config.parser import preload
+        preload()
+        server.log.info("Resume parser model loaded in worker %s", worker.pid)
@@ -0,0 +1,159 @@
+import re
+from datetime import date
+
+from django.db import transaction
+
+from .models import UserProfile, Education, Skill, Project, ProjectSkill
+
+MODE_MERGE = 'merge'
+MODE_REPLACE = 'replace'
+
+YEAR_PATTERN = re.compile(r'\b(?:19|20)\d{2}\b')
+
+
+def _clip(value, model, field):
+    """Trim a parsed string to the column's max_length"""
+    value = (value or '').strip()
+    max_length = model._meta.get_field(field).max_length
+    return value[:max_length] if max_length else value
+
+
+def _as_url(value, model, field):
+    """A parsed link as a URL; None when blank or too long for the column, as a cut URL is broken"""
+    value = (value or '').strip()
+    if value and not value.startswith(('http://', 'https://')):
+        value = 'https://' + value
+    if len(value) > model._meta.get_field(field).max_length:
+        return None
+    return value or None
+
+
+def _years(entry):
+    """(start, end) years of a parsed education entry; falls back to any years in the degree line"""
+    years = [value for value in (entry.get('startYear'), entry.get('endYear')) if YEAR_PATTERN.fullmatch(str(value or ''))]
+    if not years:
+        years = YEAR_PATTERN.findall(entry.get('degree') or '')
+    years = [int(year) for year in years]
+    if not years:
+        return date.today().year, None
+    return years[0], years[-1] if len(years) > 1 else None
+
+
+def _education_rows(user, parsed):
+    for entry in parsed.get('education') or []:
+        institution = _clip(entry.get('institution'), Education, 'institution')
+        if not institution:
+            continue
+        start_year, end_year = _years(entry)
+        yield Education(
+            user=user,
+            institution=institution,
+            degree=_clip(entry.get('degree'), Education, 'degree'),
+            start_year=start_year,
+            end_year=end_year,
+            gpa=_clip(entry.get('gpa') or entry.get('percentage'), Education, 'gpa') or None,
+        )
+
+
+def _project_rows(user, parsed):
+    for entry in parsed.get('projects') or []:
+        title = _clip(entry.get('name'), Project, 'title')
+        if not title:
+            continue
+        url = _as_url(entry.get('url'), Project, 'project_url')
+        project = Project(
+            user=user,
+            title=title,
+            description=entry.get('description') or '',
+            github_url=url if url and 'github.com' in url else None,
+            project_url=url if url and 'github.com' not in url else None,
+            start_date=date.today(),
+        )
+        yield project, entry.get('technologies') or []
+
+
+def apply_parsed_resume(user, parsed, mode=MODE_MERGE):
+    """Write parse_resume output to a user's profile in one transaction.
+
+    merge keeps existing rows and only fills blank profile fields, skipping
+    parsed skills, educations and projects the user already has (compared
+    case-insensitively by skill name, institution + degree and project
+    title). replace deletes the user's skills, educations and projects first
+    and overwrites profile fields that the resume has a value for.
+
+    The number of queries doesn't depend on how much the resume contains:
+    rows are written with bulk_create. Returns counts per model.
+    """
+    replace = mode == MODE_REPLACE
+    created = {'skills': 0, 'educations': 0, 'projects': 0, 'projectSkills': 0}
+
+    with transaction.atomic():
+        profile, _ = UserProfile.objects.select_for_update().get_or_create(user=user)
+
+        # User and profile fields
+        user_fields = []
+        for field, value in (('first_name', parsed.get('firstName')), ('last_name', parsed.get('lastName'))):
+            value = _clip(value, user._meta.model, field)
+            if value and (replace or not getattr(user, field)):
+                setattr(user, field, value)
+                user_fields.append(field)
+        if user_fields:
+            user.save(update_fields=user_fields)
+
+        profile_fields = []
+        website = _as_url(parsed.get('github'), UserProfile, 'website') or _as_url(parsed.get('linkedin'), UserProfile, 'website')
+        for field, value in (('phone_number', _clip(parsed.get('phone'), UserProfile, 'phone_number')), ('website', website)):
+            if value and (replace or not getattr(profile, field)):
+                setattr(profile, field, value)
+                profile_fields.append(field)
+        if profile_fields:
+            profile.save(update_fields=profile_fields + ['updated_at'])
+
+        if replace:
+            Skill.objects.filter(user=user).delete()
+            Education.objects.filter(user=user).delete()
+            Project.objects.filter(user=user).delete()
+            existing_skills, existing_educations, existing_projects = set(), set(), set()
+        else:
+            existing_skills = {name.lower() for name in Skill.objects.filter(user=user).values_list('name', flat=True)}
+            existing_educations = {
+                (institution.lower(), degree.lower())
+                for institution, degree in Education.objects.filter(user=user).values_list('institution', 'degree')
+            }
+            existing_projects = {title.lower() for title in Project.objects.filter(user=user).values_list('title', flat=True)}
+
+        # Skills; the parser's own list can repeat a name in different case
+        skills = []
+        for name in parsed.get('allSkills') or []:
+            name = _clip(name, Skill, 'name')
+            if name and name.lower() not in existing_skills:
+                existing_skills.add(name.lower())
+                skills.append(Skill(user=user, name=name))
+        created['skills'] = len(Skill.objects.bulk_create(skills))
+
+        educations = []
+        for education in _education_rows(user, parsed):
+            key = (education.institution.lower(), education.degree.lower())
+            if key not in existing_educations:
+                existing_educations.add(key)
+                educations.append(education)
+        created['educations'] = len(Education.objects.bulk_create(educations))
+
+        projects, technologies = [], []
+        for project, project_technologies in _project_rows(user, parsed):
+            if project.title.lower() not in existing_projects:
+                existing_projects.add(project.title.lower())
+                projects.append(project)
+                technologies.append(project_technologies)
+        created['projects'] = len(Project.objects.bulk_create(projects))
+
+        # bulk_create sets primary keys on PostgreSQL (and SQLite >= 3.35)
+        project_skills = [
+            ProjectSkill(project=project, skill=_clip(name, ProjectSkill, 'skill'))
+            for project, project_technologies in zip(projects, technologies)
+            for name in dict.fromkeys(project_technologies)
+            if name
+        ]
+        created['projectSkills'] = len(ProjectSkill.objects.bulk_create(project_skills))
+
+    return created
@@ -7,20 +7,13 @@ from django.contrib.auth import get_user_model
 
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from rest_framework_simplejwt.tokens import RefreshToken
+from user_auth.tokens import ClaimsRefreshToken
 
 
 User = get_user_model()
 class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
-    @classmethod
-    def get_token(cls, user):
-        token = super().get_token(user)
-        
-        # Add custom claims
-        token['username'] = user.username
-        token['email'] = user.email
-        token['role'] = user.role
-        
-        return token
+    # Adds username, email, role and token_version claims
+    token_class = ClaimsRefreshToken
 
     def validate(self, attrs):
         data = super().validate(attrs)
@@ -126,4 +119,45 @@ class ProjectSerializer(serializers.ModelSerializer):
             for skill_data in skills_data:
                 ProjectSkill.objects.create(project=instance, **skill_data)
         
-        return instance
\ No newline at end of file
+        return instance
+
+class ParsedEducationSerializer(serializers.Serializer):
+    """An education entry of parse_resume output; other keys are ignored"""
+    institution = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    degree = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    gpa = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    percentage = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    startYear = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    endYear = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+
+
+class ParsedProjectSerializer(serializers.Serializer):
+    """A project entry of parse_resume output; other keys are ignored"""
+    name = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    url = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    description = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    technologies = serializers.ListField(child=serializers.CharField(allow_blank=True), required=False, allow_null=True)
+
+
+class ParsedResumeSerializer(serializers.Serializer):
+    """The parts of parse_resume output a resume import reads; other keys are ignored"""
+    firstName = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    lastName = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    phone = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    github = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    linkedin = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    allSkills = serializers.ListField(child=serializers.CharField(allow_blank=True), required=False, allow_null=True)
+    education = ParsedEducationSerializer(many=True, required=False, allow_null=True)
+    projects = ParsedProjectSerializer(many=True, required=False, allow_null=True)
+
+
+class ResumeImportSerializer(serializers.Serializer):
+    """Input of the resume import endpoint: parse_resume output or the id of a finished parse job"""
+    parsed = ParsedResumeSerializer(required=False)
+    job_id = serializers.UUIDField(required=False)
+    mode = serializers.ChoiceField(choices=['merge', 'replace'], default='merge')
+
+    def validate(self, attrs):
+        if ('parsed' in attrs) == ('job_id' in attrs):
+            raise serializers.ValidationError("Provide exactly one of 'parsed' or 'job_id'.")
+        return attrs
@@ -1,3 +1,43 @@
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.urls import reverse
+from rest_framework.test import APITestCase
 
-# Create your tests here.
+from .models import Education, Project, UserProfile
+
+User = get_user_model()
+
+
+class ResumeImportTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='jane', email='jane@example.com', password='secret')
+        self.client.force_authenticate(self.user)
+        self.url = reverse('resume-import')
+
+    def test_malformed_parsed_resume_is_rejected(self):
+        for parsed in (
+            {'education': 'abc'},
+            {'education': ['abc']},
+            {'projects': [{'technologies': 'python'}]},
+            {'allSkills': {'python': True}},
+            {'firstName': ['Jane']},
+        ):
+            with self.subTest(parsed=parsed):
+                response = self.client.post(self.url, {'parsed': parsed}, format='json')
+                self.assertEqual(response.status_code, 400)
+                self.assertIn('parsed', response.json())
+
+    def test_over_long_urls_are_dropped(self):
+        long_url = 'github.com/jane/' + 'x' * 300
+        parsed = {
+            'github': long_url,
+            'linkedin': 'linkedin.com/in/jane',
+            'education': [{'institution': 'State University', 'degree': 'BSc', 'startYear': 'abcd', 'endYear': 2020}],
+            'projects': [{'name': 'Parser', 'url': long_url, 'technologies': ['Python']}],
+        }
+        response = self.client.post(self.url, {'parsed': parsed}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(UserProfile.objects.get(user=self.user).website, 'https://linkedin.com/in/jane')
+        project = Project.objects.get(user=self.user)
+        self.assertIsNone(project.github_url)
+        self.assertIsNone(project.project_url)
+        self.assertEqual(Education.objects.get(user=self.user).start_year, 2020)
@@ -3,7 +3,7 @@ from .views import (
     UserProfileDetailView, EducationListView, EducationDetailView,
     SkillListView, SkillDetailView, CertificationListView,
     CertificationDetailView, ProjectListView, ProjectDetailView,
-    CompleteProfileView,ProfilePictureUploadView
+    CompleteProfileView,ProfilePictureUploadView,ResumeImportView
 )
 
 urlpatterns = [
@@ -18,5 +18,6 @@ urlpatterns = [
     path('projects/<int:pk>/', ProjectDetailView.as_view(), name='project-detail'),
     path('profile-picture/', ProfilePictureUploadView.as_view(), name='profile-picture-upload'),
     path('complete-profile/', CompleteProfileView.as_view(), name='complete-profile'),
+    path('import-resume/', ResumeImportView.as_view(), name='resume-import'),
     
 ]
\ No newline at end of file
@@ -5,11 +5,14 @@ from django.contrib.auth import get_user_model
 from .models import UserProfile, Education, Skill, Certification, Project
 from .serializers import (
     UserProfileSerializer, EducationSerializer, 
-    SkillSerializer, CertificationSerializer, ProjectSerializer
+    SkillSerializer, CertificationSerializer, ProjectSerializer,
+    ResumeImportSerializer
 )
+from .resume_import import apply_parsed_resume
+from resumes.models import ParseJob
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.authentication import SessionAuthentication, TokenAuthentication
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from user_auth.authentication import StatelessJWTAuthentication
 from rest_framework.parsers import MultiPartParser, FormParser
 
 User = get_user_model()
@@ -18,13 +21,13 @@ User = get_user_model()
 
 
 class ProfilePictureUploadView(APIView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
     parser_classes = [MultiPartParser, FormParser]
 
     def post(self, request):
         user = request.user
-        profile = UserProfile.objects.get(user=user)
+        profile = UserProfile.objects.get(user_id=user.pk)
         
         if 'profile_picture' not in request.FILES:
             return Response({'error': 'No file provided'}, status=400)
@@ -38,7 +41,7 @@ class ProfilePictureUploadView(APIView):
     
     def delete(self, request):
         user = request.user
-        profile = UserProfile.objects.get(user=user)
+        profile = UserProfile.objects.get(user_id=user.pk)
         
         if not profile.profile_picture:
             return Response({'error': 'No profile picture to delete'}, status=400)
@@ -57,7 +60,7 @@ class UserProfileDetailView(generics.RetrieveUpdateAPIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def get_object(self):
-        profile, created = UserProfile.objects.get_or_create(user=self.request.user)
+        profile, created = UserProfile.objects.get_or_create(user_id=self.request.user.pk)
         return profile
     
     def perform_update(self, serializer):
@@ -71,80 +74,80 @@ class EducationListView(generics.ListCreateAPIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        return Education.objects.filter(user=self.request.user)
+        return Education.objects.filter(user_id=self.request.user.pk)
     
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        serializer.save(user_id=self.request.user.pk)
 
 class EducationDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = EducationSerializer
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        return Education.objects.filter(user=self.request.user)
+        return Education.objects.filter(user_id=self.request.user.pk)
 
 class SkillListView(generics.ListCreateAPIView):
     serializer_class = SkillSerializer
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        return Skill.objects.filter(user=self.request.user)
+        return Skill.objects.filter(user_id=self.request.user.pk)
     
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        serializer.save(user_id=self.request.user.pk)
 
 class SkillDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = SkillSerializer
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        return Skill.objects.filter(user=self.request.user)
+        return Skill.objects.filter(user_id=self.request.user.pk)
 
 class CertificationListView(generics.ListCreateAPIView):
     serializer_class = CertificationSerializer
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        return Certification.objects.filter(user=self.request.user)
+        return Certification.objects.filter(user_id=self.request.user.pk)
     
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        serializer.save(user_id=self.request.user.pk)
 
 class CertificationDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = CertificationSerializer
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        return Certification.objects.filter(user=self.request.user)
+        return Certification.objects.filter(user_id=self.request.user.pk)
 
 class ProjectListView(generics.ListCreateAPIView):
     serializer_class = ProjectSerializer
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        return Project.objects.filter(user=self.request.user)
+        return Project.objects.filter(user_id=self.request.user.pk)
     
     def perform_create(self, serializer):
-        serializer.save(user=self.request.user)
+        serializer.save(user_id=self.request.user.pk)
 
 class ProjectDetailView(generics.RetrieveUpdateDestroyAPIView):
     serializer_class = ProjectSerializer
     permission_classes = [permissions.IsAuthenticated]
     
     def get_queryset(self):
-        return Project.objects.filter(user=self.request.user)
+        return Project.objects.filter(user_id=self.request.user.pk)
 
 class CompleteProfileView(APIView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [StatelessJWTAuthentication]
     permission_classes = [IsAuthenticated]
     
     def get(self, request):
         user = request.user
-        profile = UserProfile.objects.filter(user=user).first()
-        educations = Education.objects.filter(user=user)
-        skills = Skill.objects.filter(user=user)
-        certifications = Certification.objects.filter(user=user)
-        projects = Project.objects.filter(user=user)
+        profile = UserProfile.objects.filter(user_id=user.pk).first()
+        educations = Education.objects.filter(user_id=user.pk)
+        skills = Skill.objects.filter(user_id=user.pk)
+        certifications = Certification.objects.filter(user_id=user.pk)
+        projects = Project.objects.filter(user_id=user.pk)
         
         # Ensure proper serialization by using context if needed
         data = {
@@ -155,4 +158,30 @@ class CompleteProfileView(APIView):
             'projects': ProjectSerializer(projects, many=True, context={'request': request}).data,
         }
         
-        return Response(data)
\ No newline at end of file
+        return Response(data)
+
+
+class ResumeImportView(APIView):
+    """Apply a parsed resume to the user's profile in a single request"""
+    authentication_classes = [StatelessJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        serializer = ResumeImportSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        parsed = data.get('parsed')
+        if parsed is None:
+            job = ParseJob.objects.filter(pk=data['job_id']).defer('content').first()
+            if job is None:
+                return Response({'error': 'Parse job not found'}, status=status.HTTP_404_NOT_FOUND)
+            if job.status != ParseJob.STATUS_DONE:
+                return Response(
+                    {'error': f'Parse job is {job.status}', 'status': job.status},
+                    status=status.HTTP_409_CONFLICT
+                )
+            parsed = job.result
+
+        created = apply_parsed_resume(request.user, parsed, data['mode'])
+        return Response({'mode': data['mode'], 'created': created}, status=status.HTTP_200_OK)
@@ -0,0 +1,10 @@
+from django.contrib import admin
+from .models import ParseJob
+
+class ParseJobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'file_name', 'status', 'attempts', 'created_at', 'finished_at')
+    list_filter = ('status',)
+    exclude = ('content',)
+    readonly_fields = ('result', 'error')
+
+admin.site.register(ParseJob, ParseJobAdmin)
@@ -0,0 +1,143 @@
+import logging
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from config.parse_cache import parse_cache
+from config.parse_executor import get_parse_executor
+from config.parser import (
+    DEFAULT_FIELDS, FIELD_EXTRACTORS, SUPPORTED_FILE_TYPES, extract_name_from_header,
+    get_nlp, ner_window, parse_text, parser_setting,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class BatchTooLarge(ValueError):
+    pass
+
+
+def read_batch_uploads(files):
+    """(name, bytes) for every resume in a multipart list; a .zip is expanded in place"""
+    max_files = parser_setting('RESUME_PARSER_BATCH_MAX_FILES', 500)
+    max_bytes = parser_setting('RESUME_PARSER_BATCH_MAX_BYTES', 200 * 1024 * 1024)
+    items, total = [], 0
+
+    def add(name, content):
+        nonlocal total
+        total += len(content)
+        if len(items) >= max_files:
+            raise BatchTooLarge(f"A batch may contain at most {max_files} files.")
+        if total > max_bytes:
+            raise BatchTooLarge(f"A batch may contain at most {max_bytes // (1024 * 1024)} MB of resumes.")
+        items.append((name, content))
+
+    for upload in files:
+        if upload.name.lower().endswith('.zip'):
+            try:
+                archive = zipfile.ZipFile(upload)
+            except zipfile.BadZipFile:
+                raise ValueError(f"{upload.name} is not a valid ZIP archive.")
+            with archive:
+                for info in archive.infolist():
+                    if info.is_dir() or info.filename.startswith('__MACOSX/'):
+                        continue
+                    # Read at most one byte past the budget; the size in the
+                    # ZIP header can't be trusted
+                    with archive.open(info) as member:
+                        add(info.filename, member.read(max_bytes - total + 1))
+        else:
+            add(upload.name, b''.join(upload.chunks()))
+    return items
+
+
+def _result(index, name, parsed_data):
+    return {"index": index, "file": name, "result": parsed_data}
+
+
+def _error(index, name, message):
+    return {"index": index, "file": name, "error": message}
+
+
+def parse_batch(items, fields=DEFAULT_FIELDS):
+    """Parse (name, bytes) items, yielding one dict per file as soon as it is ready.
+
+    Text extraction runs in the parser process pool, which has to exist
+    (see get_parse_executor). A file whose extraction kills its process
+    gets an error record; the other files in the pool at the time are
+    extracted again. Files whose name can't be taken from the header lines
+    are held back and sent through nlp.pipe in batches of
+    RESUME_PARSER_NER_BATCH_SIZE. A failure only produces an error record
+    for that file. Results hold only the response fields in fields.
+    """
+    batch_size = parser_setting('RESUME_PARSER_NER_BATCH_SIZE', 32)
+    needs_name = any(FIELD_EXTRACTORS[field] == 'name' for field in fields)
+    executor = get_parse_executor()
+    if executor is None:
+        raise RuntimeError("Batch parsing needs parser processes (RESUME_PARSER_PROCESSES)")
+
+    pending = {}
+
+    def submit(index, name, key, content, attempt=1):
+        pending[executor.submit_extract(name, content)] = (index, name, key, content, attempt)
+
+    try:
+        for index, (name, content) in enumerate(items):
+            file_extension = name.split('.')[-1].lower()
+            if file_extension not in SUPPORTED_FILE_TYPES:
+                yield _error(index, name, f"Unsupported file type: {file_extension}")
+                continue
+            key = parse_cache.key_for_bytes(content, name, fields)
+            cached = parse_cache.get(key)
+            if cached is not None:
+                yield _result(index, name, cached)
+                continue
+            submit(index, name, key, content)
+
+        def finish(index, name, key, text, header_lines, doc=None):
+            try:
+                parsed_data = parse_text(text, doc, header_lines, fields)
+            except Exception as e:
+                logger.exception("Batch parse of %s failed", name)
+                return _error(index, name, f"An error occurred during parsing: {e}")
+            parse_cache.set(key, parsed_data)
+            return _result(index, name, parsed_data)
+
+        waiting_for_ner = []
+
+        def flush_ner():
+            docs = get_nlp().pipe([ner_window(entry[3]) for entry in waiting_for_ner], batch_size=batch_size)
+            for entry, doc in zip(waiting_for_ner, docs):
+                yield finish(*entry, doc=doc)
+            waiting_for_ner.clear()
+
+        while pending:
+            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in finished:
+                index, name, key, content, attempt = pending.pop(future)
+                try:
+                    text, header_lines = future.result()
+                except BrokenProcessPool:
+                    # Every file in the pool fails when one kills its process;
+                    # only that one gets an error record
+                    if executor.crashed(future):
+                        yield _error(index, name, "Parser process died while parsing this file")
+                    elif attempt < 3:
+                        submit(index, name, key, content, attempt + 1)
+                    else:
+                        yield _error(index, name, "The parser pool kept breaking; try again")
+                    continue
+                except Exception as e:
+                    yield _error(index, name, str(e) or "Resume parsing timed out")
+                    continue
+                if not needs_name or extract_name_from_header(text) is not None:
+                    yield finish(index, name, key, text, header_lines)
+                else:
+                    waiting_for_ner.append((index, name, key, text, header_lines))
+                    if len(waiting_for_ner) >= batch_size:
+                        yield from flush_ner()
+        if waiting_for_ner:
+            yield from flush_ner()
+    finally:
+        for future in pending:
+            future.cancel()
@@ -0,0 +1,149 @@
+import logging
+import threading
+from datetime import timedelta
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import close_old_connections
+from django.db.models import Q
+from django.utils import timezone
+
+from config.parse_cache import parse_cache
+from config.parse_executor import parse_resume_isolated
+from config.parse_metrics import collect_stage_timings
+from config.parser import DEFAULT_FIELDS, parse_fields, parser_setting
+from .models import ParseJob
+
+logger = logging.getLogger(__name__)
+
+
+def submit_job(upload, fields=DEFAULT_FIELDS):
+    """Store an uploaded resume as a pending job and wake the in-process workers.
+
+    The job computes and returns only the response fields in fields.
+    """
+    content = b''.join(upload.chunks())
+    job = ParseJob.objects.create(
+        file_name=upload.name, content=content,
+        fields='' if fields == DEFAULT_FIELDS else ','.join(sorted(fields)),
+    )
+    pool = get_worker_pool()
+    if pool is not None:
+        pool.wake()
+    return job
+
+
+def claim_next_job():
+    """Atomically move the oldest runnable job to running and return it.
+
+    Jobs stuck in running for longer than RESUME_PARSER_JOB_STALE_AFTER (a
+    worker died mid-parse) are picked up again. The claim is a conditional
+    UPDATE, so concurrent workers never run the same job twice.
+    """
+    stale_before = timezone.now() - timedelta(seconds=parser_setting('RESUME_PARSER_JOB_STALE_AFTER', 300))
+    runnable = ParseJob.objects.filter(
+        Q(status=ParseJob.STATUS_PENDING) | Q(status=ParseJob.STATUS_RUNNING, started_at__lt=stale_before)
+    )
+    for job in runnable.order_by('created_at').only('id', 'status', 'started_at')[:10]:
+        claimed = ParseJob.objects.filter(pk=job.pk, status=job.status, started_at=job.started_at).update(
+            status=ParseJob.STATUS_RUNNING, started_at=timezone.now()
+        )
+        if claimed:
+            return ParseJob.objects.get(pk=job.pk)
+    return None
+
+
+def run_job(job):
+    """Parse a claimed job and record its result or error"""
+    job.attempts += 1
+    try:
+        upload = SimpleUploadedFile(job.file_name, bytes(job.content or b''))
+        with collect_stage_timings(job.file_name.split('.')[-1].lower()):
+            job.result, _ = parse_cache.get_or_parse(
+                upload, parse=parse_resume_isolated, fields=parse_fields(job.fields),
+            )
+        job.status = ParseJob.STATUS_DONE
+    except (ValueError, TimeoutError) as e:
+        job.status = ParseJob.STATUS_FAILED
+        job.error = str(e) or "Resume parsing timed out"
+    except Exception as e:
+        logger.exception("Resume parse job %s failed", job.pk)
+        job.status = ParseJob.STATUS_FAILED
+        job.error = f"An error occurred during parsing: {e}"
+    job.content = None
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'packed_result', 'error', 'attempts', 'content', 'finished_at'])
+
+
+def run_pending_jobs():
+    """Run jobs until none are left; returns how many were processed"""
+    processed = 0
+    while True:
+        job = claim_next_job()
+        if job is None:
+            return processed
+        run_job(job)
+        processed += 1
+
+
+class JobWorkerPool:
+    """Background threads that drain the ParseJob table.
+
+    Workers sleep until woken by submit_job or until the poll interval passes,
+    which also lets them pick up jobs submitted by other processes.
+    """
+
+    def __init__(self, size, poll_interval=5.0):
+        self.size = size
+        self.poll_interval = poll_interval
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._threads = []
+
+    def start(self):
+        for i in range(self.size):
+            thread = threading.Thread(target=self._run, name=f"parse-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def wake(self):
+        self._wakeup.set()
+
+    def stop(self, timeout=None):
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+            try:
+                run_pending_jobs()
+            except Exception:
+                logger.exception("Resume parse worker crashed; retrying")
+            finally:
+                close_old_connections()
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_worker_pool():
+    """Return the in-process worker pool, starting it on first use.
+
+    Returns None when RESUME_PARSER_JOB_WORKERS is 0, i.e. jobs are only run
+    by `manage.py run_parse_workers` processes.
+    """
+    global _pool
+    size = parser_setting('RESUME_PARSER_JOB_WORKERS', 2)
+    if not size:
+        return None
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                pool = JobWorkerPool(size, parser_setting('RESUME_PARSER_JOB_POLL_INTERVAL', 5.0))
+                pool.start()
+                _pool = pool
+    return _pool
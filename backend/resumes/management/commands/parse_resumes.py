@@ -0,0 +1,162 @@
+import glob
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from django.core.management.base import BaseCommand, CommandError
+from config.parse_executor import ParseExecutor
+from config.parser import PARSER_VERSION, SUPPORTED_FILE_TYPES, parse_fields, parser_setting
+
+class Command(BaseCommand):
+    help = (
+        'Parse a directory or glob of resumes in a process pool, writing one JSON line per file. '
+        'Files already listed in the checkpoint are skipped, so an interrupted run picks up where it stopped.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='+', help='Directories (searched recursively) or glob patterns')
+        parser.add_argument('--output', '-o', required=True, help='JSONL file to append records to')
+        parser.add_argument('--checkpoint', help='File listing finished paths (default: <output>.checkpoint)')
+        parser.add_argument('--processes', type=int, default=os.cpu_count() or 1, help='Parser processes')
+        parser.add_argument('--fields', help='Comma-separated response fields, as in ?fields= on the API')
+        parser.add_argument('--timeout', type=int, default=None, help='Seconds per file (default: RESUME_PARSER_TASK_TIMEOUT)')
+
+    def find_files(self, patterns):
+        files = set()
+        for pattern in patterns:
+            if os.path.isdir(pattern):
+                matches = (
+                    os.path.join(root, name) for root, _, names in os.walk(pattern) for name in names
+                )
+            else:
+                matches = glob.glob(pattern, recursive=True)
+            for path in matches:
+                if os.path.isfile(path) and path.split('.')[-1].lower() in SUPPORTED_FILE_TYPES:
+                    files.add(os.path.abspath(path))
+        return sorted(files)
+
+    def handle(self, *args, **kwargs):
+        try:
+            fields = parse_fields(kwargs['fields'])
+        except ValueError as e:
+            raise CommandError(str(e))
+        if kwargs['processes'] < 1:
+            raise CommandError('--processes must be at least 1')
+
+        checkpoint_path = kwargs['checkpoint'] or kwargs['output'] + '.checkpoint'
+        done = set()
+        if os.path.exists(checkpoint_path):
+            with open(checkpoint_path) as f:
+                done = {line.rstrip('\n') for line in f if line.strip()}
+
+        files = self.find_files(kwargs['paths'])
+        pending = [path for path in files if path not in done]
+        self.stdout.write(
+            f"{len(files)} resume(s) found, {len(files) - len(pending)} already in {checkpoint_path}, "
+            f"{len(pending)} to parse"
+        )
+        if not pending:
+            return
+
+        executor = ParseExecutor(
+            kwargs['processes'],
+            max_tasks_per_child=parser_setting('RESUME_PARSER_MAX_TASKS_PER_CHILD', 100),
+            timeout=kwargs['timeout'] or parser_setting('RESUME_PARSER_TASK_TIMEOUT', 30),
+            memory_limit_mb=parser_setting('RESUME_PARSER_TASK_MEMORY_MB', 1024),
+        )
+        # A record is written before its path goes into the checkpoint; a run
+        # killed between the two writes repeats that one record when resumed
+        with open(kwargs['output'], 'a') as output, open(checkpoint_path, 'a') as checkpoint:
+            try:
+                self.run(executor, pending, fields, output, checkpoint)
+            except KeyboardInterrupt:
+                self.stderr.write('\nInterrupted; run the same command again to resume')
+            finally:
+                executor.shutdown()
+
+    def run(self, executor, paths, fields, output, checkpoint):
+        # Bounded number of files in flight, so file contents aren't all read up front
+        max_in_flight = executor.processes * 4
+        queue = iter(paths)
+        futures = {}
+        started = time.monotonic()
+        last_report = 0.0
+        parsed = errors = total_bytes = 0
+        unfinished = []
+
+        def submit(path, attempt=1):
+            with open(path, 'rb') as f:
+                content = f.read()
+            future = executor.submit_timed(os.path.basename(path), content, fields)
+            futures[future] = (path, content, attempt)
+            return len(content)
+
+        while True:
+            while len(futures) < max_in_flight:
+                path = next(queue, None)
+                if path is None:
+                    break
+                try:
+                    total_bytes += submit(path)
+                except OSError as e:
+                    self.write_record(output, checkpoint, {"file": path, "error": str(e)})
+                    parsed += 1
+                    errors += 1
+            if not futures:
+                break
+
+            finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in finished:
+                path, content, attempt = futures.pop(future)
+                record = {"file": path, "sha256": hashlib.sha256(content).hexdigest(), "parserVersion": PARSER_VERSION}
+                try:
+                    record["result"], record["timings"] = future.result()
+                except BrokenProcessPool:
+                    # Every task in flight fails when one process dies. Only
+                    # the culprit gets a record; the others are resubmitted,
+                    # and left for the next run if the pool keeps breaking
+                    if executor.crashed(future):
+                        record["error"] = "Parser process died while parsing this file"
+                    elif attempt < 3:
+                        submit(path, attempt=attempt + 1)
+                        continue
+                    else:
+                        unfinished.append(path)
+                        continue
+                except (ValueError, TimeoutError) as e:
+                    record["error"] = str(e) or "Resume parsing timed out"
+                except Exception as e:
+                    record["error"] = f"An error occurred during parsing: {e}"
+                errors += "error" in record
+                parsed += 1
+                self.write_record(output, checkpoint, record)
+
+            now = time.monotonic()
+            if now - last_report >= 1:
+                last_report = now
+                self.report(parsed, errors, len(paths), total_bytes, now - started, ending='\r')
+        self.report(parsed, errors, len(paths), total_bytes, time.monotonic() - started)
+        if unfinished:
+            self.stderr.write(
+                f"{len(unfinished)} file(s) not parsed because the parser pool kept breaking; "
+                "run the same command again to retry them"
+            )
+
+    def write_record(self, output, checkpoint, record):
+        output.write(json.dumps(record) + '\n')
+        output.flush()
+        checkpoint.write(record["file"] + '\n')
+        checkpoint.flush()
+
+    def report(self, parsed, errors, total, total_bytes, elapsed, ending='\n'):
+        rate = parsed / elapsed if elapsed else 0.0
+        eta = f", {(total - parsed) / rate:.0f}s left" if rate and parsed < total else ''
+        line = (
+            f"{parsed}/{total} parsed, {errors} error(s), {rate:.1f} files/s, "
+            f"{total_bytes / elapsed / (1024 * 1024) if elapsed else 0:.2f} MB/s read{eta}"
+        )
+        # Padded so a shorter line fully overwrites the previous one
+        self.stderr.write(line.ljust(80), ending=ending)
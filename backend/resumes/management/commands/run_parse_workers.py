@@ -0,0 +1,44 @@
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from config.parse_executor import start_parse_executor
+from resumes.jobs import JobWorkerPool, run_pending_jobs
+
+class Command(BaseCommand):
+    help = 'Run background workers for asynchronous resume parse jobs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--threads', type=int, default=2, help='Number of worker threads')
+        parser.add_argument('--poll-interval', type=float, default=2.0, help='Seconds between checks for new jobs')
+        parser.add_argument('--once', action='store_true', help='Drain the pending jobs and exit')
+        parser.add_argument(
+            '--processes', type=int, default=os.cpu_count() or 1,
+            help="Parser processes shared by the threads; run one of these commands per host. 0 parses in the threads",
+        )
+
+    def handle(self, *args, **kwargs):
+        if kwargs['processes'] < 0:
+            raise CommandError('--processes must not be negative')
+        executor = start_parse_executor(kwargs['processes']) if kwargs['processes'] else None
+        try:
+            self.run(kwargs)
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+    def run(self, kwargs):
+        if kwargs['once']:
+            processed = run_pending_jobs()
+            self.stdout.write(f"Processed {processed} parse job(s)")
+            return
+
+        pool = JobWorkerPool(kwargs['threads'], kwargs['poll_interval'])
+        pool.start()
+        self.stdout.write(f"Started {kwargs['threads']} parse worker(s)")
+        try:
+            while True:
+                time.sleep(60)
+        except KeyboardInterrupt:
+            self.stdout.write("Stopping parse workers")
+            pool.stop()
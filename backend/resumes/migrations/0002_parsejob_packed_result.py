@@ -0,0 +1,37 @@
+from django.db import migrations, models
+
+
+def pack_results(apps, schema_editor):
+    from config.parse_result import pack_result
+
+    ParseJob = apps.get_model('resumes', 'ParseJob')
+    for job in ParseJob.objects.exclude(result=None).only('id', 'result').iterator():
+        ParseJob.objects.filter(pk=job.pk).update(packed_result=pack_result(job.result))
+
+
+def unpack_results(apps, schema_editor):
+    from config.parse_result import unpack_result
+
+    ParseJob = apps.get_model('resumes', 'ParseJob')
+    for job in ParseJob.objects.exclude(packed_result=None).only('id', 'packed_result').iterator():
+        ParseJob.objects.filter(pk=job.pk).update(result=unpack_result(bytes(job.packed_result)))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='parsejob',
+            name='packed_result',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.RunPython(pack_results, unpack_results),
+        migrations.RemoveField(
+            model_name='parsejob',
+            name='result',
+        ),
+    ]
@@ -0,0 +1,16 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('resumes', '0002_parsejob_packed_result'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='parsejob',
+            name='fields',
+            field=models.TextField(blank=True, default=''),
+        ),
+    ]
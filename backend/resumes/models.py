@@ -0,0 +1,53 @@
+import uuid
+
+from django.db import models
+
+from config.parse_result import pack_result, unpack_result
+
+
+class ParseJob(models.Model):
+    STATUS_PENDING = 'pending'
+    STATUS_RUNNING = 'running'
+    STATUS_DONE = 'done'
+    STATUS_FAILED = 'failed'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_RUNNING, 'Running'),
+        (STATUS_DONE, 'Done'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+
+    id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    file_name = models.CharField(max_length=255)
+    # Comma-separated response fields, as in ?fields=; empty means the defaults
+    fields = models.TextField(blank=True, default='')
+    # The upload itself is kept in the row so any worker can pick the job up
+    # without shared storage; it is cleared once the job finishes
+    content = models.BinaryField(blank=True, null=True)
+    # msgpack-packed ParsedResume; read and write it through .result
+    packed_result = models.BinaryField(blank=True, null=True)
+    error = models.TextField(blank=True, default='')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+        ]
+
+    @property
+    def result(self):
+        """The parse_resume result dict, or None until the job is done"""
+        if self.packed_result is None:
+            return None
+        return unpack_result(bytes(self.packed_result))
+
+    @result.setter
+    def result(self, value):
+        self.packed_result = None if value is None else pack_result(value)
+
+    def __str__(self):
+        return f"{self.file_name} ({self.status})"
@@ -0,0 +1,48 @@
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from rest_framework.test import APITestCase
+
+from config.parse_cache import parse_cache
+from resumes.jobs import run_pending_jobs
+from resumes.models import ParseJob
+from user_auth.models import User
+
+
+def make_pdf(text):
+    import fitz  # PyMuPDF
+    doc = fitz.open()
+    doc.new_page().insert_text((72, 72), text)
+    data = doc.tobytes()
+    doc.close()
+    return data
+
+
+# Jobs run in this process, parsing in it rather than in a parser pool
+@override_settings(RESUME_PARSER_JOB_WORKERS=0, RESUME_PARSER_PROCESSES=0)
+class ParseJobFieldsTests(TestCase):
+    def setUp(self):
+        parse_cache.clear()
+
+    def test_async_job_keeps_requested_fields(self):
+        upload = SimpleUploadedFile('resume.pdf', make_pdf('Jane Doe\njane@example.com'), 'application/pdf')
+        response = self.client.post(reverse('parse-resume') + '?mode=async&fields=rawText', {'resume': upload})
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(ParseJob.objects.get(pk=response.json()['jobId']).fields, 'rawText')
+
+        self.assertEqual(run_pending_jobs(), 1)
+        response = self.client.get(response.json()['statusUrl'])
+        self.assertEqual(response.json()['status'], 'done')
+        result = response.json()['result']
+        self.assertEqual(list(result), ['rawText'])
+        self.assertIn('jane@example.com', result['rawText'])
+
+
+class BatchParseTests(APITestCase):
+    @override_settings(RESUME_PARSER_PROCESSES=0)
+    def test_batch_needs_parser_processes(self):
+        self.client.force_authenticate(User.objects.create_user(username='admin', is_staff=True))
+        upload = SimpleUploadedFile('resume.pdf', make_pdf('Jane Doe'), 'application/pdf')
+        response = self.client.post(reverse('parse-resume-batch'), {'resumes': [upload]})
+        self.assertEqual(response.status_code, 503)
@@ -1,6 +1,7 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
-from .models import User
+from django.utils import timezone
+from .models import OutboxEmail, User
 
 class CustomUserAdmin(UserAdmin):
     list_display = ('username', 'email', 'first_name', 'last_name', 'role', 'is_staff')
@@ -12,4 +13,20 @@ class CustomUserAdmin(UserAdmin):
         ('Role Information', {'fields': ('role',)}),
     )
 
-admin.site.register(User, CustomUserAdmin)
\ No newline at end of file
+admin.site.register(User, CustomUserAdmin)
+
+
+@admin.action(description='Queue the selected emails again')
+def requeue_emails(modeladmin, request, queryset):
+    queryset.exclude(status=OutboxEmail.STATUS_SENT).update(
+        status=OutboxEmail.STATUS_PENDING, attempts=0, next_attempt_at=timezone.now(), claim=None,
+    )
+
+
+class OutboxEmailAdmin(admin.ModelAdmin):
+    list_display = ('subject', 'status', 'attempts', 'next_attempt_at', 'created_at', 'sent_at')
+    list_filter = ('status',)
+    readonly_fields = ('last_error',)
+    actions = [requeue_emails]
+
+admin.site.register(OutboxEmail, OutboxEmailAdmin)
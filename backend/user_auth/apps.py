@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class UserAuth2Config(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'user_auth'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,75 @@
+from django.contrib.auth import get_user_model
+from django.utils.functional import SimpleLazyObject, empty
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .user_cache import auth_state_cache
+
+# Claims set by ClaimsRefreshToken that ClaimsUser answers without a query
+USER_CLAIMS = ('username', 'email', 'role', 'is_staff', 'is_superuser')
+
+
+class ClaimsUser(SimpleLazyObject):
+    """request.user built from the claims of a validated token.
+
+    id, pk and the USER_CLAIMS attributes come from the token. Any other
+    attribute, and anything that needs a real model instance (ForeignKey
+    filters, assigning it to a model field, save()), loads the User row the
+    first time and is served from it from then on, like the lazy
+    request.user of Django's AuthenticationMiddleware.
+    """
+
+    def __init__(self, user_id, claims):
+        self.__dict__['_claims'] = {
+            **claims,
+            'id': user_id,
+            'pk': user_id,
+            'is_active': True,
+            'is_authenticated': True,
+            'is_anonymous': False,
+        }
+        super().__init__(lambda: get_user_model().objects.get(pk=user_id))
+
+    def __getattr__(self, name):
+        if self._wrapped is empty:
+            claims = self.__dict__['_claims']
+            if name in claims:
+                return claims[name]
+        return super().__getattr__(name)
+
+    def __bool__(self):
+        # Permission classes test `request.user and ...`
+        return True
+
+
+class StatelessJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that doesn't load the User row on every request.
+
+    The token's claims are trusted for the user's identity and role; what
+    the token can't know, whether it was revoked and whether the user is
+    still active, comes from auth_state_cache. User.revoke_tokens bumps
+    token_version on logout and password reset, and on every save that
+    changes role, is_staff, is_superuser or is_active (user_auth.signals),
+    which rejects every token carrying an older version. Tokens issued
+    without the claim count as version 0.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        state = auth_state_cache.get(user_id)
+        if state is None:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+        token_version, is_active = state
+        if not is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if validated_token.get('token_version', 0) != token_version:
+            raise AuthenticationFailed(_("Token has been revoked"), code="token_revoked")
+
+        claims = {name: validated_token[name] for name in USER_CLAIMS if name in validated_token}
+        return ClaimsUser(user_id, claims)
@@ -0,0 +1,99 @@
+import logging
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections
+from django.utils import timezone
+
+from .models import User
+
+logger = logging.getLogger(__name__)
+
+
+def expiry_setting(name, default):
+    return getattr(settings, name, default)
+
+
+def expired_unverified_users(ttl=None, now=None):
+    """Accounts still waiting for email verification after ttl seconds.
+
+    Served by the (awaiting_verification, date_joined) index. Only signups
+    carry awaiting_verification, so an account an admin deactivated is never
+    swept, even one that has not logged in yet.
+    """
+    ttl = expiry_setting('UNVERIFIED_USER_TTL', 600) if ttl is None else ttl
+    cutoff = (now or timezone.now()) - timedelta(seconds=ttl)
+    return User.objects.filter(awaiting_verification=True, is_active=False, date_joined__lt=cutoff)
+
+
+def delete_unverified_users(ttl=None, batch_size=1000, now=None):
+    """Delete every expired unverified account; returns how many were deleted.
+
+    Each batch is one set-based delete (plus one per table with rows
+    referencing the users), so the cost doesn't grow with the number of
+    signups beyond the batches themselves.
+    """
+    expired = expired_unverified_users(ttl, now)
+    deleted = 0
+    while True:
+        ids = list(expired.values_list('pk', flat=True)[:batch_size])
+        if not ids:
+            break
+        _, per_model = User.objects.filter(pk__in=ids).delete()
+        deleted += per_model.get(User._meta.label, 0)
+        if len(ids) < batch_size:
+            break
+    if deleted:
+        logger.info("Deleted %d unverified user(s)", deleted)
+    return deleted
+
+
+class ExpirySweeper:
+    """Background thread deleting expired unverified accounts every interval seconds"""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="unverified-user-sweeper", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=None):
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stopping.wait(self.interval):
+            try:
+                delete_unverified_users()
+            except Exception:
+                logger.exception("Unverified user sweep failed; retrying")
+            finally:
+                close_old_connections()
+
+
+_sweeper = None
+_sweeper_lock = threading.Lock()
+
+
+def start_expiry_sweeper():
+    """Start this process's sweeper if it isn't running yet, and return it.
+
+    Returns None when UNVERIFIED_USER_SWEEP_INTERVAL is 0, i.e. accounts
+    are only swept by `manage.py expire_unverified_users`.
+    """
+    global _sweeper
+    interval = expiry_setting('UNVERIFIED_USER_SWEEP_INTERVAL', 60)
+    if not interval:
+        return None
+    if _sweeper is None:
+        with _sweeper_lock:
+            if _sweeper is None:
+                sweeper = ExpirySweeper(interval)
+                sweeper.start()
+                _sweeper = sweeper
+    return _sweeper
@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from user_auth.expiry import delete_unverified_users
+
+class Command(BaseCommand):
+    help = 'Delete accounts still unverified after UNVERIFIED_USER_TTL seconds, in set-based batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--ttl', type=int, default=None, help='Seconds an account may stay unverified (default: UNVERIFIED_USER_TTL)')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Users deleted per query')
+        parser.add_argument('--interval', type=float, default=0, help='Sweep every this many seconds instead of once')
+
+    def handle(self, *args, **kwargs):
+        if kwargs['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+
+        while True:
+            deleted = delete_unverified_users(kwargs['ttl'], kwargs['batch_size'])
+            self.stdout.write(f"Deleted {deleted} unverified user(s)")
+            if not kwargs['interval']:
+                return
+            try:
+                time.sleep(kwargs['interval'])
+            except KeyboardInterrupt:
+                return
@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+from user_auth.outbox import OutboxWorker, run_outbox
+
+class Command(BaseCommand):
+    help = 'Send queued emails from the outbox in batches over one connection per batch'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--poll-interval', type=float, default=5.0, help='Seconds between checks for due emails')
+        parser.add_argument('--batch-size', type=int, default=None, help='Emails per connection (default: EMAIL_OUTBOX_BATCH_SIZE)')
+        parser.add_argument('--once', action='store_true', help='Send the due emails and exit')
+
+    def handle(self, *args, **kwargs):
+        if kwargs['once']:
+            sent = run_outbox(kwargs['batch_size'])
+            self.stdout.write(f"Sent {sent} email(s)")
+            return
+
+        worker = OutboxWorker(kwargs['poll_interval'], kwargs['batch_size'])
+        worker.start()
+        self.stdout.write("Started the email outbox worker")
+        try:
+            while True:
+                time.sleep(60)
+        except KeyboardInterrupt:
+            self.stdout.write("Stopping the email outbox worker")
+            worker.stop()
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from user_auth.sessions import backfill_session_index, prune_sessions
+
+class Command(BaseCommand):
+    help = (
+        'Delete expired sessions and stale UserSession rows in bulk, then index live sessions '
+        'that have no UserSession row yet. Run once after deploying the index, then periodically.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Sessions decoded per insert')
+        parser.add_argument('--prune-only', action='store_true', help='Skip the backfill')
+
+    def handle(self, *args, **kwargs):
+        if kwargs['batch_size'] < 1:
+            raise CommandError('--batch-size must be at least 1')
+
+        sessions, stale = prune_sessions()
+        self.stdout.write(f"Deleted {sessions} expired session(s) and {stale} stale index row(s)")
+        if not kwargs['prune_only']:
+            indexed = backfill_session_index(kwargs['batch_size'])
+            self.stdout.write(f"Indexed {indexed} session(s)")
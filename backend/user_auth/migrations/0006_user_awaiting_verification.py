@@ -0,0 +1,24 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('user_auth', '0005_user_unverified_sweep_index'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='user',
+            name='user_auth_u_is_acti_20a0c0_idx',
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='awaiting_verification',
+            field=models.BooleanField(default=False),
+        ),
+        migrations.AddIndex(
+            model_name='user',
+            index=models.Index(fields=['awaiting_verification', 'date_joined'], name='user_auth_u_awaitin_8aff0a_idx'),
+        ),
+    ]
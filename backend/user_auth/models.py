@@ -1,5 +1,11 @@
 from django.contrib.auth.models import AbstractUser
 from django.db import models
+from django.core.mail import EmailMessage
+from django.db.models import F
+from django.utils import timezone
+
+from .user_cache import auth_state_cache
+
 
 class User(AbstractUser):
     ROLE_CHOICES = [
@@ -12,9 +18,92 @@ class User(AbstractUser):
         choices=ROLE_CHOICES,
         default='general',
     )
+    # Carried in every JWT as the token_version claim; bumping it revokes all
+    # tokens issued before (see user_auth.authentication)
+    token_version = models.PositiveIntegerField(default=0)
+    # Set at signup until the activation link is followed; only these
+    # accounts expire (user_auth.expiry), not ones an admin deactivated
+    awaiting_verification = models.BooleanField(default=False)
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # Unverified-account sweep (user_auth.expiry)
+            models.Index(fields=['awaiting_verification', 'date_joined']),
+        ]
 
     def is_admin(self):
         return self.role == 'admin'
+
+    def revoke_tokens(self):
+        """Invalidate every JWT issued to this user so far"""
+        User.objects.filter(pk=self.pk).update(token_version=F('token_version') + 1)
+        self.refresh_from_db(fields=['token_version'])
+        # update() sends no post_save
+        auth_state_cache.invalidate(self.pk)
     
     def __str__(self):
-        return self.username
\ No newline at end of file
+        return self.username
+
+
+class UserSession(models.Model):
+    """Index of which user a database session belongs to.
+
+    Kept by the login/logout signal receivers so a user's sessions can be
+    deleted by user_id instead of decoding every session; see
+    user_auth.sessions.
+    """
+    session_key = models.CharField(max_length=40, primary_key=True)
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='user_sessions')
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.user_id}: {self.session_key}"
+
+
+class OutboxEmail(models.Model):
+    """An email waiting to be sent, or the record of one sent or given up on.
+
+    Views enqueue rows through user_auth.outbox.enqueue_email; the outbox
+    worker sends them in batches and retries failures with backoff until
+    EMAIL_OUTBOX_MAX_ATTEMPTS, after which the row is left as dead.
+    """
+    STATUS_PENDING = 'pending'
+    STATUS_SENDING = 'sending'
+    STATUS_SENT = 'sent'
+    STATUS_DEAD = 'dead'
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_SENDING, 'Sending'),
+        (STATUS_SENT, 'Sent'),
+        (STATUS_DEAD, 'Dead'),
+    ]
+
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    content_subtype = models.CharField(max_length=10, default='plain')
+    # Blank means DEFAULT_FROM_EMAIL at send time
+    from_email = models.CharField(max_length=254, blank=True, default='')
+    to = models.JSONField(default=list)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=STATUS_PENDING)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    # Set by the worker that claimed the row, to find its batch after the claiming UPDATE
+    claim = models.UUIDField(blank=True, null=True)
+    claimed_at = models.DateTimeField(blank=True, null=True)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def to_message(self, connection=None):
+        message = EmailMessage(self.subject, self.body, self.from_email or None, self.to, connection=connection)
+        message.content_subtype = self.content_subtype
+        return message
+
+    def __str__(self):
+        return f"{self.subject} -> {', '.join(self.to)} ({self.status})"
+
@@ -0,0 +1,180 @@
+import logging
+import threading
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.db import close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import OutboxEmail
+
+logger = logging.getLogger(__name__)
+
+
+def outbox_setting(name, default):
+    return getattr(settings, name, default)
+
+
+def enqueue_email(subject, body, to, content_subtype='plain', from_email=''):
+    """Store an email for the outbox worker and wake it once the transaction commits"""
+    email = OutboxEmail.objects.create(
+        subject=subject, body=body, to=list(to), content_subtype=content_subtype, from_email=from_email,
+    )
+    worker = get_outbox_worker()
+    if worker is not None:
+        transaction.on_commit(worker.wake)
+    return email
+
+
+def retry_delay(attempts):
+    """Seconds before retry number `attempts`: EMAIL_OUTBOX_RETRY_DELAY doubling, capped"""
+    base = outbox_setting('EMAIL_OUTBOX_RETRY_DELAY', 30)
+    return min(base * 2 ** (attempts - 1), outbox_setting('EMAIL_OUTBOX_MAX_RETRY_DELAY', 3600))
+
+
+def claim_batch(size):
+    """Atomically move up to `size` due emails to sending and return them.
+
+    Emails stuck in sending for longer than EMAIL_OUTBOX_STALE_AFTER (a
+    worker died mid-batch) are picked up again, so delivery is at least
+    once. The claim is one conditional UPDATE, so concurrent workers never
+    claim the same row.
+    """
+    now = timezone.now()
+    stale_before = now - timedelta(seconds=outbox_setting('EMAIL_OUTBOX_STALE_AFTER', 300))
+    due = OutboxEmail.objects.filter(
+        Q(status=OutboxEmail.STATUS_PENDING, next_attempt_at__lte=now)
+        | Q(status=OutboxEmail.STATUS_SENDING, claimed_at__lt=stale_before)
+    )
+    ids = list(due.order_by('next_attempt_at').values_list('pk', flat=True)[:size])
+    if not ids:
+        return []
+    claim = uuid.uuid4()
+    due.filter(pk__in=ids).update(status=OutboxEmail.STATUS_SENDING, claim=claim, claimed_at=now)
+    return list(OutboxEmail.objects.filter(claim=claim).order_by('next_attempt_at'))
+
+
+def send_batch(emails):
+    """Send claimed emails over one connection and record each outcome.
+
+    The connection is opened once for the batch; send_messages reuses an
+    open connection, and sending one message per call lets a rejected
+    message fail alone. Returns the number sent.
+    """
+    connection = get_connection()
+    sent, failed = [], []
+    try:
+        connection.open()
+    except Exception as e:
+        failed = [(email, e) for email in emails]
+    else:
+        try:
+            for email in emails:
+                try:
+                    if connection.send_messages([email.to_message(connection)]):
+                        sent.append(email)
+                    else:
+                        failed.append((email, 'Message was not accepted'))
+                except Exception as e:
+                    failed.append((email, e))
+        finally:
+            try:
+                connection.close()
+            except Exception:
+                logger.warning("Closing the outbox email connection failed", exc_info=True)
+
+    now = timezone.now()
+    if sent:
+        OutboxEmail.objects.filter(pk__in=[email.pk for email in sent]).update(
+            status=OutboxEmail.STATUS_SENT, sent_at=now, attempts=F('attempts') + 1, claim=None, last_error='',
+        )
+    max_attempts = outbox_setting('EMAIL_OUTBOX_MAX_ATTEMPTS', 5)
+    for email, error in failed:
+        email.attempts += 1
+        email.last_error = str(error)
+        email.claim = None
+        if email.attempts >= max_attempts:
+            email.status = OutboxEmail.STATUS_DEAD
+            logger.error("Giving up on outbox email %s after %d attempts: %s", email.pk, email.attempts, error)
+        else:
+            email.status = OutboxEmail.STATUS_PENDING
+            email.next_attempt_at = now + timedelta(seconds=retry_delay(email.attempts))
+            logger.warning("Outbox email %s failed (attempt %d), retrying: %s", email.pk, email.attempts, error)
+        email.save(update_fields=['attempts', 'last_error', 'claim', 'status', 'next_attempt_at'])
+    return len(sent)
+
+
+def run_outbox(batch_size=None):
+    """Send batches until no email is due; returns how many were sent"""
+    batch_size = batch_size or outbox_setting('EMAIL_OUTBOX_BATCH_SIZE', 50)
+    total = 0
+    while True:
+        emails = claim_batch(batch_size)
+        if not emails:
+            return total
+        total += send_batch(emails)
+
+
+class OutboxWorker:
+    """Background thread that drains the outbox.
+
+    It sleeps until woken by enqueue_email or until the poll interval
+    passes, which also picks up emails enqueued by other processes and
+    retries that have come due.
+    """
+
+    def __init__(self, poll_interval=5.0, batch_size=None):
+        self.poll_interval = poll_interval
+        self.batch_size = batch_size
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="email-outbox", daemon=True)
+        self._thread.start()
+
+    def wake(self):
+        self._wakeup.set()
+
+    def stop(self, timeout=None):
+        self._stopping.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def _run(self):
+        while not self._stopping.is_set():
+            self._wakeup.wait(self.poll_interval)
+            self._wakeup.clear()
+            try:
+                run_outbox(self.batch_size)
+            except Exception:
+                logger.exception("Email outbox worker crashed; retrying")
+            finally:
+                close_old_connections()
+
+
+_worker = None
+_worker_lock = threading.Lock()
+
+
+def get_outbox_worker():
+    """Return the in-process outbox worker, starting it on first use.
+
+    Returns None when EMAIL_OUTBOX_WORKER is off, i.e. the outbox is only
+    drained by `manage.py run_email_outbox` processes.
+    """
+    global _worker
+    if not outbox_setting('EMAIL_OUTBOX_WORKER', True):
+        return None
+    if _worker is None:
+        with _worker_lock:
+            if _worker is None:
+                worker = OutboxWorker(outbox_setting('EMAIL_OUTBOX_POLL_INTERVAL', 5.0))
+                worker.start()
+                _worker = worker
+    return _worker
@@ -40,6 +40,7 @@ class RegisterSerializer(serializers.ModelSerializer):
         )
         user.set_password(validated_data['password'])
         user.is_active = False # Deactivate account till it is verified
+        user.awaiting_verification = True
         user.save()
         return user
 
@@ -108,6 +109,7 @@ class EmailVerificationSerializer(serializers.Serializer):
         
         if not already_verified:
             user.is_active = True
+            user.awaiting_verification = False
             user.save()
         
         return user
@@ -151,4 +153,5 @@ class PasswordResetConfirmSerializer(serializers.Serializer):
         user = self.validated_data['user']
         user.set_password(self.validated_data['new_password'])
         user.save()
+        user.revoke_tokens()
         return user
\ No newline at end of file
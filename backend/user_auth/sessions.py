@@ -0,0 +1,86 @@
+from django.contrib.sessions.models import Session
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+
+from .models import User, UserSession
+
+
+def record_session(request, user):
+    """Index the request's session under the user who just logged in"""
+    session = getattr(request, 'session', None)
+    if session is None:
+        return
+    if session.session_key is None:
+        session.save()
+    UserSession.objects.update_or_create(session_key=session.session_key, defaults={'user_id': user.pk})
+
+
+def forget_session(request):
+    session = getattr(request, 'session', None)
+    if session is not None and session.session_key is not None:
+        UserSession.objects.filter(session_key=session.session_key).delete()
+
+
+def invalidate_user_sessions(user):
+    """Delete every session of a user.
+
+    Two indexed deletes by user_id. Sessions that were never indexed (made
+    before the index existed, or whose key was cycled outside login) are
+    missed until sync_user_sessions has backfilled them.
+    """
+    with transaction.atomic():
+        Session.objects.filter(
+            session_key__in=UserSession.objects.filter(user_id=user.pk).values('session_key')
+        ).delete()
+        UserSession.objects.filter(user_id=user.pk).delete()
+
+
+def prune_sessions(now=None):
+    """Delete expired sessions and index rows whose session is gone.
+
+    Returns (sessions deleted, index rows deleted).
+    """
+    now = now or timezone.now()
+    with transaction.atomic():
+        sessions, _ = Session.objects.filter(expire_date__lt=now).delete()
+        stale, _ = UserSession.objects.exclude(session_key__in=Session.objects.values('session_key')).delete()
+    return sessions, stale
+
+
+def backfill_session_index(batch_size=1000, now=None):
+    """Index every live, unindexed session of an existing user.
+
+    The one place that still decodes sessions; returns the number indexed.
+    """
+    now = now or timezone.now()
+    unindexed = (
+        Session.objects.filter(expire_date__gte=now)
+        .exclude(session_key__in=UserSession.objects.values('session_key'))
+    )
+    indexed = 0
+    batch = {}
+
+    def flush():
+        existing = set(User.objects.filter(pk__in=set(batch.values())).values_list('pk', flat=True))
+        rows = [
+            UserSession(session_key=key, user_id=user_id)
+            for key, user_id in batch.items() if user_id in existing
+        ]
+        UserSession.objects.bulk_create(rows, ignore_conflicts=True)
+        batch.clear()
+        return len(rows)
+
+    for session in unindexed.iterator(chunk_size=batch_size):
+        user_id = session.get_decoded().get('_auth_user_id')
+        if user_id is None:
+            continue
+        try:
+            batch[session.session_key] = User._meta.pk.to_python(user_id)
+        except ValidationError:
+            continue
+        if len(batch) >= batch_size:
+            indexed += flush()
+    if batch:
+        indexed += flush()
+    return indexed
@@ -0,0 +1,47 @@
+from django.contrib.auth.signals import user_logged_in, user_logged_out
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import User
+from .sessions import forget_session, record_session
+from .user_cache import auth_state_cache, role_cache
+
+
+# Tokens carry the first three as claims, and is_active decides whether
+# the user may hold tokens at all
+PRIVILEGE_FIELDS = ('role', 'is_staff', 'is_superuser', 'is_active')
+
+
+@receiver(pre_save, sender=User)
+def note_privilege_change(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Mark a save that changes PRIVILEGE_FIELDS, whatever saves it (admin site, make_admin, shell)"""
+    instance._privileges_changed = False
+    if raw or instance._state.adding:
+        return
+    if update_fields is not None and not update_fields & set(PRIVILEGE_FIELDS):
+        return
+    saved = User.objects.filter(pk=instance.pk).values(*PRIVILEGE_FIELDS).first()
+    instance._privileges_changed = saved is not None and any(
+        saved[field] != getattr(instance, field) for field in PRIVILEGE_FIELDS
+    )
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def forget_cached_user(sender, instance, **kwargs):
+    if getattr(instance, '_privileges_changed', False):
+        instance._privileges_changed = False
+        # Tokens issued before the change would keep the old privileges
+        instance.revoke_tokens()
+    role_cache.invalidate(instance.pk)
+    auth_state_cache.invalidate(instance.pk)
+
+
+@receiver(user_logged_in)
+def index_session(sender, request, user, **kwargs):
+    record_session(request, user)
+
+
+@receiver(user_logged_out)
+def unindex_session(sender, request, user, **kwargs):
+    forget_session(request)
@@ -0,0 +1,157 @@
+import threading
+import uuid
+from datetime import timedelta
+from unittest import mock
+
+from django.core import mail
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+from rest_framework.test import APITestCase
+
+from . import expiry, outbox
+from .models import OutboxEmail, User
+from .tokens import ClaimsRefreshToken
+from .utils import account_activation_token
+
+
+def bearer(user):
+    return {'HTTP_AUTHORIZATION': f'Bearer {ClaimsRefreshToken.for_user(user).access_token}'}
+
+
+class TokenRevocationTests(APITestCase):
+    def setUp(self):
+        self.admin = User.objects.create_user(
+            username='admin', email='admin@example.com', password='secret', role='admin', is_staff=True,
+        )
+
+    def test_demotion_by_plain_save_revokes_tokens(self):
+        url = reverse('parse-resume-metrics')
+        headers = bearer(self.admin)
+        self.assertEqual(self.client.get(url, **headers).status_code, 200)
+
+        admin = User.objects.get(pk=self.admin.pk)
+        admin.role = 'general'
+        admin.is_staff = False
+        admin.save()
+
+        self.assertEqual(User.objects.get(pk=self.admin.pk).token_version, self.admin.token_version + 1)
+        self.assertEqual(self.client.get(url, **headers).status_code, 401)
+
+    def test_other_saves_keep_tokens(self):
+        url = reverse('parse-resume-metrics')
+        headers = bearer(self.admin)
+        admin = User.objects.get(pk=self.admin.pk)
+        admin.first_name = 'Ada'
+        admin.save()
+        admin.last_login = None
+        admin.save(update_fields=['last_login'])
+
+        self.assertEqual(User.objects.get(pk=self.admin.pk).token_version, self.admin.token_version)
+        self.assertEqual(self.client.get(url, **headers).status_code, 200)
+
+    def test_profile_views_do_not_load_the_user(self):
+        url = reverse('education-list')
+        headers = bearer(self.admin)
+        self.assertEqual(self.client.get(url, **headers).status_code, 200)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(url, **headers).status_code, 200)
+        self.assertFalse([query for query in queries if User._meta.db_table in query['sql']])
+
+
+@override_settings(EMAIL_OUTBOX_WORKER=False, EMAIL_OUTBOX_STALE_AFTER=300)
+class OutboxTests(TestCase):
+    def setUp(self):
+        for i in range(4):
+            outbox.enqueue_email(f'Subject {i}', 'Body', [f'user{i}@example.com'])
+
+    def test_racing_workers_never_claim_the_same_email(self):
+        competing = None
+
+        def claim_in_between():
+            # Another worker claims after this one picked its ids but
+            # before its UPDATE
+            nonlocal competing
+            if competing is None:
+                competing = []
+                competing = outbox.claim_batch(10)
+            return real_uuid4()
+
+        real_uuid4 = uuid.uuid4
+        with mock.patch.object(outbox.uuid, 'uuid4', side_effect=claim_in_between):
+            claimed = outbox.claim_batch(10)
+
+        self.assertEqual(len(competing), 4)
+        self.assertEqual(claimed, [])
+        self.assertEqual(outbox.run_outbox(), 0)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_stale_claims_are_picked_up_again(self):
+        first = outbox.claim_batch(2)
+        self.assertEqual(len(first), 2)
+        OutboxEmail.objects.filter(pk=first[0].pk).update(claimed_at=timezone.now() - timedelta(seconds=301))
+
+        again = outbox.claim_batch(10)
+        self.assertEqual(sorted(email.pk for email in again), sorted([first[0].pk] + [
+            email.pk for email in OutboxEmail.objects.exclude(pk__in=[email.pk for email in first])
+        ]))
+        self.assertEqual(outbox.send_batch(again), 3)
+        self.assertEqual(sorted(message.subject for message in mail.outbox), sorted(
+            email.subject for email in again
+        ))
+
+
+class ExpirySweepTests(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        self.now = now + timedelta(seconds=600)
+        old = now - timedelta(seconds=1)
+        self.expired = User.objects.create(username='expired', is_active=False, awaiting_verification=True)
+        self.fresh = User.objects.create(username='fresh', is_active=False, awaiting_verification=True)
+        self.deactivated = User.objects.create(username='deactivated', is_active=False, last_login=old)
+        # Deactivated by an admin before ever logging in
+        self.never_logged_in = User.objects.create(username='never-logged-in', is_active=False)
+        self.verified = User.objects.create(username='verified', is_active=True)
+        User.objects.exclude(pk=self.fresh.pk).update(date_joined=old)
+
+    def test_sweep_deletes_only_expired_unverified_accounts(self):
+        self.assertEqual(expiry.delete_unverified_users(ttl=600, batch_size=1, now=self.now), 1)
+        self.assertEqual(
+            set(User.objects.values_list('username', flat=True)),
+            {'fresh', 'deactivated', 'never-logged-in', 'verified'},
+        )
+
+    @override_settings(UNVERIFIED_USER_SWEEP_INTERVAL=0, EMAIL_OUTBOX_WORKER=False)
+    def test_signups_await_verification_until_verified(self):
+        response = self.client.post(reverse('register'), {
+            'username': 'jane', 'email': 'jane@example.com', 'password': 'S3cure-pass!', 'password2': 'S3cure-pass!',
+        })
+        self.assertEqual(response.status_code, 201)
+        user = User.objects.get(username='jane')
+        self.assertTrue(user.awaiting_verification)
+        self.assertIn(user, expiry.expired_unverified_users(ttl=0, now=self.now))
+
+        uid = urlsafe_base64_encode(force_bytes(user.pk))
+        response = self.client.get(reverse('verify-email', args=[uid, account_activation_token.make_token(user)]))
+        self.assertEqual(response.status_code, 200)
+        user.refresh_from_db()
+        self.assertTrue(user.is_active)
+        self.assertFalse(user.awaiting_verification)
+
+    def test_sweeper_thread_sweeps_until_stopped(self):
+        swept = threading.Event()
+        with mock.patch.object(expiry, 'delete_unverified_users', side_effect=lambda: swept.set()) as sweep:
+            sweeper = expiry.ExpirySweeper(0.01)
+            sweeper.start()
+            self.assertTrue(swept.wait(5))
+            sweeper.stop(timeout=5)
+        self.assertFalse(sweeper._thread.is_alive())
+        self.assertGreaterEqual(sweep.call_count, 1)
+
+    @override_settings(UNVERIFIED_USER_SWEEP_INTERVAL=0)
+    def test_no_sweeper_when_disabled(self):
+        self.assertIsNone(expiry.start_expiry_sweeper())
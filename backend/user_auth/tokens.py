@@ -1,4 +1,5 @@
 from django.contrib.auth.tokens import PasswordResetTokenGenerator
+from rest_framework_simplejwt.tokens import RefreshToken
 import six
 
 class AccountActivationTokenGenerator(PasswordResetTokenGenerator):
@@ -12,4 +13,23 @@ account_activation_token = AccountActivationTokenGenerator()
 
 # Django's default PasswordResetTokenGenerator can be used for password reset.
 # We define a new one here mainly for email verification to ensure it's distinct
-# and its hash considers different fields if needed.
\ No newline at end of file
+# and its hash considers different fields if needed.
+
+
+class ClaimsRefreshToken(RefreshToken):
+    """Refresh token carrying the claims StatelessJWTAuthentication reads.
+
+    Access tokens made from it copy the claims, so requests authenticate
+    without loading the User row.
+    """
+
+    @classmethod
+    def for_user(cls, user):
+        token = super().for_user(user)
+        token['username'] = user.username
+        token['email'] = user.email
+        token['role'] = user.role
+        token['is_staff'] = user.is_staff
+        token['is_superuser'] = user.is_superuser
+        token['token_version'] = user.token_version
+        return token
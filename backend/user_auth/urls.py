@@ -1,7 +1,8 @@
 from django.urls import path
 from .views import (
     RegisterView, LoginView, EmailVerifyView, UserProfileView,
-    PasswordResetRequestView, PasswordResetConfirmView,user_list, update_user_role,get_current_user,refresh_token
+    PasswordResetRequestView, PasswordResetConfirmView,user_list, update_user_role,get_current_user,refresh_token,
+    role_cache_stats, logout_user
 )
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView, TokenVerifyView
 
@@ -26,6 +27,8 @@ urlpatterns = [
 
     path('admin/users/', user_list, name='user-list'),
     path('admin/users/<int:user_id>/role/', update_user_role, name='update-user-role'),
+    path('admin/role-cache/', role_cache_stats, name='role-cache-stats'),
     path('me/', get_current_user, name='current_user'),
     path('refresh/', refresh_token, name='refresh_token'), 
+    path('logout/', logout_user, name='logout'),
 ]
\ No newline at end of file
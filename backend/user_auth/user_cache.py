@@ -0,0 +1,128 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import transaction
+
+# Bump when a cached value changes shape; entries of other versions are
+# never read
+USER_CACHE_VERSION = 1
+
+_MISSING = object()
+
+
+def user_cache_setting(name, default):
+    return getattr(settings, name, default)
+
+
+class UserFieldCache:
+    """Two-tier cache of user id -> some columns of the User row.
+
+    The first tier is a bounded in-process LRU whose entries expire after
+    <prefix>_LOCAL_TTL seconds; the second is the shared Django cache, with
+    entries expiring after <prefix>_TIMEOUT. Saving or deleting a User drops
+    its entry from the shared tier and from this process's LRU, so other
+    workers see a change within <prefix>_LOCAL_TTL.
+
+    get returns the value of the single field, or a tuple when the cache
+    holds several.
+    """
+
+    def __init__(self, name, fields, setting_prefix, local_ttl=30):
+        self.name = name
+        self.fields = tuple(fields)
+        self.setting_prefix = setting_prefix
+        self.default_local_ttl = local_ttl
+        self._lru = OrderedDict()
+        self._lock = threading.Lock()
+        self.local_hits = 0
+        self.shared_hits = 0
+        self.queries = 0
+
+    def setting(self, name, default):
+        return user_cache_setting(f'{self.setting_prefix}_{name}', default)
+
+    def make_key(self, user_id):
+        return f"user-{self.name}:v{USER_CACHE_VERSION}:{user_id}"
+
+    def _shared(self):
+        alias = self.setting('ALIAS', 'default')
+        return caches[alias] if alias else None
+
+    def _remember(self, user_id, value):
+        max_size = self.setting('SIZE', 10_000)
+        expires = time.monotonic() + self.setting('LOCAL_TTL', self.default_local_ttl)
+        with self._lock:
+            self._lru[user_id] = (value, expires)
+            self._lru.move_to_end(user_id)
+            while len(self._lru) > max_size:
+                self._lru.popitem(last=False)
+
+    def _query(self, user_id):
+        rows = get_user_model().objects.filter(pk=user_id)
+        if len(self.fields) == 1:
+            return rows.values_list(self.fields[0], flat=True).first()
+        return rows.values_list(*self.fields).first()
+
+    def get(self, user_id):
+        """Cached value for a user, or None when the user doesn't exist"""
+        with self._lock:
+            entry = self._lru.get(user_id)
+            if entry is not None and entry[1] > time.monotonic():
+                self._lru.move_to_end(user_id)
+                self.local_hits += 1
+                return entry[0]
+
+        shared = self._shared()
+        key = self.make_key(user_id)
+        value = shared.get(key, _MISSING) if shared is not None else _MISSING
+        if value is not _MISSING:
+            with self._lock:
+                self.shared_hits += 1
+        else:
+            value = self._query(user_id)
+            with self._lock:
+                self.queries += 1
+            if shared is not None:
+                shared.set(key, value, self.setting('TIMEOUT', 300))
+        self._remember(user_id, value)
+        return value
+
+    def invalidate(self, user_id):
+        """Forget a user's entry, now and again once the current transaction commits"""
+        def forget():
+            with self._lock:
+                self._lru.pop(user_id, None)
+            shared = self._shared()
+            if shared is not None:
+                shared.delete(self.make_key(user_id))
+
+        # A request reading the old row before the commit could otherwise put
+        # the old value back
+        forget()
+        transaction.on_commit(forget)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'local_hits': self.local_hits,
+                'shared_hits': self.shared_hits,
+                'queries': self.queries,
+                'queries_avoided': self.local_hits + self.shared_hits,
+                'size': len(self._lru),
+            }
+
+    def clear(self):
+        with self._lock:
+            self._lru.clear()
+
+
+# Roles for RoleCheckMiddleware
+role_cache = UserFieldCache('role', ('role',), 'USER_ROLE_CACHE')
+
+# (token_version, is_active) for StatelessJWTAuthentication; a short local
+# TTL since it bounds how long a revoked token keeps working on other workers
+auth_state_cache = UserFieldCache('auth-state', ('token_version', 'is_active'), 'USER_AUTH_STATE_CACHE', local_ttl=5)
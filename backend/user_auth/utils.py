@@ -1,13 +1,12 @@
 # utils.py - Fixed version
-import threading
-import time
-from django.core.mail import EmailMessage
 from django.conf import settings
 from django.template.loader import render_to_string
 from django.contrib.auth.tokens import PasswordResetTokenGenerator, default_token_generator
 from django.utils.http import urlsafe_base64_encode
 from django.utils.encoding import force_bytes
 from django.contrib.auth import get_user_model
+from .expiry import start_expiry_sweeper
+from .outbox import enqueue_email
 
 User = get_user_model()
 
@@ -24,28 +23,8 @@ class AccountActivationTokenGenerator(PasswordResetTokenGenerator):
 account_activation_token = AccountActivationTokenGenerator()
 password_reset_token = default_token_generator  # Use Django's built-in for password reset
 
-def delete_user_after_delay(user_id, delay_seconds=600):  # 600 seconds = 10 minutes
-    """
-    Delete user after specified delay if still unverified
-    """
-    def delete_user():
-        time.sleep(delay_seconds)
-        try:
-            user = User.objects.get(id=user_id)
-            if not user.is_active:  # Still unverified
-                print(f"Auto-deleting unverified user: {user.email}")
-                user.delete()
-            else:
-                print(f"User {user.email} is verified, not deleting")
-        except User.DoesNotExist:
-            print(f"User with id {user_id} no longer exists")
-    
-    # Start deletion thread
-    thread = threading.Thread(target=delete_user)
-    thread.daemon = True  # Dies when main thread dies
-    thread.start()
-
 def send_verification_email(user):
+    """Queue the account activation email; the outbox worker sends it"""
     token = account_activation_token.make_token(user)
     uid = urlsafe_base64_encode(force_bytes(user.pk))
     verification_link = f"{settings.FRONTEND_VERIFY_EMAIL_URL}/{uid}/{token}/"
@@ -56,14 +35,14 @@ def send_verification_email(user):
         'verification_link': verification_link,
     })
     
-    email = EmailMessage(subject, message, to=[user.email])
-    email.content_subtype = "html"
-    email.send()
+    enqueue_email(subject, message, [user.email], content_subtype='html')
     
-    # Schedule auto-deletion after 10 minutes
-    delete_user_after_delay(user.id, delay_seconds=600)
+    # The account is deleted if it is still unverified after
+    # UNVERIFIED_USER_TTL; make sure this process sweeps for it
+    start_expiry_sweeper()
 
 def send_password_reset_email(user):
+    """Queue the password reset email; the outbox worker sends it"""
     # Use the correct token generator for password reset
     token = password_reset_token.make_token(user)
     uid = urlsafe_base64_encode(force_bytes(user.pk))
@@ -77,6 +56,4 @@ def send_password_reset_email(user):
         'reset_link': reset_link,
     })
     
-    email = EmailMessage(subject, message, to=[user.email])
-    email.content_subtype = "html"
-    email.send()
\ No newline at end of file
+    enqueue_email(subject, message, [user.email], content_subtype='html')
\ No newline at end of file
@@ -2,23 +2,23 @@
 from django.contrib.auth.models import User
 from rest_framework import generics, status, permissions
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
 from .serializers import (
     RegisterSerializer, LoginSerializer, EmailVerificationSerializer,
     PasswordResetRequestSerializer, PasswordResetConfirmSerializer
 )
 from .utils import send_verification_email, send_password_reset_email, account_activation_token
+from .sessions import invalidate_user_sessions
+from .tokens import ClaimsRefreshToken
+from .user_cache import role_cache
 from django.utils.http import urlsafe_base64_decode
 from django.utils.encoding import force_str
 from rest_framework import serializers
 import logging
-from django.contrib.sessions.models import Session
 from django.contrib.auth import get_user_model
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAdminUser
 # Add these views to your views.py file
 
-from django.utils import timezone
 from rest_framework_simplejwt.views import TokenRefreshView
 from rest_framework_simplejwt.serializers import TokenRefreshSerializer
 from rest_framework_simplejwt.exceptions import InvalidToken, TokenError
@@ -32,8 +32,8 @@ from rest_framework.permissions import IsAuthenticated
 def get_current_user(request):
     """Get current authenticated user with fresh role data"""
     try:
-        # Get fresh user data from database to ensure role is current
-        fresh_user = User.objects.get(id=request.user.id)
+        # Names and is_active aren't token claims, so this loads the row
+        fresh_user = request.user
         return Response({
             'id': fresh_user.id,
             'username': fresh_user.username,
@@ -57,15 +57,16 @@ def refresh_token(request):
             refresh_token = serializer.validated_data.get('refresh')
             if refresh_token:
                 try:
-                    from rest_framework_simplejwt.tokens import RefreshToken
-                    token = RefreshToken(refresh_token)
+                    token = ClaimsRefreshToken(refresh_token)
                     user_id = token.payload.get('user_id')
                     
                     # Get fresh user data
                     user = User.objects.get(id=user_id)
+                    if token.payload.get('token_version', 0) != user.token_version:
+                        return Response({'error': 'Invalid refresh token'}, status=400)
                     
                     # Generate new tokens with fresh user data
-                    new_refresh = RefreshToken.for_user(user)
+                    new_refresh = ClaimsRefreshToken.for_user(user)
                     
                     return Response({
                         'access': str(new_refresh.access_token),
@@ -86,19 +87,6 @@ def refresh_token(request):
     except Exception as e:
         return Response({'error': str(e)}, status=500)
 
-# Fix the missing import in invalidate_user_sessions
-def invalidate_user_sessions(user):
-    """Invalidate all sessions for a specific user"""
-    from django.utils import timezone  # Add this import
-    
-    # Get all sessions
-    sessions = Session.objects.filter(expire_date__gte=timezone.now())
-    
-    for session in sessions:
-        session_data = session.get_decoded()
-        if session_data.get('_auth_user_id') == str(user.id):
-            session.delete()
-
 # Optional: Add JWT token blacklisting for more security
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
@@ -110,14 +98,14 @@ def logout_user(request):
         
         if refresh_token:
             try:
-                from rest_framework_simplejwt.tokens import RefreshToken
-                token = RefreshToken(refresh_token)
+                token = ClaimsRefreshToken(refresh_token)
                 token.blacklist()  # This requires token blacklist to be enabled
             except Exception:
                 pass  # Token might already be blacklisted or invalid
         
-        # Also invalidate sessions
+        # Also invalidate sessions and every other token of the user
         invalidate_user_sessions(request.user)
+        request.user.revoke_tokens()
         
         return Response({'message': 'Successfully logged out'})
     except Exception as e:
@@ -137,6 +125,13 @@ def user_list(request):
     return Response(users)
 
 
+@api_view(['GET'])
+@permission_classes([IsAdminUser])
+def role_cache_stats(request):
+    """Role cache counters of this process, including the queries it saved"""
+    return Response(role_cache.stats())
+
+
 @api_view(['PATCH'])
 @permission_classes([IsAdminUser])
 def update_user_role(request, user_id):
@@ -167,7 +162,8 @@ def update_user_role(request, user_id):
         
         user_to_update.save()
         
-        # Invalidate user's sessions if role changed
+        # Invalidate user's sessions if role changed; saving the new role
+        # already revoked the user's tokens (user_auth.signals)
         if old_role != new_role:
             invalidate_user_sessions(user_to_update)
         
@@ -187,30 +183,20 @@ def update_user_role(request, user_id):
     except Exception as e:
         return Response({'error': str(e)}, status=500)
 
-def invalidate_user_sessions(user):
-    """Invalidate all sessions for a specific user"""
-    # Get all sessions
-    sessions = Session.objects.filter(expire_date__gte=timezone.now())
-    
-    for session in sessions:
-        session_data = session.get_decoded()
-        if session_data.get('_auth_user_id') == str(user.id):
-            session.delete()
-    
-    
 class RoleCheckMiddleware:
-    """Middleware to ensure role is always fresh from database"""
+    """Middleware to keep request.user.role current for session-authenticated users.
+
+    Roles come from role_cache, so a role changed by another worker is seen
+    within USER_ROLE_CACHE_LOCAL_TTL seconds without a query per request.
+    """
     def __init__(self, get_response):
         self.get_response = get_response
 
     def __call__(self, request):
         if request.user.is_authenticated:
-            # Refresh user from database to get current role
-            try:
-                fresh_user = User.objects.get(id=request.user.id)
-                request.user.role = fresh_user.role
-            except User.DoesNotExist:
-                pass
+            role = role_cache.get(request.user.id)
+            if role is not None:
+                request.user.role = role
         
         response = self.get_response(request)
         return response
@@ -236,6 +222,7 @@ class EmailVerifyView(generics.GenericAPIView):
             if account_activation_token.check_token(user, token):
                 if not user.is_active:
                     user.is_active = True
+                    user.awaiting_verification = False
                     user.save()
                     logger.info(f"User {user.email} successfully verified")
                     return Response({
@@ -271,6 +258,7 @@ class EmailVerifyView(generics.GenericAPIView):
             user = serializer.validated_data['user']
             if not user.is_active:
                 user.is_active = True
+                user.awaiting_verification = False
                 user.save()
                 return Response({
                     "message": "Email successfully verified."
@@ -311,7 +299,7 @@ class LoginView(generics.GenericAPIView):
         serializer.is_valid(raise_exception=True)
         user = serializer.validated_data['user']
         
-        refresh = RefreshToken.for_user(user)
+        refresh = ClaimsRefreshToken.for_user(user)
         return Response({
             'refresh': str(refresh),
             'access': str(refresh.access_token),